@@ -1,32 +1,38 @@
 import streamlit as st
 
-st.title("📚 About")
 
-# About section with advanced styling and emojis
-st.markdown("""
-## Welcome to the **Signal Classification Application** 
+def render():
+    st.title("📚 About")
 
-Our application is at the forefront of signal analysis and classification, harnessing cutting-edge machine learning technologies to deliver precise and actionable insights. Designed for researchers, data scientists, and enthusiasts, this tool offers a comprehensive suite of features to handle all your signal classification needs.
+    # About section with advanced styling and emojis
+    st.markdown("""
+    ## Welcome to the **Signal Classification Application** 
 
-### **Key Features** 🌟
-- **🔍 Prediction**: Leverage advanced algorithms to classify signals with high accuracy.
-- **💡 Recommendations**: Receive data-driven suggestions to enhance your analyses.
-- **📊 Visualization**: Engage with interactive and detailed visualizations to explore and understand your data better.
-- **🔬 Analysis**: Perform in-depth statistical and exploratory data analysis to uncover meaningful patterns.
+    Our application is at the forefront of signal analysis and classification, harnessing cutting-edge machine learning technologies to deliver precise and actionable insights. Designed for researchers, data scientists, and enthusiasts, this tool offers a comprehensive suite of features to handle all your signal classification needs.
 
-Our mission is to provide an intuitive and powerful platform for signal classification, integrating state-of-the-art technology and user-centric design.
+    ### **Key Features** 🌟
+    - **🔍 Prediction**: Leverage advanced algorithms to classify signals with high accuracy.
+    - **💡 Recommendations**: Receive data-driven suggestions to enhance your analyses.
+    - **📊 Visualization**: Engage with interactive and detailed visualizations to explore and understand your data better.
+    - **🔬 Analysis**: Perform in-depth statistical and exploratory data analysis to uncover meaningful patterns.
 
-### **Developed By** 🛠️
+    Our mission is to provide an intuitive and powerful platform for signal classification, integrating state-of-the-art technology and user-centric design.
 
-**Devanik**  
-_Aspiring AI Ops Engineer with a passion for advanced machine learning solutions_
+    ### **Developed By** 🛠️
 
-**Niki**  
-_AI Assistant, powered by ChatGPT, dedicated to enhancing  user experience_
+    **Devanik**  
+    _Aspiring AI Ops Engineer with a passion for advanced machine learning solutions_
 
-We are dedicated to continually refining the application to meet your evolving needs. Explore the full potential of signal classification with our innovative tool and make data-driven decisions with confidence.
+    **Niki**  
+    _AI Assistant, powered by ChatGPT, dedicated to enhancing  user experience_
 
-### **Stay Connected** 📬
-We welcome your questions, feedback, and suggestions. Feel free to reach out to us to enhance your experience and contribute to the application's development.
+    We are dedicated to continually refining the application to meet your evolving needs. Explore the full potential of signal classification with our innovative tool and make data-driven decisions with confidence.
 
-""", unsafe_allow_html=True)
+    ### **Stay Connected** 📬
+    We welcome your questions, feedback, and suggestions. Feel free to reach out to us to enhance your experience and contribute to the application's development.
+
+    """, unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    render()
@@ -7,334 +7,396 @@ import plotly.express as px
 from scipy import stats
 from statsmodels.formula.api import ols
 import statsmodels.api as sm
-st.title("📊 Advanced Data Analysis of Narrowband Signals")
-
-# Load the narrowband signals data
-data = pd.read_csv("narrowband signals.csv")
-
-# Display the dataset
-st.write("### Dataset Overview")
-st.dataframe(data.describe())
-
-# ---- Descriptive Statistics ----
-st.write("### Descriptive Statistics")
-if st.checkbox("Show Descriptive Statistics"):
-    st.write(data.describe(include='all'))
-
-# ---- Missing Data Analysis ----
-st.write("### Missing Data Analysis")
-missing_data = data.isnull().sum().sort_values(ascending=False)
-missing_data = missing_data[missing_data > 0]
-
-if not missing_data.empty:
-    fig, ax = plt.subplots()
-    sns.barplot(x=missing_data.index, y=missing_data.values, palette='flare', ax=ax)
-    ax.set_title('Missing Data by Feature', fontsize=16)
-    ax.set_ylabel('Number of Missing Values', fontsize=14)
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
-else:
-    st.success("No missing data found!")
-
-
-# ---- Data Cleaning ----
-st.write("### Data Cleaning")
-if st.checkbox("Show Data Cleaning Options"):
-    st.write("#### Handle Missing Values")
-    missing_action = st.selectbox("Choose action for missing values:", ["None", "Drop", "Fill"])
-    if missing_action == "Drop":
-        data = data.dropna()
-    elif missing_action == "Fill":
-        fill_value = st.text_input("Enter value to fill missing data:", "0")
-        data = data.fillna(fill_value)
-    
-    st.write("#### Remove Duplicates")
-    if st.checkbox("Remove duplicate rows"):
-        data = data.drop_duplicates()
-    
-    st.write("Updated Dataset Overview")
-    st.dataframe(data.describe())
-
-
-
-# ---- Feature Engineering ----
-st.write("### Feature Engineering")
-feature_name = st.text_input("Enter new feature name:")
-if st.button("Create New Feature"):
-    # Example: Creating a new feature as the sum of 'brightpixel' and 'narrowband'
-    if 'brightpixel' in data.columns and 'narrowband' in data.columns:
-        data[feature_name] = data['brightpixel'] + data['narrowband']
-        st.write(f"New feature '{feature_name}' created.")
-    st.write("Updated Dataset Overview")
-    st.dataframe(data.describe())
-
-
-
-# ---- Custom Data Filters ----
-st.write("### Custom Data Filters")
-filter_column = st.selectbox("Choose column to filter:", data.columns)
-filter_value = st.text_input(f"Enter value for {filter_column}:")
-if st.button("Apply Filter"):
-    filtered_data = data[data[filter_column].astype(str).str.contains(filter_value, na=False)]
-    st.write("Filtered Dataset Overview")
-    st.dataframe(filtered_data.describe())
-
-# ---- Data Aggregation and Grouping ----
-st.write("### Data Aggregation and Grouping")
-group_by_column = st.selectbox("Choose column to group by:", data.columns)
-agg_function = st.selectbox("Choose aggregation function:", ["Mean", "Sum", "Median", "Count"])
-
-if st.button("Apply Aggregation"):
-    try:
-        # Check if the chosen aggregation function is compatible with the column types
-        if agg_function in ["Mean", "Sum", "Median"]:
-            # Convert to numeric if possible, otherwise raise an error
-            data[group_by_column] = pd.to_numeric(data[group_by_column], errors='coerce')
-        
-        if agg_function == "Mean":
-            grouped_data = data.groupby(group_by_column).mean()
-        elif agg_function == "Sum":
-            grouped_data = data.groupby(group_by_column).sum()
-        elif agg_function == "Median":
-            grouped_data = data.groupby(group_by_column).median()
-        elif agg_function == "Count":
-            grouped_data = data.groupby(group_by_column).size()
-        
-        st.write(f"#### Aggregated Data by {group_by_column} ({agg_function})")
-        st.dataframe(grouped_data)
-        
-    except Exception as e:
-        st.error(f"Error performing {agg_function} aggregation: {e}")
-
-# ---- Pairwise Feature Comparison ----
-st.write("### Pairwise Feature Comparison")
-comparison_columns = st.multiselect(
-    "Choose columns for pairwise comparison:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
-)
-
-if len(comparison_columns) > 1:
-    st.write("#### Pairwise Scatter Plots")
-    for i in range(len(comparison_columns)):
-        for j in range(i + 1, len(comparison_columns)):
-            fig = px.scatter(data, x=comparison_columns[i], y=comparison_columns[j], color='Stars Type', title=f"{comparison_columns[i]} vs {comparison_columns[j]}")
-            st.plotly_chart(fig)
-else:
-    st.error("Please select more than one column for pairwise comparison.")
-
-
-# ---- Time Series Analysis ----
-st.write("### Time Series Analysis")
-time_column = st.selectbox("Choose time column:", [col for col in data.columns if 'time' in col.lower()])
-value_column = st.selectbox("Choose value column:", [col for col in data.columns if col != time_column])
-
-if time_column and value_column:
-    data[time_column] = pd.to_datetime(data[time_column], errors='coerce')
-    fig, ax = plt.subplots()
-    data.plot(x=time_column, y=value_column, ax=ax)
-    ax.set_title(f'Time Series of {value_column}')
-    st.pyplot(fig)
-else:
-    st.error("Please select both time and value columns for time series analysis.")
-
-
-# ---- Clustering Analysis ----
-st.write("### Clustering Analysis")
-from sklearn.cluster import KMeans
-
-clustering_columns = st.multiselect(
-    "Choose columns for clustering:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
-)
-n_clusters = st.slider("Choose number of clusters:", 2, 10, 3)
-
-if len(clustering_columns) > 1:
-    st.write("#### K-Means Clustering")
-    kmeans = KMeans(n_clusters=n_clusters)
-    clusters = kmeans.fit_predict(data[clustering_columns].dropna())
-    data['Cluster'] = np.nan
-    data.loc[data[clustering_columns].dropna().index, 'Cluster'] = clusters
-    
-    fig = px.scatter(data, x=clustering_columns[0], y=clustering_columns[1], color='Cluster', title=f'K-Means Clustering with {n_clusters} Clusters')
-    st.plotly_chart(fig)
-else:
-    st.error("Please select more than one column for clustering.")
-
-
-
-# ---- Save and Download Processed Data ----
-st.write("### Save and Download Processed Data")
-if st.button("Download Processed Data"):
-    processed_data_path = "processed_data.csv"
-    data.to_csv(processed_data_path, index=False)
-    st.markdown(f"[Download processed data](./{processed_data_path})")
-
-# ---- Data Distribution & Skewness ----
-st.write("### Data Distribution & Skewness")
-distribution_columns = st.multiselect(
-    "Choose columns to check distribution and skewness:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel', 'narrowband']
-)
-
-if distribution_columns:
-    for col in distribution_columns:
-        st.write(f"#### Distribution of {col}")
-        fig, ax = plt.subplots()
-        sns.histplot(data[col], kde=True, color='teal', ax=ax)
-        ax.set_title(f'Distribution of {col}', fontsize=16)
-        st.pyplot(fig)
-
-        # Calculate skewness
-        skewness = stats.skew(data[col].dropna())
-        st.write(f"Skewness of {col}: **{skewness:.2f}**")
-else:
-    st.error("Please select at least one column to analyze distribution and skewness.")
-
-# ---- Outliers Detection ----
-st.write("### Outliers Detection (Z-Score Method)")
-outlier_columns = st.multiselect(
-    "Choose columns to detect outliers:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel', 'narrowband']
-)
-
-threshold = st.slider("Set Z-Score Threshold:", 1.5, 5.0, 3.0)
-
-if outlier_columns:
-    for col in outlier_columns:
-        z_scores = np.abs(stats.zscore(data[col].dropna()))
-        outliers = data[col][z_scores > threshold]
-        st.write(f"#### {col}: {len(outliers)} outliers found")
-        if not outliers.empty:
-            st.write(outliers)
-else:
-    st.error("Please select at least one column for outlier detection.")
-
-# ---- Correlation Analysis ----
-st.write("### Correlation Matrix with Statistical Significance")
-correlation_columns = st.multiselect(
-    "Choose columns for correlation analysis:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel', 'narrowband', 'narrowbanddrd']
-)
-
-if len(correlation_columns) >= 2:
-    st.write(f"#### Correlation Matrix for {', '.join(correlation_columns)}")
-    corr_matrix = data[correlation_columns].corr()
-    fig, ax = plt.subplots(figsize=(12, 8))
-    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', ax=ax, linewidths=.5)
-    ax.set_title('Correlation Matrix', fontsize=16)
-    st.pyplot(fig)
-
-    st.write("#### P-Values Matrix")
-    p_values_matrix = pd.DataFrame(np.zeros(corr_matrix.shape), columns=corr_matrix.columns, index=corr_matrix.index)
-    for row in correlation_columns:
-        for col in correlation_columns:
-            p_value = stats.pearsonr(data[row].dropna(), data[col].dropna())[1]
-            p_values_matrix.loc[row, col] = p_value
-    st.write(p_values_matrix)
-else:
-    st.error("Please select at least two columns for correlation analysis.")
-
-# ---- Hypothesis Testing (T-Test) ----
-st.write("### Hypothesis Testing: T-Test Between Features")
-t_test_columns = st.multiselect(
-    "Choose two columns for T-Test:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
-)
-
-if len(t_test_columns) == 2:
-    t_stat, p_val = stats.ttest_ind(data[t_test_columns[0]].dropna(), data[t_test_columns[1]].dropna())
-    st.write(f"**T-Test Result**: T-Statistic = {t_stat:.2f}, P-Value = {p_val:.5f}")
-    if p_val < 0.05:
-        st.success(f"The difference between {t_test_columns[0]} and {t_test_columns[1]} is statistically significant.")
-    else:
-        st.info(f"No significant difference between {t_test_columns[0]} and {t_test_columns[1]}.")
-else:
-    st.error("Please select exactly two columns for the T-Test.")
-
-# ---- PCA (Principal Component Analysis) ----
-st.write("### Principal Component Analysis (PCA)")
-pca_columns = st.multiselect(
-    "Choose columns for PCA:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel', 'narrowband', 'narrowbanddrd']
-)
-
-if len(pca_columns) >= 2:
-    from sklearn.decomposition import PCA
-    pca = PCA(n_components=2)
-    pca_result = pca.fit_transform(data[pca_columns].dropna())
-    pca_df = pd.DataFrame(pca_result, columns=['PC1', 'PC2'])
-
-    st.write("#### PCA Results")
-    fig_pca = px.scatter(pca_df, x='PC1', y='PC2', title='PCA Plot')
-    st.plotly_chart(fig_pca)
-
-    st.write(f"Explained Variance Ratio: {pca.explained_variance_ratio_}")
-else:
-    st.error("Please select at least two columns for PCA.")
-
-
-# ---- ANOVA (Analysis of Variance) ----
-
-# ---- Feature Importance (Random Forest) ----
-st.write("### Feature Importance using Random Forest")
-if st.checkbox("Run Random Forest Feature Importance Analysis"):
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.preprocessing import LabelEncoder
-
-    # Encode 'Stars Type' as target variable
-    label_encoder = LabelEncoder()
-    data['Stars Type Encoded'] = label_encoder.fit_transform(data['Stars Type'])
-
-    X = data.drop(columns=['Stars Type', 'Remarks', 'Stars Type Encoded']).dropna()
-    y = data['Stars Type Encoded'].dropna()
-
-    rf = RandomForestClassifier(n_estimators=100)
-    rf.fit(X, y)
-
-    feature_importance = pd.Series(rf.feature_importances_, index=X.columns).sort_values(ascending=False)
-
-    st.write("#### Feature Importance")
-    fig, ax = plt.subplots()
-    sns.barplot(x=feature_importance.index, y=feature_importance.values, ax=ax, palette='viridis')
-    ax.set_title('Feature Importance from Random Forest', fontsize=16)
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
-
-
-# ---- Machine Learning Model Training ----
-st.write("### Machine Learning Model Training")
-from sklearn.model_selection import train_test_split
+from sklearn.decomposition import PCA
+from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import classification_report
+from sklearn.model_selection import train_test_split
 
-target_column = st.selectbox("Choose target column:", ['Stars Type'])
-features = st.multiselect("Choose feature columns:", [col for col in data.columns if col != target_column])
-
-if len(features) > 0 and target_column:
-    X = data[features].dropna()
-    y = data[target_column].dropna()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-    
-    from sklearn.ensemble import RandomForestClassifier
-    model = RandomForestClassifier(n_estimators=100)
-    model.fit(X_train, y_train)
-    predictions = model.predict(X_test)
-    
-    st.write("#### Model Performance")
-    st.text(classification_report(y_test, predictions))
-else:
-    st.error("Please select feature and target columns for model training.")
-
-# ---- Summary & Insights ----
-st.write("### Summary & Key Insights")
-st.write("""
-- Comprehensive statistical analysis reveals key insights into the dataset.
-- Correlation matrix highlights strong linear relationships between various signal properties.
-- PCA helps in reducing dimensionality and identifying principal components.
-- Outlier detection shows where the anomalies are in the dataset.
-- Hypothesis testing indicates statistically significant differences between features.
-- Random Forest ranks feature importance, indicating which features most influence 'Stars Type'.
-""")
+import perf
+import plotting
+import sections
+from clustering import SWEEP_KS, cluster_sweep, fit_clusters
+from correlation import correlation_matrix
+from dataset import fingerprint, load_signals
+from feature_importance import N_REPEATS, forest_importance, permutation_importances
+from stream_stats import catalog_stats, frame_stats
+
+
+def render():
+    st.title("📊 Advanced Data Analysis of Narrowband Signals")
+
+    # Load the narrowband signals data
+    data = load_signals()
+    catalog_columns = list(data.columns)
+    data_modified = False
+
+    # Single-pass, chunked statistics of the whole catalog (cached per file version)
+    catalog = catalog_stats()
+
+    # Display the dataset
+    st.write("### Dataset Overview")
+    st.dataframe(catalog.T)
+
+    # ---- Descriptive Statistics ----
+    def descriptive_statistics():
+        st.write(data.describe(include='all'))
+
+    sections.section("Descriptive Statistics", descriptive_statistics)
+
+    # ---- Missing Data Analysis ----
+    def missing_data_analysis():
+        missing_data = catalog['missing'].sort_values(ascending=False)
+        missing_data = missing_data[missing_data > 0]
+
+        if not missing_data.empty:
+            fig, ax = plotting.subplots()
+            sns.barplot(x=missing_data.index, y=missing_data.values, palette='flare', ax=ax)
+            ax.set_title('Missing Data by Feature', fontsize=16)
+            ax.set_ylabel('Number of Missing Values', fontsize=14)
+            plt.xticks(rotation=45)
+            plotting.pyplot(fig)
+        else:
+            st.success("No missing data found!")
+
+    sections.section("Missing Data Analysis", missing_data_analysis)
+
+
+    # ---- Data Cleaning ----
+    st.write("### Data Cleaning")
+    if st.checkbox("Show Data Cleaning Options"):
+        st.write("#### Handle Missing Values")
+        missing_action = st.selectbox("Choose action for missing values:", ["None", "Drop", "Fill"])
+        if missing_action == "Drop":
+            data = data.dropna()
+            data_modified = True
+        elif missing_action == "Fill":
+            fill_value = st.text_input("Enter value to fill missing data:", "0")
+            data = data.fillna(fill_value)
+            data_modified = True
+
+        st.write("#### Remove Duplicates")
+        if st.checkbox("Remove duplicate rows"):
+            data = data.drop_duplicates()
+            data_modified = True
+
+        st.write("Updated Dataset Overview")
+        st.dataframe(data.describe())
+
+
+
+    # ---- Feature Engineering ----
+    st.write("### Feature Engineering")
+    feature_name = st.text_input("Enter new feature name:")
+    if st.button("Create New Feature"):
+        # Example: Creating a new feature as the sum of 'brightpixel' and 'narrowband'
+        if 'brightpixel' in data.columns and 'narrowband' in data.columns:
+            data[feature_name] = data['brightpixel'] + data['narrowband']
+            st.write(f"New feature '{feature_name}' created.")
+        st.write("Updated Dataset Overview")
+        st.dataframe(data.describe())
+
+
+
+    # ---- Custom Data Filters ----
+    st.write("### Custom Data Filters")
+    filter_column = st.selectbox("Choose column to filter:", data.columns)
+    filter_value = st.text_input(f"Enter value for {filter_column}:")
+    if st.button("Apply Filter"):
+        filtered_data = data[data[filter_column].astype(str).str.contains(filter_value, na=False)]
+        st.write("Filtered Dataset Overview")
+        st.dataframe(filtered_data.describe())
+
+    # ---- Data Aggregation and Grouping ----
+    st.write("### Data Aggregation and Grouping")
+    group_by_column = st.selectbox("Choose column to group by:", data.columns)
+    agg_function = st.selectbox("Choose aggregation function:", ["Mean", "Sum", "Median", "Count"])
+
+    if st.button("Apply Aggregation"):
+        try:
+            # Check if the chosen aggregation function is compatible with the column types
+            if agg_function in ["Mean", "Sum", "Median"]:
+                # Convert to numeric if possible, otherwise raise an error
+                data[group_by_column] = pd.to_numeric(data[group_by_column], errors='coerce')
+                data_modified = True
+
+            if agg_function == "Mean":
+                grouped_data = data.groupby(group_by_column).mean()
+            elif agg_function == "Sum":
+                grouped_data = data.groupby(group_by_column).sum()
+            elif agg_function == "Median":
+                grouped_data = data.groupby(group_by_column).median()
+            elif agg_function == "Count":
+                grouped_data = data.groupby(group_by_column).size()
+
+            st.write(f"#### Aggregated Data by {group_by_column} ({agg_function})")
+            st.dataframe(grouped_data)
+
+        except Exception as e:
+            st.error(f"Error performing {agg_function} aggregation: {e}")
+
+    # ---- Pairwise Feature Comparison ----
+    def pairwise_comparison():
+        comparison_columns = st.multiselect(
+            "Choose columns for pairwise comparison:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
+        )
+
+        if len(comparison_columns) > 1:
+            st.write("#### Pairwise Scatter Plots")
+            for i in range(len(comparison_columns)):
+                for j in range(i + 1, len(comparison_columns)):
+                    fig = px.scatter(data, x=comparison_columns[i], y=comparison_columns[j], color='Stars Type', title=f"{comparison_columns[i]} vs {comparison_columns[j]}")
+                    st.plotly_chart(fig)
+        else:
+            st.error("Please select more than one column for pairwise comparison.")
+
+    sections.section("Pairwise Feature Comparison", pairwise_comparison)
+
+
+    # ---- Time Series Analysis ----
+    def time_series_analysis():
+        time_column = st.selectbox("Choose time column:", [col for col in data.columns if 'time' in col.lower()])
+        value_column = st.selectbox("Choose value column:", [col for col in data.columns if col != time_column])
+
+        if time_column and value_column:
+            data[time_column] = pd.to_datetime(data[time_column], errors='coerce')
+            fig, ax = plotting.subplots()
+            data.plot(x=time_column, y=value_column, ax=ax)
+            ax.set_title(f'Time Series of {value_column}')
+            plotting.pyplot(fig)
+        else:
+            st.error("Please select both time and value columns for time series analysis.")
+
+    sections.section("Time Series Analysis", time_series_analysis)
+
+
+    # ---- Clustering Analysis ----
+    def clustering_analysis():
+        clustering_columns = st.multiselect(
+            "Choose columns for clustering:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
+        )
+        n_clusters = st.slider("Choose number of clusters:", 2, 10, 3)
+
+        if len(clustering_columns) > 1:
+            st.write("#### K-Means Clustering")
+            # Fitted models are cached per columns, k and data version; cleaned
+            # data is identified by its contents instead of the catalog fingerprint
+            data_key = None if data_modified else fingerprint()
+            clustering = fit_clusters(data, clustering_columns, n_clusters, data_key)
+            data['Cluster'] = np.nan
+            data.loc[clustering['index'], 'Cluster'] = clustering['labels']
+
+            fig = px.scatter(data, x=clustering_columns[0], y=clustering_columns[1], color='Cluster', title=f'K-Means Clustering with {n_clusters} Clusters')
+            st.plotly_chart(fig)
+            st.caption(f"{clustering['algorithm']} fitted in {clustering['fit_seconds']:.2f}s (cached for this data)")
+
+            if st.checkbox(f"Run elbow and silhouette sweep (k = {SWEEP_KS[0]} to {SWEEP_KS[-1]})"):
+                sweep = cluster_sweep(data, clustering_columns, data_key=data_key)
+                elbow_column, silhouette_column = st.columns(2)
+                elbow_column.plotly_chart(px.line(sweep.reset_index(), x='k', y='inertia', markers=True, title='Elbow (Inertia)'), use_container_width=True)
+                silhouette_column.plotly_chart(px.line(sweep.reset_index(), x='k', y='silhouette', markers=True, title='Silhouette Score'), use_container_width=True)
+                st.caption(f"{len(sweep)} fits in {sweep.attrs['wall_seconds']:.2f}s wall time "
+                           f"({sweep['fit_seconds'].sum():.2f}s of fitting across worker processes)")
+        else:
+            st.error("Please select more than one column for clustering.")
+
+    sections.section("Clustering Analysis", clustering_analysis, budget_ms=3000)
+
+
+
+    # ---- Save and Download Processed Data ----
+    st.write("### Save and Download Processed Data")
+    if st.button("Download Processed Data"):
+        processed_data_path = "processed_data.csv"
+        data.to_csv(processed_data_path, index=False)
+        st.markdown(f"[Download processed data](./{processed_data_path})")
+
+    # Catalog statistics still describe `data` unless it was cleaned above
+    column_stats = frame_stats(data) if data_modified else catalog
+
+    # ---- Data Distribution & Skewness ----
+    def distribution_and_skewness():
+        distribution_columns = st.multiselect(
+            "Choose columns to check distribution and skewness:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel', 'narrowband']
+        )
+
+        if distribution_columns:
+            for col in distribution_columns:
+                st.write(f"#### Distribution of {col}")
+                fig, ax = plotting.subplots()
+                sns.histplot(data[col], kde=True, color='teal', ax=ax)
+                ax.set_title(f'Distribution of {col}', fontsize=16)
+                plotting.pyplot(fig)
+
+                # Calculate skewness
+                skewness = column_stats.loc[col, 'skewness']
+                st.write(f"Skewness of {col}: **{skewness:.2f}**")
+        else:
+            st.error("Please select at least one column to analyze distribution and skewness.")
+
+    sections.section("Data Distribution & Skewness", distribution_and_skewness)
+
+    # ---- Outliers Detection ----
+    def outliers_detection():
+        outlier_columns = st.multiselect(
+            "Choose columns to detect outliers:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel', 'narrowband']
+        )
+
+        threshold = st.slider("Set Z-Score Threshold:", 1.5, 5.0, 3.0)
+
+        if outlier_columns:
+            for col in outlier_columns:
+                # Population (ddof=0) z-scores, as scipy.stats.zscore computes them
+                count, mean, std = column_stats.loc[col, ['count', 'mean', 'std']]
+                z_scores = (data[col] - mean).abs() / (std * np.sqrt((count - 1) / count))
+                outliers = data[col][z_scores > threshold]
+                st.write(f"#### {col}: {len(outliers)} outliers found")
+                if not outliers.empty:
+                    st.write(outliers)
+        else:
+            st.error("Please select at least one column for outlier detection.")
+
+    sections.section("Outliers Detection (Z-Score Method)", outliers_detection)
+
+    # ---- Correlation Analysis ----
+    def correlation_analysis():
+        correlation_columns = st.multiselect(
+            "Choose columns for correlation analysis:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel', 'narrowband', 'narrowbanddrd']
+        )
+        correlation_method = st.radio("Correlation method:", ["Pearson", "Spearman"], horizontal=True)
+
+        if len(correlation_columns) >= 2:
+            st.write(f"#### Correlation Matrix for {', '.join(correlation_columns)}")
+            # Whole matrix and p-values at once, over the rows each pair has in common
+            corr_matrix, p_values_matrix = correlation_matrix(data[correlation_columns], correlation_method.lower())
+            fig, ax = plotting.subplots(figsize=(12, 8))
+            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', ax=ax, linewidths=.5)
+            ax.set_title('Correlation Matrix', fontsize=16)
+            plotting.pyplot(fig)
+
+            st.write("#### P-Values Matrix")
+            st.write(p_values_matrix)
+        else:
+            st.error("Please select at least two columns for correlation analysis.")
+
+    sections.section("Correlation Matrix with Statistical Significance", correlation_analysis)
+
+    # ---- Hypothesis Testing (T-Test) ----
+    def t_test():
+        t_test_columns = st.multiselect(
+            "Choose two columns for T-Test:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
+        )
+
+        if len(t_test_columns) == 2:
+            t_stat, p_val = stats.ttest_ind(data[t_test_columns[0]].dropna(), data[t_test_columns[1]].dropna())
+            st.write(f"**T-Test Result**: T-Statistic = {t_stat:.2f}, P-Value = {p_val:.5f}")
+            if p_val < 0.05:
+                st.success(f"The difference between {t_test_columns[0]} and {t_test_columns[1]} is statistically significant.")
+            else:
+                st.info(f"No significant difference between {t_test_columns[0]} and {t_test_columns[1]}.")
+        else:
+            st.error("Please select exactly two columns for the T-Test.")
+
+    sections.section("Hypothesis Testing: T-Test Between Features", t_test)
+
+    # ---- PCA (Principal Component Analysis) ----
+    def pca_analysis():
+        pca_columns = st.multiselect(
+            "Choose columns for PCA:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel', 'narrowband', 'narrowbanddrd']
+        )
+
+        if len(pca_columns) >= 2:
+            pca = PCA(n_components=2)
+            pca_result = pca.fit_transform(data[pca_columns].dropna())
+            pca_df = pd.DataFrame(pca_result, columns=['PC1', 'PC2'])
+
+            st.write("#### PCA Results")
+            fig_pca = px.scatter(pca_df, x='PC1', y='PC2', title='PCA Plot')
+            st.plotly_chart(fig_pca)
+
+            st.write(f"Explained Variance Ratio: {pca.explained_variance_ratio_}")
+        else:
+            st.error("Please select at least two columns for PCA.")
+
+    sections.section("Principal Component Analysis (PCA)", pca_analysis)
+
+
+    # ---- ANOVA (Analysis of Variance) ----
+
+    # ---- Feature Importance (Random Forest) ----
+    def feature_importance_analysis():
+        # 'Stars Type' is the target; the forest is trained on all cores and
+        # its importances cached per feature set and data version
+        features = [col for col in data.columns if col not in ('Stars Type', 'Remarks')]
+        # The fingerprint only stands for the catalog's own columns; derived
+        # ones (the clustering's 'Cluster', engineered features) are hashed
+        derived = [col for col in features if col not in catalog_columns]
+        data_key = None if data_modified or derived else fingerprint()
+        feature_importance = forest_importance(data, features, 'Stars Type', data_key=data_key)
+
+        st.write("#### Feature Importance")
+        fig, ax = plotting.subplots()
+        sns.barplot(x=feature_importance.index, y=feature_importance.values, ax=ax, palette='viridis')
+        ax.set_title('Feature Importance from Random Forest', fontsize=16)
+        plt.xticks(rotation=45)
+        plotting.pyplot(fig)
+        st.caption(f"Forest trained in {feature_importance.attrs['fit_seconds']:.2f} s")
+
+        if st.checkbox("Compute permutation importance"):
+            permutation = permutation_importances(data, features, 'Stars Type', data_key=data_key)
+            fig_perm = px.bar(permutation.reset_index(), x='feature', y='importance_mean', error_y='importance_std',
+                              title='Permutation Importance (drop in held-out accuracy)')
+            st.plotly_chart(fig_perm)
+            st.caption(f"Baseline accuracy {permutation.attrs['baseline_accuracy']:.2f}; "
+                       f"{len(permutation)} features x {N_REPEATS} shuffles in {permutation.attrs['wall_seconds']:.2f} s")
+
+    sections.section("Feature Importance using Random Forest", feature_importance_analysis, budget_ms=5000)
+
+
+    # ---- Machine Learning Model Training ----
+    def model_training():
+        target_column = st.selectbox("Choose target column:", ['Stars Type'])
+        features = st.multiselect("Choose feature columns:", [col for col in data.columns if col != target_column])
+
+        if len(features) > 0 and target_column:
+            X = data[features].dropna()
+            y = data[target_column].dropna()
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            model = RandomForestClassifier(n_estimators=100)
+            with perf.span('fit:model_training'):
+                model.fit(X_train, y_train)
+            predictions = model.predict(X_test)
+
+            st.write("#### Model Performance")
+            st.text(classification_report(y_test, predictions))
+        else:
+            st.error("Please select feature and target columns for model training.")
+
+    sections.section("Machine Learning Model Training", model_training, budget_ms=5000)
+
+    # ---- Summary & Insights ----
+    st.write("### Summary & Key Insights")
+    st.write("""
+    - Comprehensive statistical analysis reveals key insights into the dataset.
+    - Correlation matrix highlights strong linear relationships between various signal properties.
+    - PCA helps in reducing dimensionality and identifying principal components.
+    - Outlier detection shows where the anomalies are in the dataset.
+    - Hypothesis testing indicates statistically significant differences between features.
+    - Random Forest ranks feature importance, indicating which features most influence 'Stars Type'.
+    """)
+
+    sections.summary()
+
+
+if __name__ == "__main__":
+    render()
@@ -1,5 +1,10 @@
 import streamlit as st
 
+import memory
+import perf
+import plotting
+from page_registry import render_page
+
 # Define pages and their corresponding script filenames
 PAGES = {
     "🚀 Predict": "predict.py",
@@ -12,13 +17,11 @@ PAGES = {
     "🔍 Advanced Insights": "Advanced Insights.py",  # New page added
 }
 
-def load_page(page_file):
-    with open(page_file) as f:
-        exec(f.read(), globals())
-
 def main():
     # Set the page configuration
     st.set_page_config(page_title="Signal Classification App", page_icon="🛸", layout="wide")
+    perf.begin_rerun()
+    memory.begin_rerun()
     
     # Custom header
     st.markdown("""
@@ -46,7 +49,12 @@ def main():
     # Display loading spinner while loading the page
     with st.spinner(f"Loading {selection}..."):
         page_file = PAGES[selection]
-        load_page(page_file)
+        try:
+            elapsed = render_page(page_file)
+        finally:
+            # Figures the page opened but never sent, e.g. because it raised
+            plotting.close_unsent()
+    st.sidebar.caption(f"⏱️ {selection} rendered in {elapsed * 1000:.0f} ms")
         
     st.image("Designer2.png", use_column_width=True)
     
@@ -66,6 +74,11 @@ def main():
             <p>Follow me on <a href="https://www.linkedin.com/in/devanik/" target="_blank">Linkedin</a> | <a href="https://github.com/Devanik21" target="_blank">GitHub</a></p>
         </div>
     """, unsafe_allow_html=True)
+
+    # Where this rerun spent its time and what memory it left behind (opt-in
+    # sidebar panels)
+    perf.panel(perf.end_rerun())
+    memory.panel(memory.end_rerun(page_file))
     
 if __name__ == "__main__":
     main()
@@ -0,0 +1,107 @@
+# Compares loading a large signal catalog from CSV with the memory-mapped
+# columnar (Arrow IPC) format, for the whole catalog and for a two-column
+# section. Every measurement runs in a fresh interpreter so RSS is not shared.
+#
+#   python benchmarks/storage.py --rows 2000000
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dataset import DATA_PATH, convert_catalog, load_signals  # noqa: E402
+from scoring import peak_rss_mb  # noqa: E402
+
+SECTION_COLUMNS = ['Signal Frequency(MHz)', 'noise']
+
+CASES = {
+    'csv, all columns': ('csv', None),
+    'csv, 2 columns': ('csv', SECTION_COLUMNS),
+    'arrow, all columns': ('arrow', None),
+    'arrow, 2 columns': ('arrow', SECTION_COLUMNS),
+}
+
+
+def make_catalog(path, rows, chunksize=500_000, seed=0):
+    # Resamples the shipped catalog with a little jitter on the float columns
+    base = pd.read_csv(os.path.join(ROOT, DATA_PATH))
+    floats = base.select_dtypes('float').columns
+    rng = np.random.default_rng(seed)
+    with open(path, 'w', newline='') as out:
+        for start in range(0, rows, chunksize):
+            n = min(chunksize, rows - start)
+            chunk = base.sample(n, replace=True, random_state=rng.integers(2**31)).reset_index(drop=True)
+            chunk[floats] = (chunk[floats] + rng.normal(0, 0.01, (n, len(floats)))).round(4)
+            chunk.to_csv(out, header=(start == 0), index=False)
+
+
+def rss_mb():
+    # Current resident set size; the peak is all we can get off Linux
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return peak_rss_mb()
+
+
+def measure(kind, path, columns):
+    # Runs inside the child interpreter
+    before = rss_mb()
+    start = time.perf_counter()
+    if kind == 'csv':
+        frame = pd.read_csv(path, usecols=columns)
+    else:
+        frame = load_signals(path, columns)
+    seconds = time.perf_counter() - start
+    return {'seconds': seconds, 'rows': len(frame), 'rss_growth_mb': rss_mb() - before}
+
+
+def run_case(kind, path, columns):
+    command = [sys.executable, os.path.abspath(__file__), '--measure', kind, path]
+    if columns:
+        command += ['--columns', json.dumps(columns)]
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CSV vs columnar catalog loading.")
+    parser.add_argument("--rows", type=int, default=2_000_000, help="rows in the synthetic catalog")
+    parser.add_argument("--workdir", default=os.path.join(ROOT, "benchmarks", "data"),
+                        help="where the synthetic catalog is written")
+    parser.add_argument("--measure", nargs=2, metavar=("KIND", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--columns", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        kind, path = args.measure
+        print(json.dumps(measure(kind, path, json.loads(args.columns) if args.columns else None)))
+        return
+
+    os.makedirs(args.workdir, exist_ok=True)
+    csv_path = os.path.join(args.workdir, f"catalog_{args.rows}.csv")
+    arrow_path = os.path.splitext(csv_path)[0] + '.arrow'
+    if not os.path.exists(csv_path):
+        print(f"Writing {args.rows:,} row catalog to {csv_path}...")
+        make_catalog(csv_path, args.rows)
+    start = time.perf_counter()
+    convert_catalog(csv_path, arrow_path)
+    print(f"Converted to {arrow_path} in {time.perf_counter() - start:.2f}s "
+          f"({os.path.getsize(csv_path) / 2**20:.0f} MB csv, {os.path.getsize(arrow_path) / 2**20:.0f} MB arrow)")
+
+    print(f"{'case':<22}{'load (s)':>10}{'RSS growth (MB)':>18}")
+    for name, (kind, columns) in CASES.items():
+        result = run_case(kind, csv_path if kind == 'csv' else arrow_path, columns)
+        print(f"{name:<22}{result['seconds']:>10.3f}{result['rss_growth_mb']:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+# Measures inference latency and throughput, catalog load time and the rerun
+# time of every page in app.PAGES, and compares them with a saved baseline.
+# Apart from the latency percentiles, every timing is the best of several
+# runs, like timeit: slower runs measure whatever else wanted the CPU.
+# Exits with status 1 when a metric is worse than its baseline by more than
+# the threshold, so it can gate CI. Timings only compare on the machine that
+# recorded them, so no baseline is shipped: a gate records one first and runs
+# with --require-baseline, which also fails when there is none to compare to.
+#
+#   python benchmarks/suite.py --save-baseline        # record the baseline
+#   python benchmarks/suite.py                        # compare against it
+#   python benchmarks/suite.py --require-baseline     # compare, as a CI gate
+
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from dataset import DATA_PATH, load_signals  # noqa: E402
+from forest_engine import compile_forest  # noqa: E402
+from model_cache import MODEL_PATH, load_model  # noqa: E402
+from scoring import FEATURE_COLUMNS  # noqa: E402
+
+BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# A metric regresses when it is this much worse than its baseline (relative)
+THRESHOLD = 0.25
+# Page reruns and catalog loads must also be worse by more than this many ms,
+# so scheduler noise on the fast pages and the small shipped catalog does not
+# fail the run. Predict latencies (about 1 ms) are judged on the ratio alone.
+MIN_DELTA_MS = 5.0
+FLOORED_METRICS = ('page_rerun_ms', 'csv_load_ms')
+
+BATCH_SIZES = (1, 100, 1_000, 10_000)
+ENGINES = {'sklearn': lambda model: model, 'flat': compile_forest}
+
+
+def _rows(n, seed=0):
+    # n signals resampled from the shipped catalog
+    catalog = load_signals(os.path.join(ROOT, DATA_PATH))[FEATURE_COLUMNS]
+    return catalog.sample(n, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def predict_latency(model, runs=500):
+    # p50/p95/p99 of one-row predict calls, in ms, per engine
+    rows = _rows(runs)
+    results = {}
+    for engine, compile_engine in ENGINES.items():
+        predictor = compile_engine(model)
+        predictor.predict(rows.iloc[:1])
+        samples = []
+        for i in range(runs):
+            row = rows.iloc[i:i + 1]
+            start = time.perf_counter()
+            predictor.predict(row)
+            samples.append((time.perf_counter() - start) * 1000)
+        for q in (50, 95, 99):
+            results[f'predict_latency_ms.{engine}.p{q}'] = float(np.percentile(samples, q))
+    return results
+
+
+def batch_throughput(model, batch_sizes=BATCH_SIZES, rounds=5, round_seconds=0.2):
+    # Rows per second of predict_proba over batches of each size, per engine,
+    # in the best of several rounds
+    results = {}
+    for size in batch_sizes:
+        batch = _rows(size)
+        for engine, compile_engine in ENGINES.items():
+            predictor = compile_engine(model)
+            predictor.predict_proba(batch)
+            best = 0.0
+            for _ in range(rounds):
+                rows = 0
+                start = time.perf_counter()
+                while time.perf_counter() - start < round_seconds:
+                    predictor.predict_proba(batch)
+                    rows += size
+                best = max(best, rows / (time.perf_counter() - start))
+            results[f'batch_rows_per_second.{engine}.{size}'] = best
+    return results
+
+
+def csv_load(path, runs=5):
+    # Best time to parse the catalog CSV, bypassing dataset's cache
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pd.read_csv(path)
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'csv_load_ms': min(samples)}
+
+
+def page_reruns(runs=5, timeout=300):
+    # Best rerun time of every page, driven headlessly through app.py the
+    # way the sidebar selects it. The first run of a page pays for imports
+    # and caches and is not counted.
+    from streamlit.testing.v1 import AppTest
+    from app import PAGES
+
+    # The pages' own deprecation warnings would drown the report
+    logging.disable(logging.WARNING)
+    results = {}
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=timeout).run()
+    for name, page_file in PAGES.items():
+        at.sidebar.selectbox(key="sidebar").set_value(name).run()
+        if at.exception:
+            raise RuntimeError(f"Page '{page_file}' raised: {at.exception[0].value}")
+        samples = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            at.run()
+            samples.append((time.perf_counter() - start) * 1000)
+        results[f'page_rerun_ms.{page_file}'] = min(samples)
+    return results
+
+
+def higher_is_better(metric):
+    return metric.startswith('batch_rows_per_second')
+
+
+def regressions(results, baseline, threshold=THRESHOLD, min_delta_ms=MIN_DELTA_MS):
+    # (metric, baseline value, current value) for every metric that got worse
+    # by more than `threshold`; metrics missing from either side are skipped
+    worse = []
+    for metric, value in results.items():
+        reference = baseline.get(metric)
+        if reference is None:
+            continue
+        if higher_is_better(metric):
+            if value < reference * (1 - threshold):
+                worse.append((metric, reference, value))
+        elif value > reference * (1 + threshold):
+            floor = min_delta_ms if metric.startswith(FLOORED_METRICS) else 0.0
+            if value - reference > floor:
+                worse.append((metric, reference, value))
+    return worse
+
+
+def run(model_path, csv_path, page_runs):
+    model = load_model(model_path)
+    results = {}
+    results.update(predict_latency(model))
+    results.update(batch_throughput(model))
+    results.update(csv_load(csv_path))
+    if page_runs:
+        results.update(page_reruns(page_runs))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark inference, catalog loading and page reruns.")
+    parser.add_argument("--model", default=os.path.join(ROOT, MODEL_PATH), help="model to benchmark")
+    parser.add_argument("--csv", default=os.path.join(ROOT, DATA_PATH), help="catalog CSV to time loading")
+    parser.add_argument("--page-runs", type=int, default=5, help="reruns timed per page (0 skips pages)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare against or save")
+    parser.add_argument("--save-baseline", action="store_true", help="record this run as the baseline")
+    parser.add_argument("--require-baseline", action="store_true",
+                        help="exit with status 1 when there is no baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD,
+                        help="relative slowdown that counts as a regression")
+    parser.add_argument("--output", help="also write this run's results to a JSON file")
+    args = parser.parse_args()
+    if args.require_baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        # Fail before spending minutes on a run that cannot be judged
+        parser.exit(1, f"No baseline at {args.baseline}; run with --save-baseline to record one.\n")
+
+    # Pages open their images and data files by relative path
+    os.chdir(ROOT)
+    warnings.simplefilter('ignore')
+    results = run(args.model, args.csv, args.page_runs)
+    report = {
+        'machine': platform.node(),
+        'python': platform.python_version(),
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'metrics': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    baseline = {}
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)['metrics']
+
+    print(f"{'metric':<48}{'value':>14}{'baseline':>14}{'change':>9}")
+    for metric, value in results.items():
+        reference = baseline.get(metric)
+        change = f"{(value / reference - 1) * 100:+.0f}%" if reference else ""
+        reference = f"{reference:.3f}" if reference is not None else "-"
+        print(f"{metric:<48}{value:>14.3f}{reference:>14}{change:>9}")
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        if args.require_baseline:
+            sys.exit(1)
+        return
+
+    worse = regressions(results, baseline, args.threshold)
+    for metric, reference, value in worse:
+        print(f"REGRESSION {metric}: {reference:.3f} -> {value:.3f}")
+    if worse:
+        sys.exit(1)
+    print(f"No metric regressed by more than {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
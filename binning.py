@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from scoring import WARNING_LABEL
+
+# Scatter-type charts with more points than this are drawn from a reduced
+# frame (a class-preserving sample or a grid of binned cells) instead
+MAX_POINTS = 50_000
+
+# Classes that are never sampled away: every one of their points is plotted
+KEEP_CLASSES = (WARNING_LABEL,)
+
+
+def needs_reduction(n_points, max_points=None):
+    return n_points > (MAX_POINTS if max_points is None else max_points)
+
+
+def stratified_sample(frame, by='Remarks', n=None, keep=KEEP_CLASSES, random_state=0):
+    # At most about `n` rows of `frame`: every row of a `keep` class, the rest
+    # split between the other classes in proportion to their size (each class
+    # keeps at least one row). Frames already small enough are returned as is.
+    n = MAX_POINTS if n is None else n
+    if len(frame) <= n:
+        return frame
+    rng = np.random.default_rng(random_state)
+    if by not in frame.columns:
+        return frame.iloc[np.sort(rng.choice(len(frame), n, replace=False))]
+
+    labels = frame[by]
+    kept = labels.isin(keep).to_numpy()
+    kept_rows = np.flatnonzero(kept)
+    if len(kept_rows) >= n:
+        return frame.iloc[np.sort(rng.choice(kept_rows, n, replace=False))]
+
+    codes, _ = pd.factorize(labels.where(~kept))
+    counts = np.bincount(codes[codes >= 0])
+    quotas = np.minimum(counts, np.maximum(1, np.round((n - len(kept_rows)) * counts / counts.sum()).astype(np.int64)))
+    taken = [kept_rows]
+    for code, quota in enumerate(quotas):
+        taken.append(rng.choice(np.flatnonzero(codes == code), quota, replace=False))
+    return frame.iloc[np.sort(np.concatenate(taken))]
+
+
+def _grid(values, bins):
+    # Equal-width bin of every value along each column, the cell width and the
+    # lower edge. Values at the upper edge fall in the last bin like np.histogram.
+    lo = values.min(axis=0)
+    hi = values.max(axis=0)
+    width = np.where(hi > lo, (hi - lo) / bins, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        index = np.where(width > 0, np.floor((values - lo) / width), 0)
+    return np.clip(index, 0, bins - 1).astype(np.int64), width, lo
+
+
+def density_grid(frame, x, y, bins=100):
+    # Point counts on a bins x bins grid over x and y, ready for pcolormesh:
+    # (counts indexed [x_bin, y_bin], x_edges, y_edges)
+    values = frame[[x, y]].to_numpy(dtype=np.float64)
+    values = values[~np.isnan(values).any(axis=1)]
+    if not len(values):
+        return np.zeros((bins, bins), dtype=np.int64), np.linspace(0, 1, bins + 1), np.linspace(0, 1, bins + 1)
+    index, width, lo = _grid(values, bins)
+    counts = np.bincount(index[:, 0] * bins + index[:, 1], minlength=bins * bins).reshape(bins, bins)
+    edges = [lo[j] + width[j] * np.arange(bins + 1) for j in range(2)]
+    return counts, edges[0], edges[1]
+
+
+def bin_points(frame, columns, bins=50, by=None, weights=()):
+    # Aggregates points into equal-width cells over `columns` (two for a 2D
+    # grid, three for voxels), per `by` class when given. Returns one row per
+    # non-empty cell, named like the input so it plots with the same code: the
+    # cell centre in `columns`, the class in `by`, the number of points in
+    # 'count' and the mean of each `weights` column over the cell.
+    values = frame[columns].to_numpy(dtype=np.float64)
+    valid = ~np.isnan(values).any(axis=1)
+    shape = (bins,) * len(columns)
+    if by is not None:
+        codes, classes = pd.factorize(frame[by])
+        valid &= codes >= 0
+        shape += (len(classes),)
+    if not valid.any():
+        return pd.DataFrame(columns=list(columns) + ([by] if by is not None else []) + ['count'] + list(weights))
+
+    index, width, lo = _grid(values[valid], bins)
+    if by is not None:
+        index = np.column_stack([index, codes[valid]])
+    cell = np.ravel_multi_index(index.T, shape)
+
+    counts = np.bincount(cell, minlength=int(np.prod(shape)))
+    occupied = np.flatnonzero(counts)
+    position = np.unravel_index(occupied, shape)
+    binned = pd.DataFrame({column: lo[j] + (position[j] + 0.5) * width[j] for j, column in enumerate(columns)})
+    if by is not None:
+        binned[by] = classes.take(position[-1])
+    binned['count'] = counts[occupied]
+    for column in weights:
+        sums = np.bincount(cell, weights=frame[column].to_numpy(dtype=np.float64)[valid], minlength=len(counts))
+        binned[column] = sums[occupied] / counts[occupied]
+    return binned
+
+
+def sample_note(frame, by='Remarks', n=None):
+    # Caption for a chart drawn from stratified_sample(frame, by, n)
+    n = MAX_POINTS if n is None else n
+    note = f"Showing a class-preserving sample of about {n:,} of {len(frame):,} signals"
+    if by in frame.columns:
+        warnings = int((frame[by] == WARNING_LABEL).sum())
+        if 0 < warnings < n:
+            note += f"; all {warnings:,} alien-signal warnings are included"
+    return note + "."
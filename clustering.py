@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans, MiniBatchKMeans
+from sklearn.metrics import silhouette_score
+
+import perf
+from dataset import frame_key
+
+# Above this many rows KMeans is fitted incrementally: one pass of
+# MiniBatchKMeans.partial_fit over shuffled batches of BATCH_ROWS rows. On a
+# 2M row catalog that is 3-5x faster than Lloyd iterations over every row,
+# at a similar inertia.
+INCREMENTAL_ROWS = 200_000
+BATCH_ROWS = 100_000
+
+# The exact silhouette score is quadratic in rows, so it is estimated on a sample
+SILHOUETTE_SAMPLE = 5000
+
+SWEEP_KS = tuple(range(2, 11))
+
+# Fitted models (with their label arrays) and sweeps kept per cache, least
+# recently used evicted first
+MAX_ENTRIES = 32
+
+# Fitted models and sweeps are kept at module level, keyed by the columns,
+# k and the version of the data they were fitted on, and shared by every
+# session and rerun
+_lock = threading.Lock()
+_models = OrderedDict()
+_sweeps = OrderedDict()
+
+
+def _cached(cache, key):
+    with _lock:
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+        return result
+
+
+def _store(cache, key, result):
+    with _lock:
+        cache[key] = result
+        cache.move_to_end(key)
+        while len(cache) > MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _fit(values, k, silhouette=False, random_state=0):
+    # Runs in the worker processes of cluster_sweep too, so it must stay a
+    # module-level function
+    start = time.perf_counter()
+    if len(values) > INCREMENTAL_ROWS:
+        model = MiniBatchKMeans(n_clusters=k, n_init=3, random_state=random_state)
+        # Shuffled so every batch is representative of the whole catalog
+        order = np.random.default_rng(random_state).permutation(len(values))
+        for batch in range(0, len(values), BATCH_ROWS):
+            model.partial_fit(values[order[batch:batch + BATCH_ROWS]])
+        labels = model.predict(values)
+        inertia = -model.score(values)
+    else:
+        model = KMeans(n_clusters=k, n_init='auto', random_state=random_state).fit(values)
+        labels, inertia = model.labels_, model.inertia_
+    entry = {
+        'model': model,
+        'labels': labels,
+        'inertia': inertia,
+        'algorithm': type(model).__name__,
+        'fit_seconds': time.perf_counter() - start,
+    }
+    if silhouette:
+        if len(np.unique(labels)) > 1:
+            entry['silhouette'] = silhouette_score(values, labels, sample_size=min(len(values), SILHOUETTE_SAMPLE), random_state=random_state)
+        else:
+            entry['silhouette'] = np.nan
+    return entry
+
+
+def fit_clusters(frame, columns, k, data_key=None):
+    # KMeans with k clusters over `columns` of `frame`, skipping rows with
+    # missing values. Returns the cached entry: 'model', 'labels' and 'index'
+    # (the rows the labels belong to), 'inertia', 'algorithm', 'fit_seconds'.
+    rows = frame[columns].dropna()
+    key = (tuple(columns), k, frame_key(rows, data_key))
+    entry = _cached(_models, key)
+    if entry is None:
+        with perf.span('fit:kmeans'):
+            entry = _fit(rows.to_numpy(dtype=np.float64), k)
+        entry['index'] = rows.index
+        _store(_models, key, entry)
+    return entry
+
+
+def cluster_sweep(frame, columns, ks=SWEEP_KS, data_key=None, n_jobs=-1):
+    # Inertia (for an elbow plot) and silhouette score for every k in `ks`.
+    # Each k is fitted in its own worker process, so the sweep takes about as
+    # long as the slowest single fit given enough cores. The fitted models go
+    # into the fit_clusters cache as well. Returns a DataFrame indexed by k;
+    # attrs['wall_seconds'] holds the elapsed time of the sweep.
+    rows = frame[columns].dropna()
+    data_key = frame_key(rows, data_key)
+    key = (tuple(columns), tuple(ks), data_key)
+    result = _cached(_sweeps, key)
+    if result is not None:
+        return result.copy()
+
+    values = rows.to_numpy(dtype=np.float64)
+    start = time.perf_counter()
+    with perf.span('fit:kmeans_sweep'):
+        fits = joblib.Parallel(n_jobs=n_jobs, backend='loky')(joblib.delayed(_fit)(values, k, True) for k in ks)
+    wall_seconds = time.perf_counter() - start
+
+    for k, entry in zip(ks, fits):
+        entry['index'] = rows.index
+        _store(_models, (tuple(columns), k, data_key), entry)
+    result = pd.DataFrame({
+        'inertia': [entry['inertia'] for entry in fits],
+        'silhouette': [entry['silhouette'] for entry in fits],
+        'fit_seconds': [entry['fit_seconds'] for entry in fits],
+    }, index=pd.Index(ks, name='k'))
+    result.attrs['wall_seconds'] = wall_seconds
+    _store(_sweeps, key, result)
+    return result.copy()
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+from scipy import special, stats
+
+import perf
+
+
+def _as_matrix(frame):
+    # Non-numeric values become NaN instead of failing the whole matrix
+    return frame.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _pearson(values):
+    # Pearson r of every column pair, plus the number of rows both columns
+    # have. Without missing values this is one matrix product of the
+    # standardized columns. Otherwise the sums are restricted to the rows
+    # each pair has in common (pairwise-complete, like DataFrame.corr) using
+    # the validity mask, still a handful of k x k products.
+    valid = ~np.isnan(values)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if valid.all():
+            centered = values - values.mean(axis=0)
+            z = centered / np.sqrt((centered**2).sum(axis=0))
+            r = z.T @ z
+            n = np.full(r.shape, float(len(values)))
+        else:
+            mask = valid.astype(np.float64)
+            # Centering first keeps the sums well conditioned; any per-column
+            # constant leaves r unchanged
+            centered = np.where(valid, values - np.nanmean(values, axis=0), 0.0)
+            n = mask.T @ mask
+            sx = centered.T @ mask
+            sxx = (centered**2).T @ mask
+            sxy = centered.T @ centered
+            cov = sxy - sx * sx.T / n
+            r = cov / np.sqrt((sxx - sx**2 / n) * (sxx.T - sx.T**2 / n))
+    r = np.clip(r, -1.0, 1.0)
+    # A column correlates perfectly with itself wherever r is defined at all
+    diagonal = np.diag_indices_from(r)
+    r[diagonal] = np.where(np.isnan(r[diagonal]), np.nan, 1.0)
+    return r, n
+
+
+def _spearman(values):
+    ranks = pd.DataFrame(values).rank().to_numpy()
+    r, n = _pearson(ranks)
+    valid = ~np.isnan(values)
+    if valid.all():
+        return r, n
+    # Ranks depend on which rows take part, so pairs that don't share the
+    # same missing rows are re-ranked over the rows they have in common
+    k = values.shape[1]
+    for i in range(k):
+        for j in range(i + 1, k):
+            if (valid[:, i] == valid[:, j]).all():
+                continue
+            both = valid[:, i] & valid[:, j]
+            pair = pd.DataFrame(values[both][:, [i, j]]).rank().to_numpy()
+            r_pair, _ = _pearson(pair)
+            r[i, j] = r[j, i] = r_pair[0, 1]
+    return r, n
+
+
+def _pearson_pvalues(r, n):
+    # Two-sided p-value of scipy.stats.pearsonr: r follows a beta distribution
+    # on [-1, 1] with a = b = n/2 - 1 under the null hypothesis
+    with np.errstate(invalid='ignore', divide='ignore'):
+        a = np.where(n > 2, n / 2 - 1, np.nan)
+        return np.clip(2 * special.betainc(a, a, (1 - np.abs(r)) / 2), 0.0, 1.0)
+
+
+def _spearman_pvalues(r, n):
+    # Two-sided p-value of scipy.stats.spearmanr (t-distribution, n - 2 dof)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        dof = np.where(n > 2, n - 2, np.nan)
+        t = r * np.sqrt(dof / ((r + 1.0) * (1.0 - r)))
+        return 2 * stats.t.sf(np.abs(t), dof)
+
+
+@perf.timed('correlation')
+def correlation_matrix(frame, method='pearson'):
+    # Correlation of every pair of columns in `frame` and the matching matrix
+    # of two-sided p-values, as DataFrames labelled by column.
+    # method is 'pearson' or 'spearman'.
+    values = _as_matrix(frame)
+    if method == 'pearson':
+        r, n = _pearson(values)
+        p = _pearson_pvalues(r, n)
+    elif method == 'spearman':
+        r, n = _spearman(values)
+        p = _spearman_pvalues(r, n)
+    else:
+        raise ValueError(f"Unknown correlation method '{method}'")
+
+    p[np.diag_indices_from(p)] = np.where(np.isnan(r.diagonal()), np.nan, 0.0)
+    columns = frame.columns
+    return pd.DataFrame(r, index=columns, columns=columns), pd.DataFrame(p, index=columns, columns=columns)
@@ -0,0 +1,210 @@
+import itertools
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATA_PATH, fingerprint, load_signals
+from signal_index import CLASS_COLUMN, RANGE_COLUMNS
+
+# Bins per dimension of the cube; dimensions with at most this many distinct
+# values get one bin per value instead
+BINS = 32
+
+# One cube per catalog, rebuilt when the catalog changes and shared by every
+# session
+_lock = threading.Lock()
+_cubes = {}
+
+
+class SummaryCube:
+    # Count, sum and sum of squares of every measure column, aggregated over a
+    # grid of binned dimension columns x class. The aggregates are stored as
+    # prefix sums, so the total over any box of whole bins is an
+    # inclusion-exclusion of 2^d corners whatever its size. A range filter
+    # rarely falls on bin edges: the rows of the partially covered bins along
+    # its edges are kept grouped by bin and checked one by one, so summaries
+    # are exact. Rows missing a dimension value are left out, as they never
+    # match a range.
+
+    def __init__(self, frame, dimensions=RANGE_COLUMNS, measures=RANGE_COLUMNS, class_column=CLASS_COLUMN, bins=BINS):
+        self.dimensions = list(dimensions)
+        self.measures = list(measures)
+
+        values = frame[self.dimensions].to_numpy(dtype=np.float64)
+        measured = frame[self.measures].to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values).any(axis=1)
+        codes, self.classes = pd.factorize(frame[class_column])
+        codes[codes < 0] = len(self.classes)
+        values, measured, codes = values[valid], measured[valid], codes[valid]
+
+        # Measures are accumulated around their overall mean so sums of
+        # squares stay well conditioned
+        self.center = np.nanmean(measured, axis=0) if len(measured) else np.zeros(len(self.measures))
+        measured = measured - self.center
+        present = ~np.isnan(measured)
+        measured = np.where(present, measured, 0.0)
+
+        # Whether a bin lies entirely inside a range is decided from the
+        # smallest and largest value actually in it, so it is exact
+        self.edges = []
+        self.bin_min = []
+        self.bin_max = []
+        index = np.empty(values.shape, dtype=np.int64)
+        for j in range(len(self.dimensions)):
+            distinct = np.unique(values[:, j])
+            if len(distinct) <= bins:
+                edges = np.append(distinct, distinct[-1]) if len(distinct) else np.zeros(2)
+            else:
+                edges = np.linspace(distinct[0], distinct[-1], bins + 1)
+            n_bins = len(edges) - 1
+            index[:, j] = np.clip(np.searchsorted(edges, values[:, j], side='right') - 1, 0, n_bins - 1)
+            bin_min = np.full(n_bins, np.inf)
+            bin_max = np.full(n_bins, -np.inf)
+            np.minimum.at(bin_min, index[:, j], values[:, j])
+            np.maximum.at(bin_max, index[:, j], values[:, j])
+            self.edges.append(edges)
+            self.bin_min.append(bin_min)
+            self.bin_max.append(bin_max)
+
+        shape = tuple(len(edges) - 1 for edges in self.edges) + (len(self.classes) + 1,)
+        cell = np.ravel_multi_index(tuple(index.T) + (codes,), shape)
+        size = int(np.prod(shape))
+        counts = np.bincount(cell, minlength=size).reshape(shape)
+        sums = np.stack([np.bincount(cell, weights=measured[:, k], minlength=size) for k in range(len(self.measures))], axis=-1)
+        squares = np.stack([np.bincount(cell, weights=measured[:, k]**2, minlength=size) for k in range(len(self.measures))], axis=-1)
+        present_counts = np.stack([np.bincount(cell, weights=present[:, k], minlength=size) for k in range(len(self.measures))], axis=-1)
+        self.prefix = {
+            'rows': self._prefix(counts),
+            'count': self._prefix(present_counts.reshape(shape + (-1,))),
+            'sum': self._prefix(sums.reshape(shape + (-1,))),
+            'sumsq': self._prefix(squares.reshape(shape + (-1,))),
+        }
+
+        # Rows grouped by cell, for the exact pass over partially covered bins
+        self.order = np.argsort(cell, kind='stable')
+        self.cell_start = np.concatenate([[0], np.cumsum(counts.ravel())])
+        self.shape = shape
+        self.values = values
+        self.measured = measured
+        self.present = present
+        self.codes = codes
+
+    def _prefix(self, table):
+        # Cumulative sums along the binned axes, padded with a leading zero
+        for axis in range(len(self.dimensions)):
+            table = np.cumsum(table, axis=axis)
+            pad = [(0, 0)] * table.ndim
+            pad[axis] = (1, 0)
+            table = np.pad(table, pad)
+        return table
+
+    def _box(self, table, low, high):
+        # Total of `table` over bins low[j]..high[j] (inclusive) of every
+        # dimension, per class
+        total = 0
+        for corner in itertools.product((0, 1), repeat=len(self.dimensions)):
+            position = tuple(high[j] + 1 if upper else low[j] for j, upper in enumerate(corner))
+            sign = (-1) ** (len(corner) - sum(corner))
+            total = total + sign * table[position]
+        return total
+
+    def _bin_span(self, j, low, high):
+        # (first, last) bins touched by [low, high] along dimension j, and
+        # (first, last) bins lying entirely inside it, or None if it misses
+        edges = self.edges[j]
+        low = -np.inf if low is None else low
+        high = np.inf if high is None else high
+        if low > high or high < edges[0] or low > edges[-1]:
+            return None
+        n_bins = len(edges) - 1
+        first = int(np.clip(np.searchsorted(edges, low, side='right') - 1, 0, n_bins - 1))
+        last = int(np.clip(np.searchsorted(edges, high, side='right') - 1, 0, n_bins - 1))
+        full_first = first if self.bin_min[j][first] >= low else first + 1
+        full_last = last if self.bin_max[j][last] <= high else last - 1
+        return first, last, full_first, full_last
+
+    def summary(self, ranges=None, contains=()):
+        # Number of rows inside every {dimension: (low, high)} range
+        # (inclusive; None leaves a side open) whose class contains every
+        # string in `contains`, with the mean and standard deviation (ddof=1)
+        # of each measure over them, like DataFrame.mean()/std()
+        ranges = ranges or {}
+        allowed = np.ones(len(self.classes) + 1, dtype=bool)
+        allowed[-1] = not contains
+        for pattern in contains:
+            allowed[:-1] &= np.asarray(self.classes.str.contains(pattern, regex=False), dtype=bool)
+
+        spans = [self._bin_span(j, *ranges.get(column, (None, None))) for j, column in enumerate(self.dimensions)]
+        rows = 0
+        count = np.zeros(len(self.measures))
+        sums = np.zeros(len(self.measures))
+        squares = np.zeros(len(self.measures))
+        if all(span is not None for span in spans) and allowed.any():
+            low = [span[2] for span in spans]
+            high = [span[3] for span in spans]
+            if all(l <= h for l, h in zip(low, high)):
+                rows = int(self._box(self.prefix['rows'], low, high)[allowed].sum())
+                count = self._box(self.prefix['count'], low, high)[allowed].sum(axis=0)
+                sums = self._box(self.prefix['sum'], low, high)[allowed].sum(axis=0)
+                squares = self._box(self.prefix['sumsq'], low, high)[allowed].sum(axis=0)
+
+            edge_rows = self._edge_rows(spans, allowed)
+            if len(edge_rows):
+                keep = np.ones(len(edge_rows), dtype=bool)
+                for j, column in enumerate(self.dimensions):
+                    bound_low, bound_high = ranges.get(column, (None, None))
+                    if bound_low is not None:
+                        keep &= self.values[edge_rows, j] >= bound_low
+                    if bound_high is not None:
+                        keep &= self.values[edge_rows, j] <= bound_high
+                edge_rows = edge_rows[keep]
+                rows += len(edge_rows)
+                count = count + self.present[edge_rows].sum(axis=0)
+                sums = sums + self.measured[edge_rows].sum(axis=0)
+                squares = squares + (self.measured[edge_rows]**2).sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, self.center + sums / count, np.nan)
+            variance = np.where(count > 1, (squares - sums**2 / count) / (count - 1), np.nan)
+        return {
+            'count': rows,
+            'mean': pd.Series(mean, index=self.measures),
+            'std': pd.Series(np.sqrt(np.maximum(variance, 0.0)), index=self.measures),
+        }
+
+    def _edge_rows(self, spans, allowed):
+        # Rows of the cells touched by the ranges but not entirely inside them
+        touched = np.zeros(self.shape[:-1], dtype=bool)
+        inside = np.zeros(self.shape[:-1], dtype=bool)
+        touched[tuple(slice(span[0], span[1] + 1) for span in spans)] = True
+        if all(span[2] <= span[3] for span in spans):
+            inside[tuple(slice(span[2], span[3] + 1) for span in spans)] = True
+        cells = touched & ~inside
+        cells = cells[..., np.newaxis] & allowed
+        flat = np.flatnonzero(cells)
+        starts = self.cell_start[flat]
+        lengths = self.cell_start[flat + 1] - starts
+        if not lengths.sum():
+            return np.empty(0, dtype=np.intp)
+        offsets = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths)
+        return self.order[np.arange(lengths.sum()) + offsets]
+
+
+def summary_cube(path=DATA_PATH, bins=BINS):
+    # The cube of a catalog, built on first use and again only when the
+    # catalog changes on disk
+    key = (os.path.abspath(path), bins)
+    version = fingerprint(path)
+    entry = _cubes.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _lock:
+        entry = _cubes.get(key)
+        if entry is None or entry[0] != version:
+            frame = load_signals(path, columns=list(RANGE_COLUMNS) + [CLASS_COLUMN])
+            entry = (version, SummaryCube(frame, bins=bins))
+            _cubes[key] = entry
+    return entry[1]
@@ -0,0 +1,220 @@
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import perf
+
+DATA_PATH = "narrowband signals.csv"
+
+# Extensions read as Arrow IPC (Feather v2) files instead of CSV
+COLUMNAR_EXTENSIONS = ('.arrow', '.feather')
+
+# Parsed catalogs are kept at module level, keyed by absolute path and column
+# selection, and shared by every page, session and rerun. A catalog is parsed again only when its
+# file changes on disk.
+_lock = threading.Lock()
+_frames = {}
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _freeze(frame):
+    # Make the cached arrays read-only so an in-place write through a page's
+    # view raises instead of silently corrupting the shared copy. Replacing or
+    # adding whole columns on a view still works as usual.
+    for values in frame._mgr.arrays:
+        if isinstance(values, np.ndarray):
+            values.flags.writeable = False
+    return frame
+
+
+def _read(path, columns):
+    if path.lower().endswith(COLUMNAR_EXTENSIONS):
+        return _read_columnar(path, columns)
+    return pd.read_csv(path)
+
+
+def _read_columnar(path, columns):
+    import pyarrow as pa
+
+    # The file is memory-mapped, so only the pages backing the requested
+    # columns are ever read from disk
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True)
+
+
+def columnar_path(path):
+    # The columnar sibling written by convert_catalog for a CSV catalog
+    return os.path.splitext(path)[0] + '.arrow'
+
+
+def _source(path):
+    # Serve CSV catalogs from their columnar copy when one exists and is at
+    # least as new as the CSV; the CSV stays the source of truth
+    path = os.path.abspath(path)
+    if not path.lower().endswith(COLUMNAR_EXTENSIONS):
+        converted = columnar_path(path)
+        if os.path.exists(converted) and os.stat(converted).st_mtime_ns >= os.stat(path).st_mtime_ns:
+            return converted
+    return path
+
+
+def _resolve(path, columns):
+    path = _source(path)
+    # A projected CSV read still parses every row, so cache the full frame
+    # once and select from it instead of parsing it again per column set
+    if columns is not None and not path.lower().endswith(COLUMNAR_EXTENSIONS):
+        columns = None
+    return path, tuple(columns) if columns is not None else None
+
+
+def _cached_frame(path, columns=None):
+    key = _resolve(path, columns)
+    path, columns = key
+    signature = _signature(path)
+    entry = _frames.get(key)
+    if entry is not None and entry['signature'] == signature:
+        return entry
+    # A column subset is served from the whole catalog when that is already
+    # parsed, rather than keeping a second copy of its columns
+    full = _frames.get((path, None))
+    if columns is not None and full is not None and full['signature'] == signature:
+        return full
+
+    with _lock:
+        entry = _frames.get(key)
+        if entry is None or entry['signature'] != signature:
+            start = time.perf_counter()
+            with perf.span('data_parse'):
+                frame = _freeze(_read(path, list(columns) if columns is not None else None))
+            entry = {
+                'frame': frame,
+                'signature': signature,
+                'path': path,
+                'columns': list(frame.columns),
+                'rows': len(frame),
+                'load_seconds': time.perf_counter() - start,
+                'loaded_at': time.time(),
+            }
+            _frames[key] = entry
+            if columns is None:
+                # Subsets read before the whole catalog are now redundant
+                for other in [other for other in _frames if other[0] == path and other[1] is not None]:
+                    del _frames[other]
+    return entry
+
+
+@perf.timed('data_load')
+def load_signals(path=DATA_PATH, columns=None):
+    # A shallow, read-only view of the cached catalog; cheap enough to call on
+    # every rerun. Pass `columns` to load just what a section needs: columnar
+    # catalogs then read only those columns. Raises FileNotFoundError like
+    # pd.read_csv.
+    frame = _cached_frame(path, columns)['frame']
+    if columns is not None and list(frame.columns) != list(columns):
+        return frame[list(columns)]
+    return frame.copy(deep=False)
+
+
+def iter_chunks(path=DATA_PATH, chunksize=500_000, columns=None):
+    # Yields the catalog as DataFrames of at most `chunksize` rows without
+    # loading it whole, from the columnar copy when there is a fresh one
+    path = _source(path)
+    columns = list(columns) if columns is not None else None
+    if not path.lower().endswith(COLUMNAR_EXTENSIONS):
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+        return
+
+    import pyarrow as pa
+
+    with pa.memory_map(path) as source:
+        reader = pa.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            if columns is not None:
+                batch = batch.select(columns)
+            for start in range(0, batch.num_rows, chunksize):
+                yield batch.slice(start, chunksize).to_pandas()
+
+
+def convert_catalog(csv_path=DATA_PATH, out_path=None, chunksize=500_000):
+    # Streams a CSV catalog into an uncompressed Arrow IPC file (memory-mappable
+    # and readable column by column) without holding the whole CSV in memory
+    import pyarrow as pa
+
+    out_path = out_path or columnar_path(csv_path)
+    schema = None
+    integer_columns = {}
+    rows = 0
+    writer = None
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            if schema is None:
+                # Integer columns may gain missing values in a later chunk;
+                # nullable integers keep one schema across all chunks
+                integer_columns = {column: 'Int64' for column in chunk.columns
+                                   if pd.api.types.is_integer_dtype(chunk[column])}
+                chunk = chunk.astype(integer_columns)
+                schema = pa.Schema.from_pandas(chunk, preserve_index=False).remove_metadata()
+                writer = pa.ipc.new_file(out_path, schema)
+            else:
+                chunk = chunk.astype(integer_columns)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {'rows': rows, 'output': out_path}
+
+
+def fingerprint(path=DATA_PATH):
+    # Short stable id of the catalog's current contents, for keying caches
+    # of anything derived from it (models, figures, statistics...)
+    path = os.path.abspath(path)
+    mtime, size = _signature(path)
+    return hashlib.sha1(f"{path}|{mtime}|{size}".encode()).hexdigest()[:16]
+
+
+def frame_key(frame, data_key=None):
+    # Cache key of a frame derived from the catalog. Callers pass the
+    # catalog's fingerprint as `data_key` only for its unmodified columns;
+    # cleaned, filtered or extended frames are keyed by hashing their values.
+    if data_key is not None:
+        return data_key
+    hashes = pd.util.hash_pandas_object(frame, index=True).to_numpy()
+    return hashlib.sha1(hashes.tobytes()).hexdigest()[:16]
+
+
+def dataset_info(path=DATA_PATH, columns=None):
+    # Load statistics for a cached catalog, or None if it was never loaded
+    entry = _frames.get(_resolve(path, columns))
+    if entry is None:
+        return None
+    return {key: value for key, value in entry.items() if key != 'frame'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a signal catalog CSV to the columnar Arrow format.")
+    parser.add_argument("source", nargs="?", default=DATA_PATH, help="catalog CSV")
+    parser.add_argument("destination", nargs="?", help="output file (default: next to the CSV, .arrow)")
+    parser.add_argument("--chunksize", type=int, default=500_000, help="CSV rows converted per batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    result = convert_catalog(args.source, args.destination, args.chunksize)
+    print(f"{result['rows']:,} rows -> {result['output']} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+import perf
+from dataset import frame_key
+
+N_ESTIMATORS = 100
+N_REPEATS = 10
+
+# Importances kept per cache, least recently used evicted first
+MAX_ENTRIES = 64
+
+# Importances are kept at module level, keyed by the feature set, the target
+# and the version of the data they were computed on, and shared by every
+# session and rerun. The forests behind them are not kept.
+_lock = threading.Lock()
+_importances = OrderedDict()
+_permutations = OrderedDict()
+
+
+def _cached(cache, key):
+    with _lock:
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+        return result
+
+
+def _store(cache, key, result):
+    with _lock:
+        cache[key] = result
+        cache.move_to_end(key)
+        while len(cache) > MAX_ENTRIES:
+            cache.popitem(last=False)
+
+
+def _rows(frame, features, target):
+    # Features and target of the rows with no missing value in either
+    rows = frame[list(features) + [target]].dropna()
+    return rows, rows[list(features)], rows[target]
+
+
+def _forest(X, y, n_estimators, n_jobs):
+    start = time.perf_counter()
+    with perf.span('fit:feature_importance'):
+        model = RandomForestClassifier(n_estimators=n_estimators, random_state=0, n_jobs=n_jobs).fit(X, y)
+    return model, time.perf_counter() - start
+
+
+def forest_importance(frame, features, target, data_key=None, n_estimators=N_ESTIMATORS, n_jobs=-1):
+    # Impurity-based importance of every feature for predicting `target`, from
+    # a random forest whose trees are grown on all cores. Returns a Series
+    # sorted from most to least important; attrs['fit_seconds'] holds the time
+    # the forest took to train.
+    features = list(features)
+    rows, X, y = _rows(frame, features, target)
+    key = (tuple(features), target, frame_key(rows, data_key), n_estimators)
+    importance = _cached(_importances, key)
+    if importance is None:
+        model, fit_seconds = _forest(X, y, n_estimators, n_jobs)
+        importance = pd.Series(model.feature_importances_, index=features).sort_values(ascending=False)
+        importance.attrs['fit_seconds'] = fit_seconds
+        _store(_importances, key, importance)
+    return importance.copy()
+
+
+def _permuted_score(model, X, y, column, seed):
+    # Accuracy of `model` once `column` of X is shuffled; one loky job
+    X = X.copy()
+    X[:, column] = np.random.default_rng(seed).permutation(X[:, column])
+    return float((model.predict(X) == y).mean())
+
+
+def permutation_importances(frame, features, target, data_key=None, n_repeats=N_REPEATS, n_estimators=N_ESTIMATORS, n_jobs=-1):
+    # Drop in held-out accuracy when each feature is shuffled, averaged over
+    # `n_repeats` shuffles. The forest is trained on 80% of the rows and
+    # scored on the rest; every (feature, repeat) shuffle is its own job, so
+    # they are spread over all worker processes. Returns a DataFrame indexed
+    # by feature with 'importance_mean' and 'importance_std', sorted by the
+    # mean; attrs['wall_seconds'] holds the time the shuffles took.
+    features = list(features)
+    rows, X, y = _rows(frame, features, target)
+    key = (tuple(features), target, frame_key(rows, data_key), n_estimators, n_repeats)
+    result = _cached(_permutations, key)
+    if result is not None:
+        return result.copy()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    model, _ = _forest(X_train, y_train, n_estimators, n_jobs)
+    # The trees predict one shuffle at a time inside each worker
+    model.set_params(n_jobs=1)
+    X_test = X_test.to_numpy()
+    y_test = y_test.to_numpy()
+    baseline = float((model.predict(X_test) == y_test).mean())
+
+    start = time.perf_counter()
+    jobs = [(column, repeat) for column in range(len(features)) for repeat in range(n_repeats)]
+    with perf.span('permutation_importance'):
+        scores = joblib.Parallel(n_jobs=n_jobs, backend='loky')(
+            joblib.delayed(_permuted_score)(model, X_test, y_test, column, repeat) for column, repeat in jobs
+        )
+    wall_seconds = time.perf_counter() - start
+
+    drops = baseline - np.asarray(scores).reshape(len(features), n_repeats)
+    result = pd.DataFrame({
+        'importance_mean': drops.mean(axis=1),
+        'importance_std': drops.std(axis=1),
+    }, index=pd.Index(features, name='feature')).sort_values('importance_mean', ascending=False)
+    result.attrs['baseline_accuracy'] = baseline
+    result.attrs['wall_seconds'] = wall_seconds
+    _store(_permutations, key, result)
+    return result.copy()
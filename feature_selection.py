@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.feature_selection import RFE
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+import perf
+from dataset import frame_key
+
+CV_FOLDS = 5
+# Below this many rows a subset cross-validates faster than joblib starts its
+# worker processes and ships them the data, so smaller catalogs score in-process
+PARALLEL_ROWS = 10_000
+# Least recently used entries are dropped beyond these. One elimination over
+# n features scores about n * n / 2 subsets.
+MAX_SCORES = 4096
+MAX_RANKINGS = 32
+
+# Cross-validated scores of every feature subset tried, and the final
+# rankings, keyed by the version of the data; shared by every session so a
+# new elimination (another target size, another starting set) reuses the
+# subsets earlier ones already scored
+_lock = threading.Lock()
+_scores = OrderedDict()
+_rankings = OrderedDict()
+
+
+def _cached(cache, key):
+    with _lock:
+        result = cache.get(key)
+        if result is not None:
+            cache.move_to_end(key)
+        return result
+
+
+def _store(cache, key, result, limit):
+    with _lock:
+        cache[key] = result
+        cache.move_to_end(key)
+        while len(cache) > limit:
+            cache.popitem(last=False)
+
+
+def _pipeline():
+    return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000))
+
+
+def _subset_score(X, y, columns, folds):
+    # Mean cross-validated accuracy of the scaled model on `columns` of X,
+    # computed in a joblib worker or in-process
+    cv = StratifiedKFold(n_splits=folds, shuffle=True, random_state=0)
+    return float(cross_val_score(_pipeline(), X[:, list(columns)], y, cv=cv).mean())
+
+
+def _score_subsets(X, y, subsets, names, key, folds, n_jobs):
+    # Scores of `subsets` (tuples of column positions of X). Scores are
+    # memoised under the sorted column names, so they carry over to
+    # eliminations started from another feature list; the subsets not scored
+    # before are cross-validated in parallel, one worker job per subset, once
+    # X has PARALLEL_ROWS rows.
+    named = [tuple(sorted(names[list(subset)])) for subset in subsets]
+    scores = [_cached(_scores, (key, subset)) for subset in named]
+    missing = [i for i, score in enumerate(scores) if score is None]
+    if missing:
+        if len(X) < PARALLEL_ROWS:
+            n_jobs = 1
+        computed = joblib.Parallel(n_jobs=n_jobs, backend='loky')(
+            joblib.delayed(_subset_score)(X, y, subsets[i], folds) for i in missing
+        )
+        for i, score in zip(missing, computed):
+            scores[i] = score
+            _store(_scores, (key, named[i]), score, MAX_SCORES)
+    return scores
+
+
+@perf.timed('feature_elimination')
+def cv_feature_elimination(frame, features, target, n_features_to_select=5, data_key=None, folds=CV_FOLDS, n_jobs=-1):
+    # Backward elimination on cross-validated accuracy of a standardised
+    # logistic regression: at each step every subset with one feature left
+    # out is scored in parallel and the feature whose removal hurts least is
+    # dropped, until `n_features_to_select` remain. Rankings follow
+    # sklearn's RFE: the selected features are 1, the last one dropped 2, and
+    # so on. Returns a DataFrame with 'Feature', 'Ranking' and 'CV Accuracy'
+    # (the score of the subset left after the feature was dropped, or of the
+    # selected subset); attrs['wall_seconds'] holds the time the elimination
+    # took and attrs['cached'] whether this call reused an earlier one.
+    features = list(features)
+    rows = frame[features + [target]].dropna()
+    data_key = frame_key(rows, data_key)
+    key = (target, data_key, folds)
+    result_key = (tuple(features), n_features_to_select) + key
+    result = _cached(_rankings, result_key)
+    if result is not None:
+        result = result.copy()
+        result.attrs['cached'] = True
+        return result
+
+    start = time.perf_counter()
+    X = rows[features].to_numpy(dtype=np.float64)
+    y = LabelEncoder().fit_transform(rows[target])
+    names = np.array(features)
+    remaining = tuple(range(len(features)))
+    dropped = []
+    while len(remaining) > max(n_features_to_select, 1):
+        candidates = [tuple(c for c in remaining if c != column) for column in remaining]
+        scores = _score_subsets(X, y, candidates, names, key, folds, n_jobs)
+        best = int(np.argmax(scores))
+        dropped.append((remaining[best], scores[best]))
+        remaining = candidates[best]
+    selected_score = _score_subsets(X, y, [remaining], names, key, folds, n_jobs)[0]
+
+    ranking = {features[column]: (1, selected_score) for column in remaining}
+    for rank, (column, score) in enumerate(reversed(dropped), start=2):
+        ranking[features[column]] = (rank, score)
+    result = pd.DataFrame({
+        'Feature': features,
+        'Ranking': [ranking[feature][0] for feature in features],
+        'CV Accuracy': [ranking[feature][1] for feature in features],
+    }).sort_values(by='Ranking')
+    result.attrs['wall_seconds'] = time.perf_counter() - start
+    result.attrs['cached'] = False
+    _store(_rankings, result_key, result, MAX_RANKINGS)
+    return result.copy()
+
+
+def legacy_rfe(frame, features, target, n_features_to_select=5):
+    # sklearn's RFE around an unscaled LogisticRegression on the full frame,
+    # as Advanced Insights ran it before; kept to compare against
+    start = time.perf_counter()
+    X = frame[list(features)]
+    y = LabelEncoder().fit_transform(frame[target])
+    fit = RFE(LogisticRegression(), n_features_to_select=n_features_to_select).fit(X, y)
+    result = pd.DataFrame({'Feature': X.columns, 'Ranking': fit.ranking_}).sort_values(by='Ranking')
+    result.attrs['wall_seconds'] = time.perf_counter() - start
+    return result
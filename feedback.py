@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 
-def main():
+def render():
     # Set the page layout and background color
    
     # Background color styling
@@ -109,4 +109,4 @@ def main():
     )
 
 if __name__ == "__main__":
-    main()
+    render()
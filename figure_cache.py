@@ -0,0 +1,120 @@
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+import streamlit as st
+
+import perf
+import plotting
+from dataset import fingerprint
+
+# Upper bound on the rendered figures kept in memory, shared by all sessions
+MAX_BYTES = 256 * 2**20
+
+
+class FigureCache:
+    # Rendered charts (PNG bytes or plotly JSON) in least-recently-used order,
+    # evicting the oldest entries once their total size exceeds `max_bytes`
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key, payload):
+        with self._lock:
+            if key in self._entries:
+                self.size -= len(self._entries.pop(key))
+            if len(payload) > self.max_bytes:
+                return
+            self._entries[key] = payload
+            self.size += len(payload)
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= len(evicted)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'figures': len(self._entries),
+                'megabytes': self.size / 2**20,
+            }
+
+
+_cache = FigureCache()
+
+
+def _key(kind, chart_id, params, data_key):
+    # Charts are identified by the dataset version they were drawn from, the
+    # chart and every parameter that changes what it shows
+    if data_key is None:
+        data_key = fingerprint()
+    raw = json.dumps([kind, chart_id, params, data_key], default=str, sort_keys=True)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def pyplot(chart_id, params, build, data_key=None):
+    # Like st.pyplot(build()), but the PNG is rendered once per dataset version
+    # and parameter set; `build` only runs on a cache miss. It may return a
+    # matplotlib Figure or a seaborn grid.
+    key = _key('pyplot', chart_id, params, data_key)
+    png = _cache.get(key)
+    if png is None:
+        # Figures open before the build, so a builder that raises (a seaborn
+        # grid can open its figure before failing) leaves nothing behind
+        before = plotting.figure_numbers()
+        figure = None
+        try:
+            with perf.span('figure_render'):
+                figure = plotting.as_figure(build())
+                image = io.BytesIO()
+                # Same options st.pyplot renders with
+                figure.savefig(image, format='png', bbox_inches='tight', dpi=200)
+        except Exception:
+            plotting.close_since(before)
+            raise
+        finally:
+            if figure is not None:
+                plotting.close(figure)
+        png = image.getvalue()
+        _cache.put(key, png)
+    with perf.span('pyplot_transfer'):
+        st.image(png, use_column_width=True)
+
+
+def plotly_chart(chart_id, params, build, data_key=None, **kwargs):
+    # Like st.plotly_chart(build()), keeping the figure's JSON so a hit skips
+    # building (and re-aggregating the data for) the chart
+    key = _key('plotly', chart_id, params, data_key)
+    payload = _cache.get(key)
+    if payload is None:
+        with perf.span('figure_render'):
+            payload = build().to_json().encode()
+        _cache.put(key, payload)
+    with perf.span('plotly_transfer'):
+        st.plotly_chart(pio.from_json(payload.decode()), **kwargs)
+
+
+def cache_stats():
+    return _cache.stats()
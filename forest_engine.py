@@ -0,0 +1,186 @@
+import weakref
+
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.utils.fixes import parse_version
+
+# Before 1.4 tree_.value held weighted counts and predict_proba normalized them
+# per row; since then it holds fractions that are returned untouched. Mirror the
+# installed version so probabilities stay bit-identical.
+_NORMALIZE_LEAF_VALUES = parse_version(sklearn.__version__) < parse_version("1.4")
+
+# Rows traversed per block; small blocks keep the (trees x rows) index arrays
+# in cache, which matters more than amortizing the per-level NumPy overhead
+BLOCK_SIZE = 512
+
+
+class FlatForest:
+    # A fitted RandomForestClassifier (or any single-output forest of
+    # DecisionTreeClassifiers) compiled into contiguous node arrays. All trees
+    # share one node index space, so a block of rows walks every tree at once
+    # with a handful of NumPy gathers per level instead of 200 Python calls.
+
+    def __init__(self, forest):
+        if getattr(forest, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled.")
+
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        counts = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        n_nodes = int(counts.sum())
+
+        left = np.concatenate([tree.children_left + offset for tree, offset in zip(trees, offsets)])
+        right = np.concatenate([tree.children_right + offset for tree, offset in zip(trees, offsets)])
+        is_leaf = np.concatenate([tree.children_left == -1 for tree in trees])
+
+        # Leaves point back at themselves so every row can take the same
+        # number of steps regardless of which tree or leaf it lands in.
+        # Children are interleaved so one gather at 2 * node + go_right
+        # picks the next node.
+        own = np.arange(n_nodes)
+        self.children = np.ascontiguousarray(np.stack([
+            np.where(is_leaf, own, left),
+            np.where(is_leaf, own, right),
+        ], axis=1).ravel(), dtype=np.intp)
+        self.feature = np.ascontiguousarray(
+            np.where(is_leaf, 0, np.concatenate([tree.feature for tree in trees])), dtype=np.intp)
+        self.threshold = np.ascontiguousarray(np.concatenate([tree.threshold for tree in trees]))
+        self.missing_go_to_left = np.concatenate([
+            np.asarray(getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count)), dtype=bool)
+            for tree in trees
+        ])
+
+        n_classes = int(forest.n_classes_)
+        value = np.concatenate([tree.value[:, 0, :n_classes] for tree in trees])
+        if _NORMALIZE_LEAF_VALUES:
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            value = value / normalizer
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+
+        self.roots = offsets.astype(np.intp)
+        self.is_leaf = is_leaf
+        self.max_depth = max(tree.max_depth for tree in trees)
+        self.classes_ = forest.classes_
+        self.n_features_in_ = forest.n_features_in_
+        self.feature_names_in_ = getattr(forest, 'feature_names_in_', None)
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _as_matrix(self, X):
+        if isinstance(X, pd.DataFrame) and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        # sklearn validates prediction input to float32 before comparing it
+        # against the float64 thresholds; do the same so ties split identically
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[1]} features, but the forest expects {self.n_features_in_}.")
+        return X
+
+    def _blocks(self, X):
+        X = self._as_matrix(X)
+        for start in range(0, X.shape[0], BLOCK_SIZE):
+            yield start, X[start:start + BLOCK_SIZE]
+
+    def _traverse(self, X):
+        # Walks every tree for a block of rows; returns a (trees x rows) array
+        # of leaf indices. X is gathered feature-major so each level is three
+        # flat `take`s over contiguous memory.
+        n_rows = X.shape[0]
+        columns = np.ascontiguousarray(X.T).ravel()
+        row = np.arange(n_rows)
+        node = np.repeat(self.roots[:, np.newaxis], n_rows, axis=1)
+        has_missing = np.isnan(X).any()
+        for _ in range(self.max_depth):
+            x = columns.take(self.feature.take(node) * n_rows + row)
+            go_left = x <= self.threshold.take(node)
+            if has_missing:
+                go_left |= np.isnan(x) & self.missing_go_to_left.take(node)
+            node = self.children.take(2 * node + ~go_left)
+        return node
+
+    def apply(self, X):
+        # Leaf index (in the shared node space) reached by every row in every tree
+        return np.concatenate([self._traverse(block).T for _, block in self._blocks(X)])
+
+    def predict_proba(self, X):
+        X = self._as_matrix(X)
+        proba = np.zeros((X.shape[0], self.value.shape[1]), dtype=np.float64)
+        for start, block in self._blocks(X):
+            leaves = self._traverse(block)
+            out = proba[start:start + BLOCK_SIZE]
+            # Accumulate tree by tree in estimator order, exactly like sklearn
+            # does, so the floating point sums match bit for bit
+            for t in range(self.n_trees):
+                out += self.value.take(leaves[t], axis=0)
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def _path_contributions(self):
+        # (nodes x features x classes) table of how much each feature moved
+        # the class fractions on the way from the tree's root to each node:
+        # every split adds value[child] - value[node] to its feature. Built
+        # level by level on first use; predictions never need it.
+        table = getattr(self, '_contribution_table', None)
+        if table is not None:
+            return table
+        table = np.zeros((len(self.feature), self.n_features_in_, self.value.shape[1]))
+        nodes = self.roots
+        while len(nodes):
+            nodes = nodes[~self.is_leaf[nodes]]
+            children = []
+            for side in (0, 1):
+                child = self.children.take(2 * nodes + side)
+                table[child] = table[nodes]
+                table[child, self.feature.take(nodes)] += self.value[child] - self.value[nodes]
+                children.append(child)
+            nodes = np.concatenate(children)
+        self._contribution_table = table
+        return table
+
+    def contributions(self, X):
+        # Path-based (Saabas) attribution of every row's class probabilities.
+        # Returns (bias, contributions): bias is the forest's average root
+        # value, (n_classes,), and contributions is (rows x features x
+        # classes), so bias + contributions.sum(axis=1) equals predict_proba
+        # up to rounding. Each row costs one traversal plus one table lookup
+        # per tree.
+        table = self._path_contributions()
+        X = self._as_matrix(X)
+        result = np.zeros((X.shape[0],) + table.shape[1:], dtype=np.float64)
+        for start, block in self._blocks(X):
+            leaves = self._traverse(block)
+            out = result[start:start + BLOCK_SIZE]
+            for t in range(self.n_trees):
+                out += table.take(leaves[t], axis=0)
+        result /= self.n_trees
+        return self.value[self.roots].mean(axis=0), result
+
+
+_compiled = weakref.WeakKeyDictionary()
+
+
+def compile_forest(forest):
+    # Compiled engines are cached per model object and dropped with it, so a
+    # reloaded model (see model_cache) is compiled again automatically
+    engine = _compiled.get(forest)
+    if engine is None:
+        engine = FlatForest(forest)
+        _compiled[forest] = engine
+    return engine
+
+
+def feature_contributions(model, X):
+    # FlatForest.contributions for either engine; an sklearn forest is
+    # explained through its (cached) compilation
+    if not isinstance(model, FlatForest):
+        model = compile_forest(model)
+    return model.contributions(X)
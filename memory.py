@@ -0,0 +1,198 @@
+import threading
+import tracemalloc
+
+import plotting
+
+# Allocation sites kept per rerun and per session
+TOP_SITES = 10
+# Frames kept per traced allocation; one is enough to attribute growth to a line
+TRACE_FRAMES = 1
+
+_SESSION_KEY = 'memory_session'
+_LAST_RERUN_KEY = 'memory_last_rerun'
+
+# Growth per page across every session, while tracking is on. Tracing covers
+# the whole process, so it runs while at least one session has tracking on:
+# _sessions holds the ids of those sessions. Ids of sessions the runtime no
+# longer has are dropped on every start, stop and rerun, so a closed tab
+# releases tracing too.
+_lock = threading.Lock()
+_pages = {}
+_sessions = set()
+_local = threading.local()
+
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def enabled():
+    return tracemalloc.is_tracing()
+
+
+def _prune():
+    # Called under _lock. Without a runtime (e.g. bare mode) nothing can be
+    # told apart, so every id is kept.
+    from streamlit.runtime import Runtime
+
+    if not Runtime.exists():
+        return
+    runtime = Runtime.instance()
+    _sessions.difference_update(
+        [session for session in _sessions if session is not None and not runtime.is_active_session(session)]
+    )
+
+
+def _release():
+    # Called under _lock
+    _prune()
+    if not _sessions and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def start(session):
+    # Tracing slows every allocation down, so it is off until a session asks
+    # for it. Idempotent per session.
+    with _lock:
+        _prune()
+        _sessions.add(session)
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+            _pages.clear()
+
+
+def stop(session):
+    # Tracing stops once the last session tracking memory lets go of it
+    with _lock:
+        _sessions.discard(session)
+        _release()
+
+
+def _session_id():
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else None
+
+
+def _toggle():
+    import streamlit as st
+
+    if st.session_state['memory_panel']:
+        start(_session_id())
+    else:
+        stop(_session_id())
+
+
+def _snapshot():
+    return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+
+def begin_rerun():
+    # The snapshot only lives until end_rerun, in this thread
+    if enabled():
+        with _lock:
+            _release()
+    _local.figures = plotting.open_figures()
+    _local.snapshot = _snapshot() if enabled() else None
+    _local.start = tracemalloc.get_traced_memory()[0] if enabled() else None
+
+
+def end_rerun(page):
+    # Closes the rerun begun by begin_rerun: how much traced memory it left
+    # allocated, where, and how many figures it left open, added to the
+    # session's and the page's totals. Returns the rerun's report, or None
+    # when tracking is off.
+    import streamlit as st
+
+    start, baseline = getattr(_local, 'start', None), getattr(_local, 'snapshot', None)
+    _local.start = _local.snapshot = None
+    if start is None or not enabled():
+        st.session_state.pop(_SESSION_KEY, None)
+        return None
+
+    current = tracemalloc.get_traced_memory()[0]
+    sites = [
+        (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+        for stat in _snapshot().compare_to(baseline, 'lineno')[:TOP_SITES]
+    ]
+    del baseline
+    report = {
+        'page': page,
+        'growth_bytes': current - start,
+        'traced_bytes': current,
+        'open_figures': plotting.open_figures(),
+        'figure_growth': plotting.open_figures() - _local.figures,
+        'top_sites': [site for site in sites if site[1] > 0],
+    }
+    with _lock:
+        reruns, growth = _pages.get(page, (0, 0))
+        _pages[page] = (reruns + 1, growth + report['growth_bytes'])
+
+    # The session keeps running totals of the sites its reruns grew or shrank
+    # most, trimmed to the TOP_SITES largest. A site that only shows up in
+    # one rerun's top list is approximate, but nothing per session grows
+    # with the size of the process.
+    session = st.session_state.get(_SESSION_KEY)
+    if session is None:
+        session = st.session_state[_SESSION_KEY] = {'reruns': 0, 'start_bytes': current, 'sites': {}}
+    session['reruns'] += 1
+    session['growth_bytes'] = current - session['start_bytes']
+    totals = session['sites']
+    for site, size, count in sites:
+        total_size, total_count = totals.get(site, (0, 0))
+        totals[site] = (total_size + size, total_count + count)
+    session['sites'] = dict(sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:TOP_SITES])
+    st.session_state[_LAST_RERUN_KEY] = report
+    return report
+
+
+def _kb(size):
+    return f"{size / 1024:+,.0f} KB"
+
+
+def panel(report=None):
+    # Opt-in sidebar report of memory left behind by reruns
+    import streamlit as st
+
+    if not st.sidebar.checkbox("🧠 Track memory", key="memory_panel", on_change=_toggle):
+        return
+    # E.g. ticked before a server restart
+    start(_session_id())
+    report = st.session_state.get(_LAST_RERUN_KEY) if report is None else report
+    if report is None:
+        st.sidebar.caption("Memory tracking is on; it covers the reruns from now on.")
+        return
+
+    session = st.session_state.get(_SESSION_KEY, {'reruns': 0, 'growth_bytes': 0, 'sites': {}})
+    st.sidebar.caption(
+        f"Last rerun of {report['page']}: {_kb(report['growth_bytes'])} traced, "
+        f"{report['open_figures']} open figure(s) ({report['figure_growth']:+d}). "
+        f"This session: {_kb(session['growth_bytes'])} over {session['reruns']} rerun(s); "
+        f"{report['traced_bytes'] / 2**20:,.1f} MB traced in the process."
+    )
+    sites = [(site, size, count) for site, (size, count) in session['sites'].items() if size > 0]
+    if sites:
+        st.sidebar.dataframe(
+            {
+                'allocated at': [site for site, _, _ in sites],
+                'KB': [round(size / 1024, 1) for _, size, _ in sites],
+                'blocks': [count for _, _, count in sites],
+            },
+            hide_index=True,
+            use_container_width=True,
+        )
+    with _lock:
+        pages = dict(_pages)
+    st.sidebar.dataframe(
+        {
+            'page': list(pages),
+            'reruns': [reruns for reruns, _ in pages.values()],
+            'KB per rerun': [round(growth / reruns / 1024, 1) for reruns, growth in pages.values()],
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
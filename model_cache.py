@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+import joblib
+
+import perf
+
+MODEL_PATH = "RF alien signal.pkl"
+
+# Models trained by the app itself are persisted here, one file per model name
+# and dataset version, so they survive restarts
+TRAINED_DIR = ".model_cache"
+
+# Models are kept at module level: pages are re-run on every widget interaction,
+# but this module is imported once per server process, so every session and
+# every rerun shares the same deserialized object.
+_lock = threading.Lock()
+_models = {}
+_trained = {}
+_training = {}
+_name_locks = {}
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def metadata_path(path):
+    # The metadata train.py writes next to every artifact
+    return os.path.splitext(path)[0] + '.json'
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _check(model, path):
+    # The metadata of the artifact at `path`, or None if it has none, and
+    # every way the loaded model disagrees with it
+    meta_path = metadata_path(path)
+    if not os.path.exists(meta_path):
+        return None, []
+    with open(meta_path) as handle:
+        metadata = json.load(handle)
+    problems = []
+    if metadata.get('sha256') != file_digest(path):
+        problems.append("the model file does not match the checksum in its metadata")
+    if list(getattr(model, 'feature_names_in_', metadata['feature_order'])) != metadata['feature_order']:
+        problems.append("the model's feature order differs from its metadata")
+    if [str(label) for label in getattr(model, 'classes_', [])] != metadata['classes']:
+        problems.append("the model's class labels differ from its metadata")
+    return metadata, problems
+
+
+def load_model(path=MODEL_PATH):
+    # Deserializes `path` the first time it is asked for and again only when
+    # the file on disk changes. Raises FileNotFoundError like joblib.load.
+    # Artifacts written by train.py are checked against their metadata on
+    # load; model_info reports the metadata and any mismatch.
+    path = os.path.abspath(path)
+    signature = _signature(path)
+    entry = _models.get(path)
+    if entry is not None and entry['signature'] == signature:
+        return entry['model']
+
+    with _lock:
+        # Another thread may have loaded it while we were waiting
+        entry = _models.get(path)
+        if entry is None or entry['signature'] != signature:
+            start = time.perf_counter()
+            with perf.span('model_load'):
+                model = joblib.load(path)
+            metadata, problems = _check(model, path)
+            entry = {
+                'model': model,
+                'signature': signature,
+                'path': path,
+                'load_seconds': time.perf_counter() - start,
+                'loaded_at': time.time(),
+                'loads': entry['loads'] + 1 if entry else 1,
+                'metadata': metadata,
+                'problems': problems,
+            }
+            _models[path] = entry
+    return entry['model']
+
+
+def forget_model(path):
+    # Drops a cached model; the next load_model of `path` reads it again
+    with _lock:
+        _models.pop(os.path.abspath(path), None)
+
+
+def model_info(path=MODEL_PATH):
+    # Load statistics for a cached model, or None if it was never loaded
+    entry = _models.get(os.path.abspath(path))
+    if entry is None:
+        return None
+    return {key: value for key, value in entry.items() if key != 'model'}
+
+
+def _name_lock(name):
+    with _lock:
+        return _name_locks.setdefault(name, threading.Lock())
+
+
+def _trained_path(name, data_key, directory):
+    return os.path.join(directory, f"{name}-{data_key}.joblib")
+
+
+def _train_and_store(name, data_key, train, directory):
+    start = time.perf_counter()
+    with perf.span(f'fit:{name}'):
+        model = train()
+    entry = {
+        'model': model,
+        'name': name,
+        'data_key': data_key,
+        'train_seconds': time.perf_counter() - start,
+        'trained_at': time.time(),
+    }
+    os.makedirs(directory, exist_ok=True)
+    path = _trained_path(name, data_key, directory)
+    # Written under a temporary name and renamed, so a reader never sees half a file
+    joblib.dump(entry, path + '.tmp')
+    os.replace(path + '.tmp', path)
+    for file in os.listdir(directory):
+        if file.startswith(f"{name}-") and file.endswith('.joblib') and file != os.path.basename(path):
+            os.remove(os.path.join(directory, file))
+    return entry
+
+
+def _stored_model(name, directory):
+    # Whatever version of the model was persisted last, if any
+    if not os.path.isdir(directory):
+        return None
+    for file in os.listdir(directory):
+        if file.startswith(f"{name}-") and file.endswith('.joblib'):
+            return joblib.load(os.path.join(directory, file))
+    return None
+
+
+def _train_in_background(name, data_key, train, directory):
+    def run():
+        try:
+            entry = _train_and_store(name, data_key, train, directory)
+            with _lock:
+                _trained[name] = entry
+        finally:
+            with _lock:
+                _training.pop(name, None)
+
+    with _lock:
+        if _training.get(name) == data_key:
+            return
+        _training[name] = data_key
+    threading.Thread(target=run, name=f"train-{name}", daemon=True).start()
+
+
+def trained_model(name, data_key, train, directory=TRAINED_DIR):
+    # A model the app trains itself (`train()` returns it) for the dataset
+    # version `data_key`, trained once and shared by every session. It is
+    # looked up in memory, then on disk, and only trained when neither has it.
+    # If a model for an older dataset version is around, that one is returned
+    # while the new one trains in a background thread. Returns the entry:
+    # 'model', 'data_key', 'train_seconds', 'trained_at' and 'stale' (True
+    # while an outdated model is being served).
+    entry = _trained.get(name)
+    if entry is not None and entry['data_key'] == data_key:
+        return dict(entry, stale=False)
+
+    # Disk loads and training only hold this name's lock, so they never stall
+    # load_model or the other trained models
+    with _name_lock(name):
+        entry = _trained.get(name)
+        if entry is None or entry['data_key'] != data_key:
+            path = _trained_path(name, data_key, directory)
+            if os.path.exists(path):
+                entry = joblib.load(path)
+            elif entry is None:
+                entry = _stored_model(name, directory)
+            if entry is not None:
+                with _lock:
+                    _trained[name] = entry
+        if entry is not None and entry['data_key'] == data_key:
+            return dict(entry, stale=False)
+
+        if entry is None:
+            # Nothing to serve meanwhile: train now, once for every waiting session
+            entry = _train_and_store(name, data_key, train, directory)
+            with _lock:
+                _trained[name] = entry
+            return dict(entry, stale=False)
+
+    _train_in_background(name, data_key, train, directory)
+    return dict(entry, stale=True)
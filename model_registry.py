@@ -0,0 +1,192 @@
+import argparse
+import json
+import os
+import threading
+import time
+
+from model_cache import MODEL_PATH, forget_model, load_model, metadata_path, model_info
+
+# train.py writes every artifact here as <prefix>-<version>.pkl with its
+# .json metadata; ACTIVE.json names the version being served and the one
+# before it
+REGISTRY_DIR = "models"
+ARTIFACT_PREFIX = "rf-alien-signal"
+POINTER_FILE = "ACTIVE.json"
+
+# The model being served, swapped for a new one when the pointer changes on
+# disk. Readers only ever take a reference to the current entry, so a swap
+# never waits for them and they never wait for a swap: the thread that
+# notices the change loads the new model while everyone else keeps getting
+# the old one.
+_swap_lock = threading.Lock()
+_served = {}
+
+
+def artifact_path(version, directory=REGISTRY_DIR):
+    return os.path.join(directory, f"{ARTIFACT_PREFIX}-{version}.pkl")
+
+
+def _pointer_path(directory):
+    return os.path.join(directory, POINTER_FILE)
+
+
+def read_pointer(directory=REGISTRY_DIR):
+    # {'active': version, 'previous': version or None, 'promoted_at': ...},
+    # or None before anything was promoted
+    try:
+        with open(_pointer_path(directory)) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def _write_pointer(pointer, directory):
+    # Written under a temporary name and renamed, so a reader never sees half a file
+    path = _pointer_path(directory)
+    with open(path + '.tmp', 'w') as handle:
+        json.dump(pointer, handle, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def list_versions(directory=REGISTRY_DIR):
+    # Metadata of every artifact in the registry, oldest first
+    if not os.path.isdir(directory):
+        return []
+    versions = []
+    for file in os.listdir(directory):
+        if file.startswith(f"{ARTIFACT_PREFIX}-") and file.endswith('.pkl'):
+            meta_path = metadata_path(os.path.join(directory, file))
+            if os.path.exists(meta_path):
+                with open(meta_path) as handle:
+                    versions.append(json.load(handle))
+    return sorted(versions, key=lambda metadata: metadata['created_at'])
+
+
+def _check_artifact(version, directory):
+    path = artifact_path(version, directory)
+    if not os.path.exists(path):
+        raise ValueError(f"No model version {version} in '{directory}'.")
+    # Loading it here also warms the cache, so the swap itself is instant
+    load_model(path)
+    problems = model_info(path)['problems']
+    if problems:
+        raise ValueError(f"Model version {version} failed its checks: {'; '.join(problems)}.")
+
+
+def promote(version, directory=REGISTRY_DIR):
+    # Makes `version` the served model; the one it replaces becomes the
+    # rollback target
+    _check_artifact(version, directory)
+    pointer = read_pointer(directory) or {}
+    previous = pointer.get('active')
+    if previous == version:
+        previous = pointer.get('previous')
+    pointer = {'active': version, 'previous': previous, 'promoted_at': time.time()}
+    _write_pointer(pointer, directory)
+    return pointer
+
+
+def rollback(directory=REGISTRY_DIR):
+    # Serves the previous version again; rolling back twice undoes the rollback
+    pointer = read_pointer(directory)
+    if pointer is None or not pointer.get('previous'):
+        raise ValueError("There is no previous model version to roll back to.")
+    _check_artifact(pointer['previous'], directory)
+    pointer = {'active': pointer['previous'], 'previous': pointer['active'], 'promoted_at': time.time()}
+    _write_pointer(pointer, directory)
+    return pointer
+
+
+def _signature(directory):
+    try:
+        stat = os.stat(_pointer_path(directory))
+    except FileNotFoundError:
+        return None
+    # The pointer is replaced, not rewritten, so a new inode means a new pointer
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def _load_served(directory, fallback, signature):
+    pointer = read_pointer(directory) if signature is not None else None
+    if pointer is None:
+        # Nothing promoted yet: serve the model the app always shipped with
+        path = fallback
+        model = load_model(path)
+        metadata = model_info(path)['metadata']
+        version = metadata['version'] if metadata else None
+        previous_path = None
+    else:
+        path = artifact_path(pointer['active'], directory)
+        model = load_model(path)
+        version = pointer['active']
+        previous_path = artifact_path(pointer['previous'], directory) if pointer.get('previous') else None
+        if previous_path is not None and os.path.exists(previous_path):
+            # Kept loaded so a rollback serves it straight away
+            load_model(previous_path)
+    return {
+        'model': model,
+        'path': path,
+        'version': version,
+        'previous': pointer.get('previous') if pointer else None,
+        'previous_path': previous_path,
+        'signature': signature,
+        'swapped_at': time.time(),
+    }
+
+
+def active_model(directory=REGISTRY_DIR, fallback=MODEL_PATH):
+    # The entry of the model to serve: 'model', 'path', 'version' (None for an
+    # artifact without metadata), 'previous' and 'swapped_at'. A promotion or
+    # rollback, from this process or any other, is picked up on the next call.
+    key = (os.path.abspath(directory), os.path.abspath(fallback))
+    signature = _signature(directory)
+    entry = _served.get(key)
+    if entry is not None and entry['signature'] == signature:
+        return entry
+
+    # Only one thread loads the new model; the others keep serving the old
+    # one until it is ready, unless there is nothing to serve yet
+    if not _swap_lock.acquire(blocking=entry is None):
+        return entry
+    try:
+        current = _served.get(key)
+        if current is not None and current['signature'] == signature:
+            return current
+        entry = _load_served(directory, fallback, signature)
+        _served[key] = entry
+        if current is not None:
+            # Only the served model and its rollback target stay loaded
+            keep = (entry['path'], entry['previous_path'])
+            for path in {current['path'], current['previous_path']} - set(keep) - {None}:
+                forget_model(path)
+    finally:
+        _swap_lock.release()
+    return entry
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the versioned alien signal models.")
+    parser.add_argument("--dir", default=REGISTRY_DIR, help="registry directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="show every version and which one is active")
+    promote_parser = commands.add_parser("promote", help="serve a version")
+    promote_parser.add_argument("version")
+    commands.add_parser("rollback", help="serve the previous version again")
+    args = parser.parse_args()
+
+    if args.command == "promote":
+        pointer = promote(args.version, args.dir)
+        print(f"active: {pointer['active']} (previous: {pointer['previous']})")
+    elif args.command == "rollback":
+        pointer = rollback(args.dir)
+        print(f"active: {pointer['active']} (previous: {pointer['previous']})")
+    else:
+        pointer = read_pointer(args.dir) or {}
+        for metadata in list_versions(args.dir):
+            marker = "*" if metadata['version'] == pointer.get('active') else "-" if metadata['version'] == pointer.get('previous') else " "
+            print(f"{marker} {metadata['version']}  test accuracy {metadata['metrics']['test_accuracy']:.3f}  "
+                  f"data {metadata['data_fingerprint'][:8]}")
+
+
+if __name__ == "__main__":
+    main()
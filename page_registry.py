@@ -0,0 +1,111 @@
+import argparse
+import importlib.util
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+
+import perf
+
+# Page modules are imported once per server process and kept here, so a rerun
+# only calls their render() function instead of re-executing imports, data
+# loading and definitions. A page is re-imported when its file changes.
+_lock = threading.Lock()
+_pages = {}
+
+
+def module_name(page_file):
+    # "Advanced Insights.py" -> "advanced_insights"
+    stem = os.path.splitext(os.path.basename(page_file))[0]
+    return re.sub(r'\W+', '_', stem).strip('_').lower()
+
+
+def load_page_module(page_file):
+    path = os.path.abspath(page_file)
+    mtime = os.stat(path).st_mtime_ns
+    entry = _pages.get(path)
+    if entry is not None and entry[0] == mtime:
+        return entry[1]
+
+    with _lock:
+        entry = _pages.get(path)
+        if entry is None or entry[0] != mtime:
+            name = module_name(page_file)
+            spec = importlib.util.spec_from_file_location(name, path)
+            module = importlib.util.module_from_spec(spec)
+            # Registered like a normal import so `import predict` elsewhere
+            # gets the same module object
+            sys.modules[name] = module
+            spec.loader.exec_module(module)
+            if not callable(getattr(module, 'render', None)):
+                raise AttributeError(f"Page '{page_file}' does not define render()")
+            entry = (mtime, module)
+            _pages[path] = entry
+    return entry[1]
+
+
+def render_page(page_file):
+    # Renders a page and returns how long the rerun took, in seconds
+    start = time.perf_counter()
+    with perf.span(f"page:{page_file}"):
+        load_page_module(page_file).render()
+    return time.perf_counter() - start
+
+
+def exec_page(page_file):
+    # The old app.load_page behaviour: read, compile and execute the whole
+    # page source on every rerun. Kept only to measure against render_page.
+    start = time.perf_counter()
+    with open(page_file) as f:
+        exec(compile(f.read(), page_file, 'exec'), {'__name__': '__main__'})
+    return time.perf_counter() - start
+
+
+_COMPARE_SCRIPT = """
+import page_registry
+page_registry.{loader}({page_file!r})
+"""
+
+
+def compare(pages, runs=5, timeout=120):
+    # Reruns every page headlessly with both loaders and returns the median
+    # rerun time of each in milliseconds
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+    for page_file in pages:
+        timings = {}
+        for loader in ('exec_page', 'render_page'):
+            at = AppTest.from_string(_COMPARE_SCRIPT.format(loader=loader, page_file=page_file),
+                                     default_timeout=timeout)
+            at.run()  # first run pays for imports and caches either way
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                at.run()
+                samples.append((time.perf_counter() - start) * 1000)
+            timings[loader] = statistics.median(samples)
+        results[page_file] = timings
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare page rerun latency of exec-based and cached page loading.")
+    parser.add_argument("pages", nargs="*", help="page files (default: every page in app.PAGES)")
+    parser.add_argument("--runs", type=int, default=5, help="reruns measured per page and loader")
+    args = parser.parse_args()
+
+    pages = args.pages
+    if not pages:
+        from app import PAGES
+        pages = list(PAGES.values())
+
+    print(f"{'page':<24}{'exec (ms)':>12}{'cached (ms)':>14}")
+    for page_file, timings in compare(pages, args.runs).items():
+        print(f"{page_file:<24}{timings['exec_page']:>12.1f}{timings['render_page']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
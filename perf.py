@@ -0,0 +1,176 @@
+import atexit
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the histogram buckets spans are counted in
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Cumulative histograms are written here in Prometheus text format, at most
+# once every EXPORT_INTERVAL seconds. Other entry points (the HTTP server,
+# the CLIs) write perf_metrics-<process>.prom instead, so they never
+# overwrite the app's file; every series carries a `process` label.
+METRICS_PATH = "perf_metrics.prom"
+EXPORT_INTERVAL = 5.0
+METRIC_NAME = "signal_app_span_seconds"
+
+_LAST_RERUN_KEY = 'perf_last_rerun'
+
+# Histograms are cumulative over the server process and shared by every
+# session. The spans of the rerun in progress are kept per thread: Streamlit
+# runs each session's script in its own thread, and spans recorded outside a
+# rerun (CLIs, background training) only go into the histograms. Streamlit is
+# only imported by the functions that need it, so the CLIs and the HTTP
+# server can record spans without it.
+_lock = threading.Lock()
+_histograms = {}
+_local = threading.local()
+_last_export = 0.0
+_process = "app"
+
+
+def record(name, seconds):
+    spans = getattr(_local, 'spans', None)
+    if spans is not None:
+        calls, total = spans.get(name, (0, 0.0))
+        spans[name] = (calls + 1, total + seconds)
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = {'buckets': [0] * len(BUCKETS), 'count': 0, 'sum': 0.0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                histogram['buckets'][i] += 1
+                break
+        histogram['count'] += 1
+        histogram['sum'] += seconds
+
+
+@contextmanager
+def span(name):
+    # Times the block under `name`. Spans may nest; each reports its own
+    # wall time, including that of the spans inside it.
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+
+
+def timed(name):
+    # Decorator form of span
+    def decorate(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_rerun():
+    _local.spans = {}
+    _local.start = time.perf_counter()
+
+
+def end_rerun():
+    # Closes the rerun begun by begin_rerun: records its total time, keeps its
+    # spans for the panel and exports the histograms if they are due. Returns
+    # {name: (calls, seconds)} for the rerun.
+    import streamlit as st
+
+    spans = getattr(_local, 'spans', None)
+    if spans is None:
+        return {}
+    _local.spans = None
+    record('rerun', time.perf_counter() - _local.start)
+    st.session_state[_LAST_RERUN_KEY] = spans
+    export_due()
+    return spans
+
+
+def export_due():
+    # Exports the histograms if the last export is EXPORT_INTERVAL old
+    global _last_export
+    if time.perf_counter() - _last_export < EXPORT_INTERVAL:
+        return
+    _last_export = time.perf_counter()
+    _export_quietly()
+
+
+def _export_quietly():
+    try:
+        export()
+    except OSError:
+        # Metrics must never break the app (e.g. a read-only deployment)
+        pass
+
+
+def export_at_exit(process):
+    # For entry points other than the app: label and file the histograms
+    # under `process`, and export them once more when the process exits
+    global _process
+    _process = process
+    atexit.register(_export_quietly)
+
+
+def metrics_path():
+    return METRICS_PATH if _process == "app" else f"perf_metrics-{_process}.prom"
+
+
+def panel(spans=None):
+    # Opt-in sidebar table of where the last rerun spent its time
+    import streamlit as st
+
+    if not st.sidebar.checkbox("⏱️ Show performance panel", key="perf_panel"):
+        return
+    spans = st.session_state.get(_LAST_RERUN_KEY, {}) if spans is None else spans
+    if not spans:
+        st.sidebar.caption("No spans recorded yet.")
+        return
+    rows = sorted(spans.items(), key=lambda item: item[1][1], reverse=True)
+    st.sidebar.dataframe(
+        {
+            'span': [name for name, _ in rows],
+            'calls': [calls for _, (calls, _) in rows],
+            'ms': [round(seconds * 1000, 1) for _, (_, seconds) in rows],
+        },
+        hide_index=True,
+        use_container_width=True,
+    )
+    st.sidebar.caption(f"Nested spans are included in their parents. Cumulative histograms: `{METRICS_PATH}`")
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    # Every histogram in the Prometheus text exposition format
+    with _lock:
+        histograms = {name: dict(h, buckets=list(h['buckets'])) for name, h in _histograms.items()}
+    lines = [
+        f"# HELP {METRIC_NAME} Wall time of instrumented spans of the signal classification app.",
+        f"# TYPE {METRIC_NAME} histogram",
+    ]
+    for name in sorted(histograms):
+        histogram = histograms[name]
+        labels = f'process="{_label(_process)}",span="{_label(name)}"'
+        cumulative = 0
+        for bound, count in zip(BUCKETS, histogram['buckets']):
+            cumulative += count
+            lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+        lines.append(f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {histogram["count"]}')
+        lines.append(f'{METRIC_NAME}_sum{{{labels}}} {histogram["sum"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{{labels}}} {histogram["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path=None):
+    # Written under a temporary name and renamed, so a scraper never reads half a file
+    path = path or metrics_path()
+    with open(path + '.tmp', 'w') as f:
+        f.write(prometheus_text())
+    os.replace(path + '.tmp', path)
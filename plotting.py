@@ -0,0 +1,84 @@
+import threading
+
+import matplotlib.pyplot as plt
+import streamlit as st
+from matplotlib.figure import Figure
+
+import perf
+
+# Figures opened through subplots() by the rerun running in this thread and
+# not sent yet. pyplot keeps every figure it creates alive until it is
+# closed, so one left behind per rerun adds up across reruns and sessions.
+_local = threading.local()
+
+
+def _open():
+    if not hasattr(_local, 'figures'):
+        _local.figures = []
+    return _local.figures
+
+
+def as_figure(chart):
+    # seaborn's pairplot/jointplot/FacetGrid return grids wrapping a Figure
+    if isinstance(chart, Figure):
+        return chart
+    return getattr(chart, 'figure', None) or chart.fig
+
+
+def subplots(*args, **kwargs):
+    # plt.subplots, with the figure remembered so it is released even if the
+    # page never gets to send it
+    fig, ax = plt.subplots(*args, **kwargs)
+    _open().append(fig)
+    return fig, ax
+
+
+def close(chart):
+    figure = as_figure(chart)
+    plt.close(figure)
+    figures = _open()
+    if figure in figures:
+        figures.remove(figure)
+
+
+def pyplot(chart, **kwargs):
+    # st.pyplot, timed as the figure's transfer to the browser (Streamlit
+    # renders it to PNG here), then closes the figure: once sent, the page
+    # holds the only reference it still needs, the PNG
+    try:
+        with perf.span('pyplot_transfer'):
+            st.pyplot(as_figure(chart), **kwargs)
+    finally:
+        close(chart)
+
+
+def close_unsent():
+    # Closes the figures this thread opened but never sent, e.g. because the
+    # page raised half way. Returns how many there were.
+    figures = _open()
+    count = len(figures)
+    for figure in figures:
+        plt.close(figure)
+    figures.clear()
+    return count
+
+
+def open_figures():
+    # Figures pyplot is holding on to, across every session
+    return len(plt.get_fignums())
+
+
+def figure_numbers():
+    return set(plt.get_fignums())
+
+
+def close_since(numbers):
+    # Closes every figure pyplot opened after figure_numbers() returned
+    # `numbers`, e.g. the grid a seaborn call built before raising. A figure
+    # another session opened meanwhile is only dropped from pyplot; drawing
+    # through its Figure object still works.
+    new = figure_numbers() - set(numbers)
+    for number in new:
+        plt.close(number)
+    figures = _open()
+    figures[:] = [figure for figure in figures if getattr(figure, 'number', None) not in new]
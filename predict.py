@@ -1,83 +1,134 @@
 import streamlit as st
 import pandas as pd
-import joblib
-import matplotlib.pyplot as plt
 import seaborn as sns
+import plotly.express as px
 import numpy as np  # Added for log scaling
+import os
+import tempfile
+import time
+from datetime import datetime
 
-# Add custom CSS for styling
-st.markdown("""
-    <style>
-    .title {
-        color: #1f77b4; /* Blue */
-    }
-    .sidebar .sidebar-content {
-        background-color: #f0f8ff; /* Light blue */
-        border-radius: 10px;
-        padding: 20px;
-    }
-    .stSubheader {
-        color: #ff7f0e; /* Orange */
-    }
-    .stWrite {
-        background-color: #e6f9ff; /* Light cyan */
-        padding: 10px;
-        border-radius: 5px;
-    }
-    .prediction-box {
-        border-radius: 10px;
-        padding: 15px;
-        color: #333;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
-    }
-    .safe {
-        background-color: #d4edda; /* Light green */
-    }
-    .alert {
-        background-color: #f8d7da; /* Light red */
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# Attempt to load the trained model
-try:
-    model = joblib.load("RF alien signal.pkl")
-except FileNotFoundError:
-    st.error("🚨 Model file 'RF alien signal.pkl' not found. Please check the file path.")
-    model = None
-except Exception as e:
-    st.error(f"⚠️ An error occurred while loading the model: {e}")
-    model = None
-
-def app():
-    if model is None:
+import perf
+import plotting
+from dataset import fingerprint
+from forest_engine import compile_forest, feature_contributions
+from model_cache import MODEL_PATH, model_info
+from model_registry import active_model
+from scoring import FEATURE_COLUMNS, WARNING_LABEL, score_csv
+from what_if import GRID_STEPS, decision_surface
+
+# Bulk scoring output, one file per session
+SCORED_DIR = "scored"
+_BULK_OUTPUT_KEY = 'bulk_output_path'
+_BULK_RESULT_KEY = 'bulk_result'
+
+# Sidebar slider of every model feature: (label, min, max, default)
+INPUTS = {
+    'brightpixel': ("🌟 Bright Pixel", 0.0, 1.0, 0.5),
+    'narrowband': ("📶 Narrowband", 0.0, 1.0, 0.5),
+    'narrowbanddrd': ("📈 Narrowband DRD", 0.0, 1.0, 0.5),
+    'noise': ("🔊 Noise", 0.0, 1.0, 0.5),
+    'Stars Type': ("🌌 Stars Type", 0, 20, 10),
+    'Signal Frequency(MHz)': ("📡 Signal Frequency (MHz)", 1000, 2000, 1400),
+    'Signal Duration(seconds)': ("⏳ Signal Duration (seconds)", 1, 20, 10),
+    'Signal Origin ': ("🌍 Signal Origin", 0, 5, 0),
+}
+
+def load_trained_model():
+    # The active version of the model registry (or the shipped model until
+    # one is promoted), deserialized once per server and swapped in place
+    # when another version is promoted or rolled back
+    try:
+        return active_model()
+    except FileNotFoundError as e:
+        st.error(f"🚨 Model file '{e.filename or MODEL_PATH}' not found. Please check the file path.")
+    except Exception as e:
+        st.error(f"⚠️ An error occurred while loading the model: {e}")
+    return None
+
+def check_model_metadata(served, info):
+    # Artifacts written by train.py carry their feature order, class labels
+    # and the catalog version they were trained on
+    metadata = info['metadata']
+    if metadata is None:
+        st.sidebar.caption(f"🏷️ '{served['path']}' has no training metadata; `python train.py --promote` writes a versioned model.")
+        return
+    for problem in info['problems']:
+        st.warning(f"⚠️ Model check failed: {problem}.")
+    if metadata['feature_order'] != FEATURE_COLUMNS:
+        st.warning(f"⚠️ The model expects features {metadata['feature_order']}, but the app sends {FEATURE_COLUMNS}.")
+    trained_on = "the current catalog" if metadata['data_fingerprint'] == fingerprint() else "an older catalog"
+    st.sidebar.caption(f"🏷️ Model version {metadata['version']}, trained on {trained_on} "
+                       f"(test accuracy {metadata['metrics']['test_accuracy']:.2f})")
+
+def render():
+    # Add custom CSS for styling
+    st.markdown("""
+        <style>
+        .title {
+            color: #1f77b4; /* Blue */
+        }
+        .sidebar .sidebar-content {
+            background-color: #f0f8ff; /* Light blue */
+            border-radius: 10px;
+            padding: 20px;
+        }
+        .stSubheader {
+            color: #ff7f0e; /* Orange */
+        }
+        .stWrite {
+            background-color: #e6f9ff; /* Light cyan */
+            padding: 10px;
+            border-radius: 5px;
+        }
+        .prediction-box {
+            border-radius: 10px;
+            padding: 15px;
+            color: #333;
+            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+        }
+        .safe {
+            background-color: #d4edda; /* Light green */
+        }
+        .alert {
+            background-color: #f8d7da; /* Light red */
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    served = load_trained_model()
+    if served is None:
         st.warning("⚠️ Model is not loaded. Please check the error messages above.")
         return
+    # This rerun keeps the model it started with even if a new one is promoted meanwhile
+    model = served['model']
+
+    info = model_info(served['path'])
+    loaded_at = datetime.fromtimestamp(info['loaded_at']).strftime('%H:%M:%S')
+    st.sidebar.caption(f"🧠 Model loaded in {info['load_seconds'] * 1000:.0f} ms at {loaded_at}")
+    if served['previous']:
+        st.sidebar.caption(f"↩️ Previous version {served['previous']} is kept loaded for rollback")
+    check_model_metadata(served, info)
 
-   
+    mode = st.sidebar.radio("🧭 Prediction Mode", ["Single signal", "What-if surface", "Bulk file"])
+    engine = st.sidebar.selectbox(
+        "⚙️ Inference Engine", ["scikit-learn", "Flattened arrays"],
+        help="'Flattened arrays' evaluates the same forest from contiguous NumPy node arrays. "
+             "It gives identical results with much lower single-row latency."
+    )
+    predictor = compile_forest(model) if engine == "Flattened arrays" else model
+
+    if mode == "Bulk file":
+        bulk_scoring(predictor)
+        return
 
     # Sidebar for user input
     st.sidebar.header('🛠️ User Input Parameters')
-    
-    brightpixel = st.sidebar.slider("🌟 Bright Pixel", 0.0, 1.0, 0.5)
-    narrowband = st.sidebar.slider("📶 Narrowband", 0.0, 1.0, 0.5)
-    narrowbanddrd = st.sidebar.slider("📈 Narrowband DRD", 0.0, 1.0, 0.5)
-    noise = st.sidebar.slider("🔊 Noise", 0.0, 1.0, 0.5)
-    stars_type = st.sidebar.slider("🌌 Stars Type", 0, 20, 10)
-    signal_frequency = st.sidebar.slider("📡 Signal Frequency (MHz)", 1000, 2000, 1400)
-    signal_duration = st.sidebar.slider("⏳ Signal Duration (seconds)", 1, 20, 10)
-    signal_origin = st.sidebar.slider("🌍 Signal Origin", 0, 5, 0)
-
-    data = {
-        'brightpixel': brightpixel,
-        'narrowband': narrowband,
-        'narrowbanddrd': narrowbanddrd,
-        'noise': noise,
-        'Stars Type': stars_type,
-        'Signal Frequency(MHz)': signal_frequency,
-        'Signal Duration(seconds)': signal_duration,
-        'Signal Origin ': signal_origin
-    }
+    data = {column: st.sidebar.slider(label, low, high, default) for column, (label, low, high, default) in INPUTS.items()}
+
+    if mode == "What-if surface":
+        what_if_surface(predictor, data)
+        return
 
     features = pd.DataFrame(data, index=[0])
 
@@ -88,20 +139,25 @@ def app():
     if st.button('🔍 Make Prediction'):
         if model is not None:
             # Make prediction
-            prediction = model.predict(features)
+            start = time.perf_counter()
+            with perf.span('predict'):
+                prediction = predictor.predict(features)
+            latency_ms = (time.perf_counter() - start) * 1000
 
             # Display the prediction result
             st.subheader('🔮 Prediction Result')
             prediction_message = "📡 It's a safe signal from natural sources." if prediction[0] == 'Safe : signal from natural sources' else "🛸 Warning: potential alien signal detected!"
             prediction_class = 'safe' if prediction[0] == 'Safe : signal from natural sources' else 'alert'
             st.markdown(f"<div class='prediction-box {prediction_class}'>{prediction_message}</div>", unsafe_allow_html=True)
+            st.caption(f"⏱️ Predicted in {latency_ms:.2f} ms with the {engine} engine")
+            explain_prediction(predictor, features)
             
             # Add feedback section
 
 # Plot input values
  # Plot input values
             st.subheader('📊 Input Value Visualization')
-            fig, ax = plt.subplots()
+            fig, ax = plotting.subplots()
 
             # Log scale for Signal Frequency (MHz)
             data['Signal Frequency(MHz)'] = np.log10(data['Signal Frequency(MHz)'])
@@ -109,8 +165,121 @@ def app():
             sns.barplot(x=list(data.keys()), y=list(data.values()), ax=ax, palette="viridis")
             ax.set_xticklabels(ax.get_xticklabels(), rotation=45, ha='right')
             ax.set_ylabel("Feature Value (Log scale for Frequency)")
-            st.pyplot(fig)
+            plotting.pyplot(fig)
+
+def explain_prediction(predictor, features):
+    # How each feature moved P(Warning) away from the forest's base rate,
+    # along the paths this signal took through the trees
+    start = time.perf_counter()
+    with perf.span('explain'):
+        bias, shares = feature_contributions(predictor, features)
+    latency_ms = (time.perf_counter() - start) * 1000
+    warning = list(predictor.classes_).index(WARNING_LABEL)
+    explanation = pd.DataFrame({
+        'Feature': [column.strip() for column in FEATURE_COLUMNS],
+        'Contribution': shares[0, :, warning],
+    }).sort_values('Contribution', key=abs)
+    explanation['Effect'] = np.where(explanation['Contribution'] > 0, 'Towards Warning', 'Towards Safe')
+
+    st.subheader('🧩 Why this prediction?')
+    fig = px.bar(explanation, x='Contribution', y='Feature', orientation='h', color='Effect',
+                 color_discrete_map={'Towards Warning': '#d62728', 'Towards Safe': '#1f77b4'},
+                 labels={'Contribution': 'Contribution to P(Warning)'})
+    st.plotly_chart(fig, use_container_width=True)
+    probability = bias[warning] + shares[0, :, warning].sum()
+    st.caption(f"Base rate P(Warning) = {bias[warning]:.3f}; the contributions add up to "
+               f"P(Warning) = {probability:.3f}. Explained in {latency_ms:.2f} ms.")
+
+def what_if_surface(predictor, data):
+    st.subheader('🗺️ What-if Decision Surface')
+    st.write("Sweep two features across their slider ranges while the others stay at the sidebar values, "
+             "and see where the classification flips.")
+
+    col1, col2, col3 = st.columns(3)
+    columns = list(INPUTS)
+    x_feature = col1.selectbox("X axis", columns, index=columns.index('Signal Frequency(MHz)'))
+    y_options = [column for column in columns if column != x_feature]
+    y_feature = col2.selectbox("Y axis", y_options, index=y_options.index('narrowband') if 'narrowband' in y_options else 0)
+    steps = col3.slider("Grid points per axis", 20, 400, GRID_STEPS, step=20)
+
+    x_values = np.linspace(INPUTS[x_feature][1], INPUTS[x_feature][2], steps)
+    y_values = np.linspace(INPUTS[y_feature][1], INPUTS[y_feature][2], steps)
+    surface = decision_surface(predictor, data, x_feature, y_feature, x_values, y_values)
+    proba = surface['proba'][:, :, surface['classes'].index(WARNING_LABEL)]
+
+    fig = px.imshow(proba, x=x_values, y=y_values, origin='lower', aspect='auto', zmin=0.0, zmax=1.0,
+                    color_continuous_scale='RdBu_r',
+                    labels={'x': x_feature.strip(), 'y': y_feature.strip(), 'color': 'P(Warning)'})
+    # The sidebar setting the surface is drawn around
+    fig.add_scatter(x=[data[x_feature]], y=[data[y_feature]], mode='markers', name='Current input',
+                    marker=dict(color='black', size=12, symbol='x'))
+    fig.update_layout(legend=dict(orientation='h', y=-0.2))
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"⏱️ {steps * steps:,} grid points evaluated in {surface['seconds'] * 1000:.1f} ms; "
+               f"only {surface['scored']:,} distinct model inputs had to be scored, in one batch.")
+
+def session_output_path():
+    # Every session scores into its own temporary file under SCORED_DIR, reused
+    # by its later runs; visitors never choose a path on the server
+    path = st.session_state.get(_BULK_OUTPUT_KEY)
+    if path is None:
+        os.makedirs(SCORED_DIR, exist_ok=True)
+        handle, path = tempfile.mkstemp(prefix="scored-", suffix=".csv", dir=SCORED_DIR)
+        os.close(handle)
+        st.session_state[_BULK_OUTPUT_KEY] = path
+    return path
+
+def bulk_scoring(predictor):
+    st.subheader('📂 Bulk File Scoring')
+    st.write("Score a CSV of detections in chunks. The labelled rows are written straight to disk, "
+             "so files with millions of signals never have to fit in memory.")
+
+    uploaded_file = st.file_uploader("Upload a CSV of signals", type=["csv"])
+    chunksize = st.number_input("Rows per chunk", min_value=1_000, max_value=1_000_000, value=100_000, step=10_000)
+    contributions = st.checkbox("Add feature contributions",
+                                help="One column per feature with its contribution to P(Warning) for that row.")
+
+    if st.button('🚀 Score File'):
+        if uploaded_file is None:
+            st.error("Please upload a CSV file first.")
+            return
+
+        progress_bar = st.progress(0.0)
+        status = st.empty()
+
+        def report(rows, fraction):
+            if fraction is not None:
+                progress_bar.progress(fraction)
+            status.write(f"Scored **{rows:,}** rows...")
+
+        try:
+            result = score_csv(uploaded_file, session_output_path(), predictor, chunksize=int(chunksize),
+                               progress=report, contributions=contributions)
+        except Exception as e:
+            st.error(f"⚠️ An error occurred while scoring the file: {e}")
+            return
+
+        progress_bar.progress(1.0)
+        status.empty()
+        result['name'] = uploaded_file.name
+        st.session_state[_BULK_RESULT_KEY] = result
+
+    # Kept across reruns, so the download button survives its own click
+    result = st.session_state.get(_BULK_RESULT_KEY)
+    if result is None or not os.path.exists(result['output']):
+        return
+    st.success(f"✅ Scored {result['rows']:,} rows of '{result['name']}'.")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Rows", f"{result['rows']:,}")
+    col2.metric("Throughput", f"{result['rows_per_second']:,.0f} rows/s")
+    col3.metric("Peak RSS (this run)", f"{result['peak_memory_mb']:.1f} MB",
+                help="Sampled after every chunk is scored, while it is still in memory")
+
+    st.write("Preview of the scored output:")
+    st.dataframe(pd.read_csv(result['output'], nrows=20))
+    with open(result['output'], 'rb') as f:
+        st.download_button("⬇️ Download scored CSV", f, file_name=f"scored_{result['name']}", mime="text/csv")
 
-# Ensure the function `app()` is called when this file is executed
+# Ensure the function `render()` is called when this file is executed
 if __name__ == "__main__":
-    app()
+    render()
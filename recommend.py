@@ -3,223 +3,283 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
-from sklearn.preprocessing import LabelEncoder
 from sklearn.ensemble import RandomForestClassifier
 
-# Load the dataset
-data_path = 'narrowband signals.csv'
-data = pd.read_csv(data_path)
-
-# Custom CSS for a professional and colorful look
-st.markdown("""
-    <style>
-    .main-title {
-        text-align: center;
-        font-size: 36px;
-        color: #FF6347; /* Tomato */
-        font-weight: bold;
-        margin-bottom: 20px;
-    }
-    .sidebar-header {
-        font-size: 20px;
-        color: #4682B4; /* Steel Blue */
-        font-weight: bold;
-        margin-bottom: 10px;
-    }
-    .custom-box {
-        background-color: #282c34; /* Dark Gray */
-        padding: 20px;
-        border-radius: 10px;
-        margin-bottom: 20px;
-        color: #61dafb; /* Light Blue */
-    }
-    .footer {
-        text-align: center;
-        color: #FF6347; /* Tomato */
-        font-weight: bold;
-        margin-top: 50px;
-    }
-    .chart-title {
-        color: #4169E1; /* Royal Blue */
-        font-size: 24px;
-        margin-bottom: 10px;
-    }
-    .recommendation-title {
-        color: #FF1493; /* Deep Pink */
-        font-size: 24px;
-        margin-bottom: 10px;
-    }
-    .data-summary {
-        font-size: 18px;
-        color: #4682B4; /* Steel Blue */
-    }
-    .feedback-form {
-        background-color: #f0f0f0;
-        padding: 20px;
-        border-radius: 10px;
-        margin-bottom: 20px;
-    }
-    .real-time {
-        background-color: #f5f5f5;
-        padding: 10px;
-        border-radius: 10px;
-        margin-bottom: 20px;
-    }
-    .stButton>button {
-        background-color: #00bfff; /* Deep Sky Blue */
-        color: #ffffff;
-        border: none;
-        border-radius: 5px;
-        padding: 10px 20px;
-        cursor: pointer;
-    }
-    .stButton>button:hover {
-        background-color: #87ceeb; /* Sky Blue */
-    }
-    </style>
-""", unsafe_allow_html=True)
-
-# Main Title with custom CSS
-st.markdown("<h1 class='main-title'>✨ Recommend Signals 🌌</h1>", unsafe_allow_html=True)
-
-# Sidebar filtering with advanced options
-st.sidebar.markdown("<h2 class='sidebar-header'>🔍 Filter Options</h2>", unsafe_allow_html=True)
-
-# Select multiple signal types
-signal_types = st.sidebar.multiselect(
-    "🎯 Select Signal Types", options=["Safe", "Warning", "All"], default=["Safe", "Warning"]
-)
-
-# Slider for frequency range with tooltip
-min_frequency, max_frequency = st.sidebar.slider(
-    "📡 Select Frequency Range (MHz)", 
-    int(data["Signal Frequency(MHz)"].min()), 
-    int(data["Signal Frequency(MHz)"].max()), 
-    (1300, 1550), 
-    help="Adjust the slider to filter signals based on frequency range."
-)
-
-# Duration with expander for advanced info
-with st.sidebar.expander("⏳ Advanced Duration Filtering"):
-    min_duration, max_duration = st.slider(
-        "Select the Duration Range (seconds)", 
-        int(data["Signal Duration(seconds)"].min()), 
-        int(data["Signal Duration(seconds)"].max()), 
-        (0, 15)
+import binning
+import perf
+from data_cube import summary_cube
+from dataset import fingerprint, load_signals
+from model_cache import trained_model
+from scoring import WARNING_LABEL
+from signal_index import signal_index
+
+CLASSIFIER_FEATURES = ['Signal Frequency(MHz)', 'Signal Duration(seconds)', 'noise']
+
+
+def train_classifier(data):
+    # Fitted on the Remarks strings directly: the forest encodes them in the
+    # same sorted order LabelEncoder did, so predictions are unchanged
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+    model.fit(data[CLASSIFIER_FEATURES], data['Remarks'])
+    return model
+
+
+def render():
+    # Load the dataset. Its version is read first: if the file changes in
+    # between, the classifier is keyed as older than its data and retrained
+    # on the next rerun, never the other way round.
+    data_key = fingerprint()
+    data = load_signals()
+
+    # Custom CSS for a professional and colorful look
+    st.markdown("""
+        <style>
+        .main-title {
+            text-align: center;
+            font-size: 36px;
+            color: #FF6347; /* Tomato */
+            font-weight: bold;
+            margin-bottom: 20px;
+        }
+        .sidebar-header {
+            font-size: 20px;
+            color: #4682B4; /* Steel Blue */
+            font-weight: bold;
+            margin-bottom: 10px;
+        }
+        .custom-box {
+            background-color: #282c34; /* Dark Gray */
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+            color: #61dafb; /* Light Blue */
+        }
+        .footer {
+            text-align: center;
+            color: #FF6347; /* Tomato */
+            font-weight: bold;
+            margin-top: 50px;
+        }
+        .chart-title {
+            color: #4169E1; /* Royal Blue */
+            font-size: 24px;
+            margin-bottom: 10px;
+        }
+        .recommendation-title {
+            color: #FF1493; /* Deep Pink */
+            font-size: 24px;
+            margin-bottom: 10px;
+        }
+        .data-summary {
+            font-size: 18px;
+            color: #4682B4; /* Steel Blue */
+        }
+        .feedback-form {
+            background-color: #f0f0f0;
+            padding: 20px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+        }
+        .real-time {
+            background-color: #f5f5f5;
+            padding: 10px;
+            border-radius: 10px;
+            margin-bottom: 20px;
+        }
+        .stButton>button {
+            background-color: #00bfff; /* Deep Sky Blue */
+            color: #ffffff;
+            border: none;
+            border-radius: 5px;
+            padding: 10px 20px;
+            cursor: pointer;
+        }
+        .stButton>button:hover {
+            background-color: #87ceeb; /* Sky Blue */
+        }
+        </style>
+    """, unsafe_allow_html=True)
+
+    # Main Title with custom CSS
+    st.markdown("<h1 class='main-title'>✨ Recommend Signals 🌌</h1>", unsafe_allow_html=True)
+
+    # Sidebar filtering with advanced options
+    st.sidebar.markdown("<h2 class='sidebar-header'>🔍 Filter Options</h2>", unsafe_allow_html=True)
+
+    # Select multiple signal types
+    signal_types = st.sidebar.multiselect(
+        "🎯 Select Signal Types", options=["Safe", "Warning", "All"], default=["Safe", "Warning"]
+    )
+
+    # Slider for frequency range with tooltip
+    min_frequency, max_frequency = st.sidebar.slider(
+        "📡 Select Frequency Range (MHz)", 
+        int(data["Signal Frequency(MHz)"].min()), 
+        int(data["Signal Frequency(MHz)"].max()), 
+        (1300, 1550), 
+        help="Adjust the slider to filter signals based on frequency range."
     )
 
-# Slider for noise level with color
-noise_level = st.sidebar.slider(
-    "🔊 Maximum Noise Level", 
-    float(data["noise"].min()), 
-    float(data["noise"].max()), 
-    0.5, 
-    help="Set the maximum acceptable noise level for signals."
-)
-
-# Filter data based on user inputs
-filtered_data = data[
-    (data["Signal Frequency(MHz)"].between(min_frequency, max_frequency)) &
-    (data["Signal Duration(seconds)"].between(min_duration, max_duration)) &
-    (data["noise"] <= noise_level)
-]
-
-# Filter by selected signal types
-if "Safe" in signal_types:
-    filtered_data = filtered_data[filtered_data["Remarks"].str.contains("Safe")]
-if "Warning" in signal_types:
-    filtered_data = filtered_data[filtered_data["Remarks"].str.contains("Warning")]
-
-# Display filtered data with expandable section for more details
-with st.expander("📋 Filtered Signals Data"):
-    st.dataframe(filtered_data)
-
-# Data Summary
-if not filtered_data.empty:
-    st.markdown("<div class='data-summary'>📊 Data Summary</div>", unsafe_allow_html=True)
-    st.write(f"**Number of signals:** {filtered_data.shape[0]}")
-    st.write(f"**Average Signal Frequency (MHz):** {filtered_data['Signal Frequency(MHz)'].mean():.2f}")
-    st.write(f"**Average Signal Duration (seconds):** {filtered_data['Signal Duration(seconds)'].mean():.2f}")
-    st.write(f"**Average Noise Level:** {filtered_data['noise'].mean():.2f}")
-
-# Download filtered data
-st.markdown("<div class='custom-box'><h3>📥 Download Filtered Data</h3></div>", unsafe_allow_html=True)
-csv = filtered_data.to_csv(index=False)
-st.download_button(
-    label="Download CSV",
-    data=csv,
-    file_name='filtered_narrowband_signals.csv',
-    mime='text/csv'
-)
-
-# Interactive scatter plot for signal visualization
-st.markdown("<div class='chart-title'>📊 Signal Visualization</div>", unsafe_allow_html=True)
-chart_choice = st.selectbox(
-    "Choose a visualization type:", 
-    ["Frequency vs Noise", "Duration vs Noise", "Frequency vs Duration", "3D Scatter"]
-)
-
-# Dynamic charts based on user selection
-if chart_choice == "Frequency vs Noise":
-    fig = px.scatter(filtered_data, x="Signal Frequency(MHz)", y="noise", color="Remarks", 
-                     title="Signal Frequency vs Noise Levels", labels={"noise": "Noise Level"})
-elif chart_choice == "Duration vs Noise":
-    fig = px.scatter(filtered_data, x="Signal Duration(seconds)", y="noise", color="Remarks", 
-                     title="Signal Duration vs Noise Levels", labels={"noise": "Noise Level"})
-elif chart_choice == "Frequency vs Duration":
-    fig = px.scatter(filtered_data, x="Signal Frequency(MHz)", y="Signal Duration(seconds)", color="Remarks", 
-                     title="Signal Frequency vs Duration", labels={"Signal Duration(seconds)": "Duration (s)"})
-else:
-    fig = go.Figure(data=[go.Scatter3d(
-        x=filtered_data["Signal Frequency(MHz)"],
-        y=filtered_data["Signal Duration(seconds)"],
-        z=filtered_data["noise"],
-        mode='markers',
-        marker=dict(size=5, color=filtered_data["noise"], colorscale='Viridis', colorbar=dict(title='Noise Level')),
-        text=filtered_data["Remarks"]
-    )])
-    fig.update_layout(
-        title="3D Scatter Plot of Frequency, Duration, and Noise",
-        scene=dict(
-            xaxis_title='Signal Frequency (MHz)',
-            yaxis_title='Signal Duration (seconds)',
-            zaxis_title='Noise Level'
+    # Duration with expander for advanced info
+    with st.sidebar.expander("⏳ Advanced Duration Filtering"):
+        min_duration, max_duration = st.slider(
+            "Select the Duration Range (seconds)", 
+            int(data["Signal Duration(seconds)"].min()), 
+            int(data["Signal Duration(seconds)"].max()), 
+            (0, 15)
         )
+
+    # Slider for noise level with color
+    noise_level = st.sidebar.slider(
+        "🔊 Maximum Noise Level", 
+        float(data["noise"].min()), 
+        float(data["noise"].max()), 
+        0.5, 
+        help="Set the maximum acceptable noise level for signals."
     )
 
-st.plotly_chart(fig, use_container_width=True)
+    # Filter data based on user inputs, through the catalog's sorted-column
+    # index instead of scanning every row. Each selected signal type must
+    # appear in Remarks, as with the chained str.contains filters before.
+    ranges = {
+        "Signal Frequency(MHz)": (min_frequency, max_frequency),
+        "Signal Duration(seconds)": (min_duration, max_duration),
+        "noise": (None, noise_level),
+    }
+    contains = [signal_type for signal_type in ("Safe", "Warning") if signal_type in signal_types]
+    filtered_data = signal_index().filter(ranges, contains, data)
+
+    # Display filtered data with expandable section for more details
+    with st.expander("📋 Filtered Signals Data"):
+        st.dataframe(filtered_data)
 
-# Signal Classification
-st.markdown("<div class='custom-box'><h3>🔍 Signal Classification</h3></div>", unsafe_allow_html=True)
-classification_feature = st.radio("🔧 Enable Signal Classification", ["No", "Yes"])
+    # Data Summary, looked up in the catalog's precomputed aggregate cube
+    summary = summary_cube().summary(ranges, contains)
+    if summary['count']:
+        st.markdown("<div class='data-summary'>📊 Data Summary</div>", unsafe_allow_html=True)
+        st.write(f"**Number of signals:** {summary['count']}")
+        st.write(f"**Average Signal Frequency (MHz):** {summary['mean']['Signal Frequency(MHz)']:.2f}")
+        st.write(f"**Average Signal Duration (seconds):** {summary['mean']['Signal Duration(seconds)']:.2f}")
+        st.write(f"**Average Noise Level:** {summary['mean']['noise']:.2f}")
 
-if classification_feature == "Yes":
-    le = LabelEncoder()
-    data['Remarks'] = le.fit_transform(data['Remarks'])
-    model = RandomForestClassifier(n_estimators=100, random_state=42)
-    X = data[['Signal Frequency(MHz)', 'Signal Duration(seconds)', 'noise']]
-    y = data['Remarks']
-    model.fit(X, y)
-    
-    st.subheader("Classify New Signal")
-    frequency = st.number_input('Signal Frequency (MHz)', min_value=0)
-    duration = st.number_input('Signal Duration (seconds)', min_value=0)
-    noise = st.number_input('Noise Level', min_value=0.0)
-    
-    if st.button('Classify Signal'):
-        prediction = model.predict([[frequency, duration, noise]])
-        class_label = le.inverse_transform(prediction)[0]
-        st.write(f"The signal is classified as: **{class_label}**")
-
-# Dynamic recommendations section
-st.markdown("<div class='recommendation-title'>📝 Recommendations</div>", unsafe_allow_html=True)
-if "Safe" in signal_types:
-    st.success("✅ These signals are from natural sources. No action needed.")
-    st.markdown("<p style='color: #32CD32;'>Proceed with further analysis. 🌿</p>", unsafe_allow_html=True)
-if "Warning" in signal_types:
-    st.warning("⚠️ These signals might indicate alien or abnormal activity.")
-    st.markdown("<p style='color: #FFA500;'>Proceed with caution. Further verification required. 🛸</p>", unsafe_allow_html=True)
-
-# Footer with custom CSS
-st.markdown("<hr>", unsafe_allow_html=True)
-st.markdown("<p class='footer'>✨ Happy Exploring the Cosmos! 🚀</p>", unsafe_allow_html=True)
+    # Download filtered data
+    st.markdown("<div class='custom-box'><h3>📥 Download Filtered Data</h3></div>", unsafe_allow_html=True)
+    csv = filtered_data.to_csv(index=False)
+    st.download_button(
+        label="Download CSV",
+        data=csv,
+        file_name='filtered_narrowband_signals.csv',
+        mime='text/csv'
+    )
+
+    # Interactive scatter plot for signal visualization
+    st.markdown("<div class='chart-title'>📊 Signal Visualization</div>", unsafe_allow_html=True)
+    chart_choice = st.selectbox(
+        "Choose a visualization type:", 
+        ["Frequency vs Noise", "Duration vs Noise", "Frequency vs Duration", "3D Scatter"]
+    )
+
+    # Large selections are plotted from a class-preserving sample (2D) or a
+    # voxel grid (3D) rather than sending every point to the browser
+    reduce_points = binning.needs_reduction(len(filtered_data))
+    plot_data = binning.stratified_sample(filtered_data)
+
+    # Dynamic charts based on user selection
+    if chart_choice == "Frequency vs Noise":
+        fig = px.scatter(plot_data, x="Signal Frequency(MHz)", y="noise", color="Remarks", 
+                         title="Signal Frequency vs Noise Levels", labels={"noise": "Noise Level"})
+    elif chart_choice == "Duration vs Noise":
+        fig = px.scatter(plot_data, x="Signal Duration(seconds)", y="noise", color="Remarks", 
+                         title="Signal Duration vs Noise Levels", labels={"noise": "Noise Level"})
+    elif chart_choice == "Frequency vs Duration":
+        fig = px.scatter(plot_data, x="Signal Frequency(MHz)", y="Signal Duration(seconds)", color="Remarks", 
+                         title="Signal Frequency vs Duration", labels={"Signal Duration(seconds)": "Duration (s)"})
+    elif reduce_points:
+        # One marker per occupied voxel, sized by how many signals it holds
+        voxels = binning.bin_points(
+            filtered_data.assign(warning=filtered_data["Remarks"].eq(WARNING_LABEL)),
+            ["Signal Frequency(MHz)", "Signal Duration(seconds)", "noise"], bins=40, weights=["warning"]
+        )
+        fig = go.Figure(data=[go.Scatter3d(
+            x=voxels["Signal Frequency(MHz)"],
+            y=voxels["Signal Duration(seconds)"],
+            z=voxels["noise"],
+            mode='markers',
+            marker=dict(size=3 + 2 * np.log10(voxels["count"]), color=voxels["noise"], colorscale='Viridis', colorbar=dict(title='Noise Level')),
+            text=[f"{count:,} signals, {share:.0%} warnings" for count, share in zip(voxels["count"], voxels["warning"])]
+        )])
+        fig.update_layout(
+            title="3D Density of Frequency, Duration, and Noise",
+            scene=dict(
+                xaxis_title='Signal Frequency (MHz)',
+                yaxis_title='Signal Duration (seconds)',
+                zaxis_title='Noise Level'
+            )
+        )
+    else:
+        fig = go.Figure(data=[go.Scatter3d(
+            x=filtered_data["Signal Frequency(MHz)"],
+            y=filtered_data["Signal Duration(seconds)"],
+            z=filtered_data["noise"],
+            mode='markers',
+            marker=dict(size=5, color=filtered_data["noise"], colorscale='Viridis', colorbar=dict(title='Noise Level')),
+            text=filtered_data["Remarks"]
+        )])
+        fig.update_layout(
+            title="3D Scatter Plot of Frequency, Duration, and Noise",
+            scene=dict(
+                xaxis_title='Signal Frequency (MHz)',
+                yaxis_title='Signal Duration (seconds)',
+                zaxis_title='Noise Level'
+            )
+        )
+
+    st.plotly_chart(fig, use_container_width=True)
+    if reduce_points:
+        if chart_choice == "3D Scatter":
+            st.caption(f"{len(filtered_data):,} signals binned into {len(voxels):,} voxels.")
+        else:
+            st.caption(binning.sample_note(filtered_data))
+
+    # Signal Classification
+    st.markdown("<div class='custom-box'><h3>🔍 Signal Classification</h3></div>", unsafe_allow_html=True)
+    classification_feature = st.radio("🔧 Enable Signal Classification", ["No", "Yes"])
+
+    if classification_feature == "Yes":
+        # Trained once per dataset version and shared by every session; when
+        # the data changes the previous model answers until the new one is
+        # ready. It trains on the frame this rerun loaded, not a fresh read.
+        classifier = trained_model('recommend_classifier', data_key, lambda: train_classifier(data))
+        model = classifier['model']
+        if classifier['stale']:
+            st.info("🔄 The dataset changed; the classifier is retraining in the background.")
+        else:
+            st.caption(f"Classifier trained in {classifier['train_seconds']:.2f}s on dataset version {classifier['data_key']}")
+
+        st.subheader("Classify New Signal")
+        frequency = st.number_input('Signal Frequency (MHz)', min_value=0)
+        duration = st.number_input('Signal Duration (seconds)', min_value=0)
+        noise = st.number_input('Noise Level', min_value=0.0)
+
+        if st.button('Classify Signal'):
+            with perf.span('predict'):
+                prediction = model.predict(pd.DataFrame([[frequency, duration, noise]], columns=CLASSIFIER_FEATURES))
+            class_label = prediction[0]
+            st.write(f"The signal is classified as: **{class_label}**")
+
+    # Dynamic recommendations section
+    st.markdown("<div class='recommendation-title'>📝 Recommendations</div>", unsafe_allow_html=True)
+    if "Safe" in signal_types:
+        st.success("✅ These signals are from natural sources. No action needed.")
+        st.markdown("<p style='color: #32CD32;'>Proceed with further analysis. 🌿</p>", unsafe_allow_html=True)
+    if "Warning" in signal_types:
+        st.warning("⚠️ These signals might indicate alien or abnormal activity.")
+        st.markdown("<p style='color: #FFA500;'>Proceed with caution. Further verification required. 🛸</p>", unsafe_allow_html=True)
+
+    # Footer with custom CSS
+    st.markdown("<hr>", unsafe_allow_html=True)
+    st.markdown("<p class='footer'>✨ Happy Exploring the Cosmos! 🚀</p>", unsafe_allow_html=True)
+
+
+if __name__ == "__main__":
+    render()
@@ -0,0 +1,161 @@
+import argparse
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import numpy as np
+import pandas as pd
+
+import perf
+from forest_engine import compile_forest, feature_contributions
+from model_cache import load_model
+from model_registry import active_model
+
+# Feature order the Random Forest was trained on (see alien signal.ipynb)
+FEATURE_COLUMNS = [
+    'brightpixel',
+    'narrowband',
+    'narrowbanddrd',
+    'noise',
+    'Stars Type',
+    'Signal Frequency(MHz)',
+    'Signal Duration(seconds)',
+    'Signal Origin ',
+]
+
+SAFE_LABEL = 'Safe : signal from natural sources'
+WARNING_LABEL = 'Warning : Alien signal'
+PREDICTION_COLUMN = 'Prediction'
+
+
+def contribution_column(feature):
+    return f'Contribution({feature.strip()})'
+
+
+def score_chunk(model, chunk, contributions=False):
+    # `model` is anything with predict_proba and classes_: the sklearn forest
+    # itself or its forest_engine.FlatForest compilation
+    # One predict_proba call per chunk; the label is its argmax, exactly as
+    # RandomForestClassifier.predict does it, so we never walk the trees twice.
+    # With `contributions`, every feature's share of P(Warning) is added too
+    # (see forest_engine.FlatForest.contributions).
+    with perf.span('predict'):
+        proba = model.predict_proba(chunk[FEATURE_COLUMNS])
+    scored = chunk.copy()
+    scored[PREDICTION_COLUMN] = model.classes_.take(np.argmax(proba, axis=1))
+    for i, label in enumerate(model.classes_):
+        scored[f'P({label})'] = proba[:, i]
+    if contributions:
+        with perf.span('explain'):
+            _, shares = feature_contributions(model, chunk[FEATURE_COLUMNS])
+        warning = list(model.classes_).index(WARNING_LABEL)
+        for i, feature in enumerate(FEATURE_COLUMNS):
+            scored[contribution_column(feature)] = shares[:, i, warning]
+    return scored
+
+
+def score_csv(source, destination, model, chunksize=100_000, progress=None, contributions=False):
+    # Streams `source` through the model `chunksize` rows at a time and appends
+    # each labelled chunk to `destination`, so only one chunk is ever in memory.
+    # `source` may be a path or a binary file object (e.g. a Streamlit upload).
+    # `progress(rows_done, fraction)` is called after every chunk.
+    owns_source = isinstance(source, (str, os.PathLike))
+    handle = open(source, 'rb') if owns_source else source
+    total_bytes = _remaining_bytes(handle)
+
+    rows = 0
+    # Sampled while each scored chunk is still alive, so it reflects this run
+    # even inside a long-lived server whose lifetime peak is higher
+    peak_memory_mb = rss_mb()
+    start = time.perf_counter()
+    try:
+        with open(destination, 'w', newline='') as out:
+            for i, chunk in enumerate(pd.read_csv(handle, chunksize=chunksize)):
+                scored = score_chunk(model, chunk, contributions)
+                scored.to_csv(out, header=(i == 0), index=False)
+                peak_memory_mb = max(peak_memory_mb, rss_mb())
+                del scored
+                rows += len(chunk)
+                if progress is not None:
+                    fraction = min(handle.tell() / total_bytes, 1.0) if total_bytes else None
+                    progress(rows, fraction)
+        seconds = time.perf_counter() - start
+    finally:
+        if owns_source:
+            handle.close()
+
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_second': rows / seconds if seconds > 0 else float('inf'),
+        'peak_memory_mb': peak_memory_mb,
+        'output': os.fspath(destination),
+    }
+
+
+def rss_mb():
+    # Current RSS of the process; NaN where /proc is not available
+    try:
+        with open('/proc/self/statm') as handle:
+            resident = int(handle.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return float('nan')
+    return resident * os.sysconf('SC_PAGE_SIZE') / 2**20
+
+
+def peak_rss_mb():
+    # Lifetime high-water mark of the process RSS, for one-shot CLIs. tracemalloc would be more precise
+    # but slows DataFrame.to_csv down by an order of magnitude.
+    if resource is None:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == 'darwin' else peak / 2**10
+
+
+def _remaining_bytes(handle):
+    try:
+        position = handle.tell()
+        end = handle.seek(0, os.SEEK_END)
+        handle.seek(position)
+        return end - position
+    except (AttributeError, OSError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a CSV of detections with the alien signal model.")
+    parser.add_argument("source", help="CSV with the model's feature columns")
+    parser.add_argument("destination", help="where to write the labelled CSV")
+    parser.add_argument("--model", default=None,
+                        help="path to a trained model (default: the active version of the model registry)")
+    parser.add_argument("--chunksize", type=int, default=100_000, help="rows scored per batch")
+    parser.add_argument("--engine", choices=["sklearn", "flat"], default="sklearn",
+                        help="score with scikit-learn or the flattened array engine")
+    parser.add_argument("--contributions", action="store_true",
+                        help="add each feature's contribution to P(Warning) to every row")
+    args = parser.parse_args()
+
+    perf.export_at_exit("scoring")
+    model = load_model(args.model) if args.model else active_model()['model']
+    if args.engine == "flat":
+        model = compile_forest(model)
+
+    def report(rows, fraction):
+        done = f" ({fraction:.0%})" if fraction is not None else ""
+        print(f"\rscored {rows:,} rows{done}", end="", flush=True)
+
+    result = score_csv(args.source, args.destination, model, args.chunksize, progress=report,
+                       contributions=args.contributions)
+    print()
+    print(f"{result['rows']:,} rows in {result['seconds']:.2f}s "
+          f"({result['rows_per_second']:,.0f} rows/s, peak RSS {result['peak_memory_mb']:.1f} MB) "
+          f"-> {result['output']}")
+
+
+if __name__ == "__main__":
+    main()
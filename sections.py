@@ -0,0 +1,47 @@
+import time
+
+import streamlit as st
+
+import perf
+
+# Sections taking longer than this get a red badge
+DEFAULT_BUDGET_MS = 1000
+
+_TIMINGS_KEY = 'section_timings'
+
+
+def section(title, build, key=None, budget_ms=DEFAULT_BUDGET_MS, default=False):
+    # A page section computed on demand: the "### title" header and a toggle
+    # are always shown, but `build` only runs (and its charts and widgets only
+    # appear) while the toggle is on. A badge under the toggle shows how long
+    # the section took against its budget. Returns build()'s result, or None
+    # while the section is closed.
+    key = key or f"section:{title}"
+    st.write(f"### {title}")
+    if not st.toggle(f"Show {title}", value=default, key=key):
+        return None
+
+    badge = st.empty()
+    start = time.perf_counter()
+    with perf.span(f"section:{title}"):
+        result = build()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    st.session_state.setdefault(_TIMINGS_KEY, {})[title] = (elapsed_ms, budget_ms)
+    if elapsed_ms <= budget_ms:
+        badge.caption(f":green[⏱️ computed in {elapsed_ms:.0f} ms]")
+    else:
+        badge.caption(f":red[⏱️ computed in {elapsed_ms:.0f} ms, over its {budget_ms} ms budget]")
+    return result
+
+
+def summary():
+    # Sidebar total of the sections computed in this rerun; call once at the
+    # end of a page
+    timings = st.session_state.pop(_TIMINGS_KEY, {})
+    total_ms = sum(elapsed_ms for elapsed_ms, _ in timings.values())
+    over = [title for title, (elapsed_ms, budget_ms) in timings.items() if elapsed_ms > budget_ms]
+    message = f"🧩 {len(timings)} section(s) computed in {total_ms:.0f} ms"
+    if over:
+        message += f"; over budget: {', '.join(over)}"
+    st.sidebar.caption(message)
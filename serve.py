@@ -0,0 +1,221 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+import perf
+from forest_engine import compile_forest
+from model_cache import load_model, model_info
+from model_registry import active_model
+from scoring import FEATURE_COLUMNS
+
+
+class MicroBatcher:
+    # Collects rows from concurrent requests and scores them together. The
+    # worker waits for the first request, keeps collecting for up to
+    # `window_ms` (or until `max_batch` rows are queued) and then makes a single
+    # predict_proba call for everything it gathered. `get_predictor()` is asked
+    # for the model once per batch, so a newly promoted model takes over at the
+    # next batch while the current one finishes with the old model.
+
+    def __init__(self, get_predictor, window_ms=5.0, max_batch=2048):
+        self.get_predictor = get_predictor
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, rows):
+        # `rows` is a (n, len(FEATURE_COLUMNS)) float array; the future resolves
+        # to the matching (n, n_classes) probability array and the class labels
+        # of the model that computed it
+        future = Future()
+        self._queue.put((rows, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            size = len(pending[0][0])
+            deadline = time.perf_counter() + self.window
+            while size < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                size += len(item[0])
+            self._score(pending)
+            # The server has no reruns to export its histograms from
+            perf.export_due()
+
+    def _score(self, pending):
+        try:
+            predictor = self.get_predictor()
+            batch = pd.DataFrame(np.concatenate([rows for rows, _ in pending]), columns=FEATURE_COLUMNS)
+            with perf.span('predict'):
+                proba = predictor.predict_proba(batch)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.rows += len(batch)
+        classes = [str(label) for label in predictor.classes_]
+        start = 0
+        for rows, future in pending:
+            future.set_result((proba[start:start + len(rows)], classes))
+            start += len(rows)
+
+
+def parse_signals(payload):
+    # Accepts one signal object, a list of them, or {"signals": [...]}
+    if isinstance(payload, dict) and 'signals' in payload:
+        payload = payload['signals']
+    if isinstance(payload, dict):
+        payload = [payload]
+    if not isinstance(payload, list) or not payload:
+        raise ValueError("Expected a signal object, a list of signals or {\"signals\": [...]}.")
+
+    rows = np.empty((len(payload), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for i, signal in enumerate(payload):
+        if not isinstance(signal, dict):
+            raise ValueError(f"Signal {i} is not an object.")
+        missing = [column for column in FEATURE_COLUMNS if column not in signal]
+        if missing:
+            raise ValueError(f"Signal {i} is missing features: {', '.join(missing)}")
+        try:
+            rows[i] = [float(signal[column]) for column in FEATURE_COLUMNS]
+        except (TypeError, ValueError):
+            raise ValueError(f"Signal {i} has a non-numeric feature value.")
+    return rows
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, so clients can reuse connections
+    batcher = None
+    timeout_seconds = 30
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send(404, {'error': f"Unknown path {self.path}"})
+            return
+        batcher = self.batcher
+        model_path, version, model = self.server.current_model()
+        self._send(200, {
+            'status': 'ok',
+            'features': FEATURE_COLUMNS,
+            'classes': [str(label) for label in model.classes_],
+            'version': version,
+            'model': model_info(model_path),
+            'batches': batcher.batches,
+            'rows': batcher.rows,
+            'mean_batch_size': batcher.rows / batcher.batches if batcher.batches else 0.0,
+        })
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            rows = parse_signals(json.loads(self.rfile.read(length)))
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send(400, {'error': str(e)})
+            return
+
+        try:
+            proba, classes = self.batcher.submit(rows).result(timeout=self.timeout_seconds)
+        except Exception as e:
+            self._send(500, {'error': f"Scoring failed: {e}"})
+            return
+
+        labels = np.asarray(classes).take(np.argmax(proba, axis=1))
+        self._send(200, {'predictions': [
+            {'label': label, 'probabilities': dict(zip(classes, p.tolist()))}
+            for label, p in zip(labels.tolist(), proba)
+        ]})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Per-request access logs would dominate the cost at thousands of req/s
+        pass
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default backlog of 5 refuses connections under a burst of clients
+    request_queue_size = 256
+
+
+def make_server(host='127.0.0.1', port=8000, model_path=None, engine='flat',
+                window_ms=5.0, max_batch=2048):
+    # Serves `model_path` if given, else the active version of the model
+    # registry, following promotions and rollbacks without a restart
+    def current_model():
+        if model_path is not None:
+            return model_path, None, load_model(model_path)
+        served = active_model()
+        return served['path'], served['version'], served['model']
+
+    def get_predictor():
+        model = current_model()[2]
+        return compile_forest(model) if engine == 'flat' else model
+
+    # Fail at startup rather than on the first request
+    get_predictor()
+    handler = type('Handler', (ScoringHandler,), {
+        'batcher': MicroBatcher(get_predictor, window_ms=window_ms, max_batch=max_batch),
+    })
+    server = ScoringServer((host, port), handler)
+    server.current_model = current_model
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve alien signal predictions over HTTP with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=None,
+                        help="path to a trained model (default: the active version of the model registry)")
+    # Micro-batches are small, where the flattened engine is far cheaper per call
+    parser.add_argument("--engine", choices=["sklearn", "flat"], default="flat",
+                        help="score with scikit-learn or the flattened array engine")
+    parser.add_argument("--window-ms", type=float, default=5.0,
+                        help="how long to collect concurrent requests into one batch")
+    parser.add_argument("--max-batch", type=int, default=2048, help="rows that close a batch early")
+    args = parser.parse_args()
+
+    perf.export_at_exit("serve")
+    server = make_server(args.host, args.port, args.model, args.engine, args.window_ms, args.max_batch)
+    print(f"Serving predictions on http://{args.host}:{args.port}/predict (window {args.window_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
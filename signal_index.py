@@ -0,0 +1,111 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATA_PATH, fingerprint, load_signals
+
+RANGE_COLUMNS = ('Signal Frequency(MHz)', 'Signal Duration(seconds)', 'noise')
+CLASS_COLUMN = 'Remarks'
+
+# One index per catalog and column set, rebuilt when the catalog changes and
+# shared by every session
+_lock = threading.Lock()
+_indexes = {}
+
+
+class SignalIndex:
+    # Answers range filters on numeric columns and substring filters on the
+    # class column without scanning the catalog. Every range column is kept
+    # sorted together with the row positions that sort it, so a range is two
+    # binary searches. The class of every row is stored as a small integer
+    # code next to the row positions of each class, so a substring test runs
+    # once per distinct class instead of once per row.
+
+    def __init__(self, frame, range_columns=RANGE_COLUMNS, class_column=CLASS_COLUMN):
+        self.frame = frame
+        self.values = {}
+        self.sorted = {}
+        self.order = {}
+        for column in range_columns:
+            values = frame[column].to_numpy(dtype=np.float64)
+            order = np.argsort(values, kind='stable')
+            self.values[column] = values
+            self.sorted[column] = values[order]
+            self.order[column] = order
+
+        codes, self.classes = pd.factorize(frame[class_column])
+        # Rows without a class get their own code, which no filter matches
+        codes[codes < 0] = len(self.classes)
+        self.codes = codes.astype(np.min_scalar_type(len(self.classes)))
+        self.class_rows = [np.flatnonzero(self.codes == code) for code in range(len(self.classes))]
+
+    def _range(self, column, low, high):
+        # Positions (in sorted order) of the rows with low <= value <= high;
+        # NaN sorts last and never matches
+        values = self.sorted[column]
+        start = 0 if low is None else np.searchsorted(values, low, side='left')
+        stop = np.searchsorted(values, np.inf, side='right') if high is None else np.searchsorted(values, high, side='right')
+        return start, max(start, stop)
+
+    def query(self, ranges=None, contains=()):
+        # Row positions, in catalog order, of the rows inside every
+        # {column: (low, high)} range (inclusive; None leaves a side open) whose
+        # class contains every string in `contains`. The smallest candidate set
+        # (one range or one class) is taken as the starting point and only its
+        # rows are checked against the other conditions.
+        ranges = ranges or {}
+        allowed = np.ones(len(self.classes) + 1, dtype=bool)
+        allowed[-1] = not contains
+        for pattern in contains:
+            allowed[:-1] &= np.asarray(self.classes.str.contains(pattern, regex=False), dtype=bool)
+
+        bounds = {column: self._range(column, *ranges[column]) for column in ranges}
+        candidates = [(stop - start, 'range', column) for column, (start, stop) in bounds.items()]
+        if contains:
+            candidates.append((sum(len(self.class_rows[code]) for code in np.flatnonzero(allowed[:-1])), 'class', None))
+        if not candidates:
+            return np.arange(len(self.codes))
+
+        _, kind, driver = min(candidates, key=lambda candidate: candidate[0])
+        if kind == 'range':
+            start, stop = bounds[driver]
+            rows = self.order[driver][start:stop]
+        else:
+            rows = np.concatenate([self.class_rows[code] for code in np.flatnonzero(allowed[:-1])] or [np.empty(0, dtype=np.intp)])
+
+        keep = allowed[self.codes[rows]]
+        for column, (low, high) in ranges.items():
+            if column == driver:
+                continue
+            values = self.values[column][rows]
+            if low is not None:
+                keep &= values >= low
+            if high is not None:
+                keep &= values <= high
+        return np.sort(rows[keep])
+
+    def filter(self, ranges=None, contains=(), frame=None):
+        # The matching rows of `frame` (row for row the frame the index was
+        # built from, e.g. the whole catalog when the index only loaded its
+        # own columns)
+        return (self.frame if frame is None else frame).take(self.query(ranges, contains))
+
+
+def signal_index(path=DATA_PATH, range_columns=RANGE_COLUMNS, class_column=CLASS_COLUMN):
+    # The index of a catalog, built on first use and again only when the
+    # catalog changes on disk, from just the columns it searches
+    key = (os.path.abspath(path), tuple(range_columns), class_column)
+    version = fingerprint(path)
+    entry = _indexes.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    with _lock:
+        entry = _indexes.get(key)
+        if entry is None or entry[0] != version:
+            frame = load_signals(path, columns=list(range_columns) + [class_column])
+            entry = (version, SignalIndex(frame, range_columns, class_column))
+            _indexes[key] = entry
+    return entry[1]
@@ -0,0 +1,170 @@
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from dataset import DATA_PATH, fingerprint, iter_chunks
+
+
+class RunningStats:
+    # Count, mean, min/max, missing values and the 2nd-4th central moment sums
+    # of every column, accumulated chunk by chunk. Each chunk is reduced with
+    # a two-pass (centered) computation and folded in with the pairwise update
+    # formulas of Chan et al. / Pébay, which stay accurate on huge catalogs
+    # and let partial results from separate chunks or workers be merged.
+
+    def __init__(self):
+        self.columns = None
+        self.numeric = None
+        self.missing = None
+        self.n = self.mean = self.m2 = self.m3 = self.m4 = None
+        self.min = self.max = None
+
+    def update(self, chunk):
+        return self.merge(RunningStats.of_chunk(chunk, self.numeric))
+
+    @classmethod
+    def of_chunk(cls, chunk, numeric=None):
+        stats = cls()
+        stats.columns = list(chunk.columns)
+        if numeric is None:
+            numeric = [column for column in chunk.columns if pd.api.types.is_numeric_dtype(chunk[column])]
+        stats.numeric = list(numeric)
+        stats.missing = chunk.isna().sum().to_numpy(dtype=np.int64)
+
+        values = chunk[stats.numeric].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        n = valid.sum(axis=0).astype(np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, np.where(valid, values, 0.0).sum(axis=0) / n, 0.0)
+        d = np.where(valid, values - mean, 0.0)
+        d2 = d * d
+        stats.n, stats.mean = n, mean
+        stats.m2, stats.m3, stats.m4 = d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)
+        stats.min = np.where(valid, values, np.inf).min(axis=0, initial=np.inf)
+        stats.max = np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf)
+        return stats
+
+    def merge(self, other):
+        if other.columns is None:
+            return self
+        if self.columns is None:
+            self.__dict__.update(other.__dict__)
+            return self
+        if other.columns != self.columns or other.numeric != self.numeric:
+            raise ValueError("Cannot merge statistics of different columns.")
+
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ratio = np.where(n > 0, nb / n, 0.0)
+            mean = self.mean + delta * ratio
+            m2 = self.m2 + other.m2 + delta**2 * na * ratio
+            m3 = (self.m3 + other.m3
+                  + np.where(n > 0, delta**3 * na * nb * (na - nb) / n**2, 0.0)
+                  + np.where(n > 0, 3 * delta * (na * other.m2 - nb * self.m2) / n, 0.0))
+            m4 = (self.m4 + other.m4
+                  + np.where(n > 0, delta**4 * na * nb * (na**2 - na * nb + nb**2) / n**3, 0.0)
+                  + np.where(n > 0, 6 * delta**2 * (na**2 * other.m2 + nb**2 * self.m2) / n**2, 0.0)
+                  + np.where(n > 0, 4 * delta * (na * other.m3 - nb * self.m3) / n, 0.0))
+
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.missing = self.missing + other.missing
+        return self
+
+    def result(self):
+        # One row per column. std/variance use ddof=1 like DataFrame.describe;
+        # skewness and kurtosis are the biased (Fisher) estimates that
+        # scipy.stats.skew / scipy.stats.kurtosis return by default.
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            variance = np.where(n > 1, self.m2 / (n - 1), np.nan)
+            spread = np.where(self.m2 > 0, self.m2, np.nan)
+            skewness = np.sqrt(n) * self.m3 / spread**1.5
+            kurtosis = n * self.m4 / spread**2 - 3.0
+        empty = n == 0
+        numeric = pd.DataFrame({
+            'count': n.astype(np.int64),
+            'mean': np.where(empty, np.nan, self.mean),
+            'std': np.sqrt(variance),
+            'variance': variance,
+            'min': np.where(empty, np.nan, self.min),
+            'max': np.where(empty, np.nan, self.max),
+            'skewness': skewness,
+            'kurtosis': kurtosis,
+        }, index=self.numeric)
+        table = numeric.reindex(self.columns)
+        table['missing'] = self.missing
+        return table
+
+
+def frame_stats(frame):
+    # Statistics of a frame already in memory, in the same single pass
+    return RunningStats.of_chunk(frame).result()
+
+
+_lock = threading.Lock()
+_results = {}
+
+
+def catalog_stats(path=DATA_PATH, chunksize=250_000, n_jobs=1):
+    # Statistics of a whole catalog, read chunk by chunk so it never has to fit
+    # in memory. With n_jobs > 1 chunks are reduced concurrently (NumPy releases
+    # the GIL) and merged as they finish. Results are cached per catalog
+    # fingerprint.
+    key = (fingerprint(path), chunksize)
+    result = _results.get(key)
+    if result is not None:
+        return result.copy()
+
+    with _lock:
+        result = _results.get(key)
+        if result is None:
+            result = _scan(path, chunksize, n_jobs)
+            _results[key] = result
+    return result.copy()
+
+
+def _scan(path, chunksize, n_jobs):
+    chunks = iter_chunks(path, chunksize)
+    first = next(chunks, None)
+    if first is None:
+        return RunningStats().result()
+    total = RunningStats.of_chunk(first)
+    numeric = total.numeric
+
+    if n_jobs <= 1:
+        for chunk in chunks:
+            total.merge(RunningStats.of_chunk(chunk, numeric))
+        return total.result()
+
+    # Keep at most 2 * n_jobs chunks in flight so memory stays bounded
+    with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+        pending = []
+        for chunk in chunks:
+            pending.append(executor.submit(RunningStats.of_chunk, chunk, numeric))
+            if len(pending) >= 2 * n_jobs:
+                total.merge(pending.pop(0).result())
+        for future in pending:
+            total.merge(future.result())
+    return total.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single-pass statistics of a signal catalog.")
+    parser.add_argument("source", nargs="?", default=DATA_PATH, help="catalog CSV or Arrow file")
+    parser.add_argument("--chunksize", type=int, default=250_000, help="rows read per chunk")
+    parser.add_argument("--jobs", type=int, default=1, help="chunks reduced concurrently")
+    args = parser.parse_args()
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(catalog_stats(args.source, args.chunksize, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import argparse
+import json
+import os
+import shutil
+import time
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.model_selection import train_test_split
+
+import perf
+from dataset import DATA_PATH, fingerprint, load_signals
+from model_cache import MODEL_PATH, file_digest, metadata_path
+from model_registry import ARTIFACT_PREFIX, REGISTRY_DIR, promote
+from scoring import FEATURE_COLUMNS, peak_rss_mb
+
+TARGET_COLUMN = 'Remarks'
+
+# The settings of the deployed model (see alien signal.ipynb)
+N_ESTIMATORS = 200
+RANDOM_STATE = 1
+TEST_SIZE = 0.2
+SPLIT_RANDOM_STATE = 42
+
+# Single rows timed for the per-row latency figures
+LATENCY_ROWS = 200
+
+
+def _latency(model, X):
+    # Per-row latency of one-row predict calls (p50 and p95, in ms) and of a
+    # single batched call over the same rows (per row, in ms)
+    rows = X.iloc[np.arange(LATENCY_ROWS) % len(X)]
+    timings = []
+    for i in range(len(rows)):
+        start = time.perf_counter()
+        model.predict(rows.iloc[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    model.predict(rows)
+    batch = time.perf_counter() - start
+    return {
+        'latency_ms_p50': float(np.percentile(timings, 50) * 1000),
+        'latency_ms_p95': float(np.percentile(timings, 95) * 1000),
+        'batch_ms_per_row': batch * 1000 / len(rows),
+    }
+
+
+def train(data_path=DATA_PATH, n_estimators=N_ESTIMATORS, n_jobs=-1):
+    # Fits the alien signal forest on the catalog the way the notebook did:
+    # same features, split and seeds, so the same catalog gives the same
+    # trees whatever `n_jobs` is. Returns (model, metadata).
+    data = load_signals(data_path)
+    X = data[FEATURE_COLUMNS]
+    y = data[TARGET_COLUMN]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_RANDOM_STATE)
+
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=RANDOM_STATE, n_jobs=n_jobs)
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    train_seconds = time.perf_counter() - start
+    peak_memory_mb = peak_rss_mb()
+    # Served models predict one signal at a time, where a thread pool only
+    # adds overhead, so the artifact is saved single-threaded like the old one
+    model.set_params(n_jobs=None)
+
+    metrics = {
+        'train_seconds': train_seconds,
+        'peak_memory_mb': peak_memory_mb,
+        'train_accuracy': float(model.score(X_train, y_train)),
+        'test_accuracy': float(model.score(X_test, y_test)),
+    }
+    metrics.update(_latency(model, X_test))
+
+    created = datetime.now(timezone.utc)
+    data_key = fingerprint(data_path)
+    metadata = {
+        'version': f"{created:%Y%m%dT%H%M%S%fZ}-{data_key[:8]}",
+        'created_at': created.isoformat(),
+        'feature_order': list(FEATURE_COLUMNS),
+        'classes': [str(label) for label in model.classes_],
+        'target': TARGET_COLUMN,
+        'data_path': os.path.abspath(data_path),
+        'data_fingerprint': data_key,
+        'rows': {'train': len(X_train), 'test': len(X_test)},
+        'params': {
+            'n_estimators': n_estimators,
+            'random_state': RANDOM_STATE,
+            'n_jobs': n_jobs,
+            'test_size': TEST_SIZE,
+            'split_random_state': SPLIT_RANDOM_STATE,
+        },
+        'sklearn_version': sklearn.__version__,
+        'metrics': metrics,
+    }
+    return model, metadata
+
+
+def _write_json(data, path):
+    with open(path + '.tmp', 'w') as handle:
+        json.dump(data, handle, indent=2)
+    os.replace(path + '.tmp', path)
+
+
+def save(model, metadata, directory=REGISTRY_DIR):
+    # Writes <prefix>-<version>.pkl and its .json metadata to `directory`.
+    # Both go under temporary names first and the metadata is in place
+    # before the model appears, so load_model never sees one without the
+    # other. An existing version is never overwritten. Returns the artifact
+    # path.
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{ARTIFACT_PREFIX}-{metadata['version']}.pkl")
+    if os.path.exists(path) or os.path.exists(metadata_path(path)):
+        raise FileExistsError(f"Model version {metadata['version']} already exists in '{directory}'.")
+    joblib.dump(model, path + '.tmp')
+    metadata = dict(metadata, model_file=os.path.basename(path), sha256=file_digest(path + '.tmp'))
+    _write_json(metadata, metadata_path(path))
+    os.replace(path + '.tmp', path)
+    return path
+
+
+def install(path, destination=MODEL_PATH):
+    # Copies an artifact and its metadata over the model the app serves
+    shutil.copyfile(path, destination + '.tmp')
+    with open(metadata_path(path)) as handle:
+        metadata = json.load(handle)
+    _write_json(dict(metadata, model_file=os.path.basename(destination)), metadata_path(destination))
+    os.replace(destination + '.tmp', destination)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the alien signal model and write a versioned artifact.")
+    parser.add_argument("--data", default=DATA_PATH, help="catalog to train on")
+    parser.add_argument("--output-dir", default=REGISTRY_DIR, help="where to write the artifact and its metadata")
+    parser.add_argument("--n-estimators", type=int, default=N_ESTIMATORS, help="trees in the forest")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="cores used to grow the trees (-1 for all)")
+    parser.add_argument("--promote", action="store_true",
+                        help="make the new version the one the app and servers use")
+    parser.add_argument("--install", action="store_true",
+                        help=f"also replace '{MODEL_PATH}', the model the app serves")
+    args = parser.parse_args()
+
+    perf.export_at_exit("train")
+    model, metadata = train(args.data, args.n_estimators, args.n_jobs)
+    path = save(model, metadata, args.output_dir)
+    if args.promote:
+        promote(metadata['version'], args.output_dir)
+    if args.install:
+        install(path)
+
+    metrics = metadata['metrics']
+    print(f"version {metadata['version']} -> {path}")
+    print(f"trained in {metrics['train_seconds']:.2f}s (peak RSS {metrics['peak_memory_mb']:.1f} MB), "
+          f"accuracy {metrics['train_accuracy']:.3f} train / {metrics['test_accuracy']:.3f} test")
+    print(f"latency {metrics['latency_ms_p50']:.2f} ms p50, {metrics['latency_ms_p95']:.2f} ms p95 per row, "
+          f"{metrics['batch_ms_per_row']:.3f} ms per row batched")
+    if args.promote:
+        print(f"promoted to active in '{args.output_dir}'")
+    if args.install:
+        print(f"installed as '{MODEL_PATH}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,300 +1,387 @@
 import streamlit as st
-import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
+import numpy as np
 import plotly.express as px
 
-st.title("📊 Narrowband Signal Visualizations")
-
-# Load the narrowband signals data
-data = pd.read_csv("narrowband signals.csv")
-
-# Display the dataset
-st.write("### Dataset Overview")
-st.dataframe(data.head())
-
-# ---- Bar Plot ----
-st.write("### Bar Plot")
-barplot_columns = st.multiselect(
-    "Choose one feature to visualize on Y-axis for the Bar Plot and 'Stars Type' will be on X-axis:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel']
-)
-
-if len(barplot_columns) == 1:
-    st.write(f"### Bar Plot of {barplot_columns[0]}")
-    fig, ax = plt.subplots()
-    sns.barplot(x='Stars Type', y=barplot_columns[0], data=data, ax=ax, palette='plasma')
-    ax.set_title(f'Bar Plot of {barplot_columns[0]} by Stars Type', fontsize=16)
-    ax.set_xlabel('Stars Type', fontsize=14)
-    ax.set_ylabel(barplot_columns[0], fontsize=14)
-    st.pyplot(fig)
-else:
-    st.error("Please select exactly 1 feature for the Bar Plot.")
-
-# ---- Correlation Heatmap ----
-st.write("### Correlation Heatmap")
-heatmap_columns = st.multiselect(
-    "Choose at least 2 features for the Correlation Heatmap:",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['brightpixel', 'narrowband']
-)
-
-if len(heatmap_columns) >= 2:
-    st.write(f"### Correlation Heatmap for {', '.join(heatmap_columns)}")
-    fig, ax = plt.subplots(figsize=(12, 8))
-    sns.heatmap(data[heatmap_columns].corr(), annot=True, cmap='viridis', ax=ax, linewidths=.5)
-    ax.set_title('Correlation Heatmap', fontsize=16)
-    st.pyplot(fig)
-else:
-    st.error("Please select at least 2 features for the Correlation Heatmap.")
-
-# ---- Scatter Plot: Signal Frequency vs Signal Duration ----
-st.write("### Scatter Plot: Signal Frequency vs Signal Duration")
-scatter_columns = st.multiselect(
-    "Choose 2 columns for X and Y axes:",
-    ['Signal Frequency(MHz)', 'Signal Duration(seconds)'],
-    default=['Signal Frequency(MHz)', 'Signal Duration(seconds)']
-)
-
-if len(scatter_columns) == 2:
-    st.write(f"### Scatter Plot: {scatter_columns[0]} vs {scatter_columns[1]}")
-    fig, ax = plt.subplots()
-    sns.scatterplot(x=scatter_columns[0], y=scatter_columns[1], hue='Stars Type', data=data, ax=ax, palette='Set1')
-    ax.set_title(f'Scatter Plot: {scatter_columns[0]} vs {scatter_columns[1]}', fontsize=16)
-    ax.set_xlabel(scatter_columns[0], fontsize=14)
-    ax.set_ylabel(scatter_columns[1], fontsize=14)
-    st.pyplot(fig)
-else:
-    st.error("Please select exactly 2 columns for the Scatter Plot.")
-
-# ---- Sunburst Plot 1 ----
-st.write("### Sunburst Plot: Stars Type and Remarks")
-sunburst_columns_1 = st.multiselect(
-    "Choose at least 2 columns for Sunburst Plot 1:",
-    ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
-    default=['Stars Type', 'Remarks']
-)
-
-if len(sunburst_columns_1) >= 2:
-    fig_sunburst_1 = px.sunburst(data, path=sunburst_columns_1, color='Signal Frequency(MHz)')
-    st.plotly_chart(fig_sunburst_1)
-else:
-    st.error("Please select at least 2 columns for Sunburst Plot 1.")
-
-# ---- Sunburst Plot 2 ----
-st.write("### Sunburst Plot: Stars Type and Signal Frequency")
-sunburst_columns_2 = st.multiselect(
-    "Choose at least 2 columns for Sunburst Plot 2:",
-    ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
-    default=['Stars Type', 'Signal Frequency(MHz)']
-)
-
-if len(sunburst_columns_2) >= 2:
-    fig_sunburst_2 = px.sunburst(data, path=sunburst_columns_2, color='Signal Duration(seconds)')
-    st.plotly_chart(fig_sunburst_2)
-else:
-    st.error("Please select at least 2 columns for Sunburst Plot 2.")
-
-# ---- Sunburst Plot 3 ----
-st.write("### Sunburst Plot: Stars Type and Brightpixel")
-sunburst_columns_3 = st.multiselect(
-    "Choose at least 2 columns for Sunburst Plot 3:",
-    ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
-    default=['Stars Type', 'narrowband']
-)
-
-if len(sunburst_columns_3) >= 2:
-    fig_sunburst_3 = px.sunburst(data, path=sunburst_columns_3, color='brightpixel')
-    st.plotly_chart(fig_sunburst_3)
-else:
-    st.error("Please select at least 2 columns for Sunburst Plot 3.")
-
-# ---- Boxplot ----
-st.write("### Boxplot of Brightpixel vs. Stars Type")
-fig, ax = plt.subplots()
-sns.boxplot(x='Stars Type', y='brightpixel', data=data, ax=ax, palette='pastel')
-ax.set_title('Boxplot of Brightpixel by Stars Type', fontsize=16)
-ax.set_xlabel('Stars Type', fontsize=14)
-ax.set_ylabel('Brightpixel', fontsize=14)
-st.pyplot(fig)
-
-# ---- Violin Plot ----
-st.write("### Violin Plot of Narrowband vs. Stars Type")
-fig, ax = plt.subplots()
-sns.violinplot(x='Stars Type', y='narrowband', data=data, ax=ax, palette='muted')
-ax.set_title('Violin Plot of Narrowband by Stars Type', fontsize=16)
-ax.set_xlabel('Stars Type', fontsize=14)
-ax.set_ylabel('Narrowband', fontsize=14)
-st.pyplot(fig)
-
-# ---- Pairplot ----
-st.write("### Pairplot of Selected Features")
-pairplot_columns = st.multiselect(
-    "Choose features for Pairplot (at least 2):",
-    ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Stars Type'],
-    default=['brightpixel', 'narrowband', 'narrowbanddrd', 'noise']
-)
-
-# Ensure 'Stars Type' is included for hue if it is selected
-hue = 'Stars Type' if 'Stars Type' in pairplot_columns else None
-
-if len(pairplot_columns) >= 2:
-    st.write(f"### Pairplot of {', '.join(pairplot_columns)}")
-    fig = sns.pairplot(data[pairplot_columns], hue=hue, palette='husl')
-    st.pyplot(fig)
-else:
-    st.error("Please select at least 2 features for the Pairplot.")
-
-# ---- Histogram ----
-st.write("### Histogram of Signal Frequency (MHz)")
-fig, ax = plt.subplots()
-sns.histplot(data['Signal Frequency(MHz)'], bins=20, kde=True, ax=ax, color='skyblue')
-ax.set_title('Histogram of Signal Frequency (MHz)', fontsize=16)
-ax.set_xlabel('Signal Frequency (MHz)', fontsize=14)
-ax.set_ylabel('Frequency', fontsize=14)
-st.pyplot(fig)
-
-# ---- Line Plot ----
-st.write("### Line Plot: Signal Frequency vs. Signal Duration")
-fig, ax = plt.subplots()
-sns.lineplot(x='Signal Duration(seconds)', y='Signal Frequency(MHz)', data=data, ax=ax, color='orange')
-ax.set_title('Line Plot: Signal Frequency vs. Signal Duration', fontsize=16)
-ax.set_xlabel('Signal Duration (seconds)', fontsize=14)
-ax.set_ylabel('Signal Frequency (MHz)', fontsize=14)
-st.pyplot(fig)
-
-# ---- Heatmap ----
-st.write("### Heatmap of Signal Frequency and Signal Duration (Brightness Intensity)")
-fig, ax = plt.subplots()
-sns.heatmap(data.pivot_table(values='brightpixel', index='Signal Frequency(MHz)', columns='Signal Duration(seconds)'), cmap="Blues", ax=ax, linewidths=.5)
-ax.set_title('Heatmap of Brightness Intensity by Signal Frequency and Duration', fontsize=16)
-st.pyplot(fig)
-
-# ---- KDE Plot ----
-st.write("### KDE Plot of Narrowband vs Narrowbanddrd")
-fig, ax = plt.subplots()
-sns.kdeplot(x='narrowband', y='narrowbanddrd', data=data, ax=ax, cmap="Reds", shade=True)
-ax.set_title('KDE Plot of Narrowband vs Narrowbanddrd', fontsize=16)
-ax.set_xlabel('Narrowband', fontsize=14)
-ax.set_ylabel('Narrowbanddrd', fontsize=14)
-st.pyplot(fig)
-
-# ---- Swarm Plot ----
-st.write("### Swarm Plot of Noise vs. Stars Type")
-fig, ax = plt.subplots()
-sns.swarmplot(x='Stars Type', y='noise', data=data, ax=ax, palette='Set2')
-ax.set_title('Swarm Plot of Noise by Stars Type', fontsize=16)
-ax.set_xlabel('Stars Type', fontsize=14)
-ax.set_ylabel('Noise', fontsize=14)
-st.pyplot(fig)
-
-# ---- Strip Plot ----
-st.write("### Strip Plot of Signal Frequency(MHz) vs. Stars Type")
-fig, ax = plt.subplots()
-sns.stripplot(x='Stars Type', y='Signal Frequency(MHz)', data=data, ax=ax, palette='Set1')
-ax.set_title('Strip Plot of Signal Frequency by Stars Type', fontsize=16)
-ax.set_xlabel('Stars Type', fontsize=14)
-ax.set_ylabel('Signal Frequency (MHz)', fontsize=14)
-st.pyplot(fig)
-
-# ---- Joint Plot ----
-st.write("### Joint Plot of Brightpixel vs. Noise")
-fig = sns.jointplot(x='brightpixel', y='noise', data=data, kind="hex", color="green", cmap='Greens')
-fig.fig.suptitle('Joint Plot of Brightpixel vs Noise', fontsize=8)
-st.pyplot(fig)
-
-import plotly.express as px
-
-st.write("### Radar Chart of Features by Stars Type")
-
-# Prepare the data
-data_radar = data[['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']].copy()
-
-# Group by 'Stars Type' and calculate mean values
-data_radar = data_radar.groupby('Stars Type').mean().reset_index()
-
-# Convert to long format for radar chart
-data_radar_long = data_radar.melt(id_vars='Stars Type', var_name='Feature', value_name='Value')
-
-# Create radar chart
-fig_radar = px.line_polar(data_radar_long, r='Value', theta='Feature', color='Stars Type', line_close=True)
-fig_radar.update_layout(title='Radar Chart of Features by Stars Type')
-st.plotly_chart(fig_radar)
-
-
-st.write("### Treemap of Stars Type and Noise")
-
-fig_treemap = px.treemap(data, path=['Stars Type', 'Remarks'], values='noise', color='noise', color_continuous_scale='RdBu')
-fig_treemap.update_layout(title='Treemap of Stars Type and Noise')
-st.plotly_chart(fig_treemap)
-
-
-st.write("### Bubble Chart of Signal Frequency vs. Signal Duration")
-
-fig_bubble = px.scatter(data, x='Signal Frequency(MHz)', y='Signal Duration(seconds)', size='brightpixel', color='Stars Type', hover_name='Remarks', size_max=60)
-fig_bubble.update_layout(title='Bubble Chart of Signal Frequency vs. Signal Duration')
-st.plotly_chart(fig_bubble)
-
-
-st.write("### Facet Grid of Noise by Stars Type")
-
-g = sns.FacetGrid(data, col="Stars Type", col_wrap=4, height=4, aspect=1.2)
-g.map_dataframe(sns.histplot, x='noise', bins=20, kde=True)
-g.set_titles(col_template="{col_name}")
-g.set_axis_labels("Noise", "Frequency")
-g.fig.suptitle('Noise Distribution by Stars Type', fontsize=16)
-g.fig.tight_layout()
-g.fig.subplots_adjust(top=0.9)
-st.pyplot(g.fig)
-
-
-st.write("### Hexbin Plot of Signal Frequency vs. Signal Duration")
-
-fig, ax = plt.subplots()
-hb = ax.hexbin(data['Signal Frequency(MHz)'], data['Signal Duration(seconds)'], gridsize=30, cmap='Blues')
-cb = fig.colorbar(hb, ax=ax)
-ax.set_xlabel('Signal Frequency (MHz)')
-ax.set_ylabel('Signal Duration (seconds)')
-ax.set_title('Hexbin Plot of Signal Frequency vs. Signal Duration')
-st.pyplot(fig)
-
-
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-
-st.title("📊 Stacked Area Chart of Features")
-
-# Load the dataset
-data = pd.read_csv("narrowband signals.csv")
-
-# Convert relevant columns to numeric, forcing errors to NaN
-columns_to_convert = ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
-for column in columns_to_convert:
-    data[column] = pd.to_numeric(data[column], errors='coerce')
-
-# Aggregate data by 'Stars Type'
-# Use sum or median as an alternative to mean
-data_grouped = data.groupby('Stars Type').sum().reset_index()
-
-# Convert to long format for stacked area chart
-data_long = data_grouped.melt(id_vars='Stars Type', var_name='Feature', value_name='Value')
-
-# Create stacked area chart
-fig_area = px.area(data_long, x='Feature', y='Value', color='Stars Type', 
-                   title='Stacked Area Chart of Features by Stars Type',
-                   labels={'Value': 'Total Value', 'Feature': 'Features'},
-                   template='plotly_dark')  # Dark theme for better visibility
-
-# Update layout for better aesthetics
-fig_area.update_layout(
-    xaxis_title='Features',
-    yaxis_title='Total Value',
-    legend_title='Stars Type',
-    xaxis_tickangle=-45  # Rotate x-axis labels for better readability
-)
-
-# Display the chart
-st.plotly_chart(fig_area)
-
+import binning
+import figure_cache
+import plotting
+import sections
+from correlation import correlation_matrix
+from dataset import load_signals
+
+
+def render():
+    st.title("📊 Narrowband Signal Visualizations")
+
+    # Load the narrowband signals data
+    data = load_signals()
+
+    # Display the dataset
+    st.write("### Dataset Overview")
+    st.dataframe(data.head())
+
+    # ---- Bar Plot ----
+    def bar_plot_section():
+        barplot_columns = st.multiselect(
+            "Choose one feature to visualize on Y-axis for the Bar Plot and 'Stars Type' will be on X-axis:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel']
+        )
+
+        if len(barplot_columns) == 1:
+            st.write(f"### Bar Plot of {barplot_columns[0]}")
+
+            def bar_plot():
+                fig, ax = plotting.subplots()
+                sns.barplot(x='Stars Type', y=barplot_columns[0], data=data, ax=ax, palette='plasma')
+                ax.set_title(f'Bar Plot of {barplot_columns[0]} by Stars Type', fontsize=16)
+                ax.set_xlabel('Stars Type', fontsize=14)
+                ax.set_ylabel(barplot_columns[0], fontsize=14)
+                return fig
+
+            figure_cache.pyplot('bar', barplot_columns, bar_plot)
+        else:
+            st.error("Please select exactly 1 feature for the Bar Plot.")
+
+    sections.section("Bar Plot", bar_plot_section, default=True)
+
+    # ---- Correlation Heatmap ----
+    def correlation_heatmap_section():
+        heatmap_columns = st.multiselect(
+            "Choose at least 2 features for the Correlation Heatmap:",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['brightpixel', 'narrowband']
+        )
+
+        if len(heatmap_columns) >= 2:
+            st.write(f"### Correlation Heatmap for {', '.join(heatmap_columns)}")
+
+            def correlation_heatmap():
+                fig, ax = plotting.subplots(figsize=(12, 8))
+                corr_matrix, _ = correlation_matrix(data[heatmap_columns])
+                sns.heatmap(corr_matrix, annot=True, cmap='viridis', ax=ax, linewidths=.5)
+                ax.set_title('Correlation Heatmap', fontsize=16)
+                return fig
+
+            figure_cache.pyplot('correlation_heatmap', heatmap_columns, correlation_heatmap)
+        else:
+            st.error("Please select at least 2 features for the Correlation Heatmap.")
+
+    sections.section("Correlation Heatmap", correlation_heatmap_section)
+
+    # ---- Scatter Plot: Signal Frequency vs Signal Duration ----
+    def scatter_plot_section():
+        scatter_columns = st.multiselect(
+            "Choose 2 columns for X and Y axes:",
+            ['Signal Frequency(MHz)', 'Signal Duration(seconds)'],
+            default=['Signal Frequency(MHz)', 'Signal Duration(seconds)']
+        )
+
+        if len(scatter_columns) == 2:
+            st.write(f"### Scatter Plot: {scatter_columns[0]} vs {scatter_columns[1]}")
+
+            def scatter_plot():
+                fig, ax = plotting.subplots()
+                sns.scatterplot(x=scatter_columns[0], y=scatter_columns[1], hue='Stars Type', data=binning.stratified_sample(data), ax=ax, palette='Set1')
+                ax.set_title(f'Scatter Plot: {scatter_columns[0]} vs {scatter_columns[1]}', fontsize=16)
+                ax.set_xlabel(scatter_columns[0], fontsize=14)
+                ax.set_ylabel(scatter_columns[1], fontsize=14)
+                return fig
+
+            figure_cache.pyplot('scatter', scatter_columns, scatter_plot)
+            if binning.needs_reduction(len(data)):
+                st.caption(binning.sample_note(data))
+        else:
+            st.error("Please select exactly 2 columns for the Scatter Plot.")
+
+    sections.section("Scatter Plot: Signal Frequency vs Signal Duration", scatter_plot_section)
+
+    # ---- Sunburst Plot 1 ----
+    def sunburst_1_section():
+        sunburst_columns_1 = st.multiselect(
+            "Choose at least 2 columns for Sunburst Plot 1:",
+            ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
+            default=['Stars Type', 'Remarks']
+        )
+
+        if len(sunburst_columns_1) >= 2:
+            figure_cache.plotly_chart('sunburst_1', sunburst_columns_1,
+                                      lambda: px.sunburst(data, path=sunburst_columns_1, color='Signal Frequency(MHz)'))
+        else:
+            st.error("Please select at least 2 columns for Sunburst Plot 1.")
+
+    sections.section("Sunburst Plot: Stars Type and Remarks", sunburst_1_section)
+
+    # ---- Sunburst Plot 2 ----
+    def sunburst_2_section():
+        sunburst_columns_2 = st.multiselect(
+            "Choose at least 2 columns for Sunburst Plot 2:",
+            ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
+            default=['Stars Type', 'Signal Frequency(MHz)']
+        )
+
+        if len(sunburst_columns_2) >= 2:
+            figure_cache.plotly_chart('sunburst_2', sunburst_columns_2,
+                                      lambda: px.sunburst(data, path=sunburst_columns_2, color='Signal Duration(seconds)'))
+        else:
+            st.error("Please select at least 2 columns for Sunburst Plot 2.")
+
+    sections.section("Sunburst Plot: Stars Type and Signal Frequency", sunburst_2_section)
+
+    # ---- Sunburst Plot 3 ----
+    def sunburst_3_section():
+        sunburst_columns_3 = st.multiselect(
+            "Choose at least 2 columns for Sunburst Plot 3:",
+            ['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Remarks'],
+            default=['Stars Type', 'narrowband']
+        )
+
+        if len(sunburst_columns_3) >= 2:
+            figure_cache.plotly_chart('sunburst_3', sunburst_columns_3,
+                                      lambda: px.sunburst(data, path=sunburst_columns_3, color='brightpixel'))
+        else:
+            st.error("Please select at least 2 columns for Sunburst Plot 3.")
+
+    sections.section("Sunburst Plot: Stars Type and Brightpixel", sunburst_3_section)
+
+    # ---- Boxplot ----
+    def boxplot():
+        fig, ax = plotting.subplots()
+        sns.boxplot(x='Stars Type', y='brightpixel', data=load_signals(columns=['Stars Type', 'brightpixel']), ax=ax, palette='pastel')
+        ax.set_title('Boxplot of Brightpixel by Stars Type', fontsize=16)
+        ax.set_xlabel('Stars Type', fontsize=14)
+        ax.set_ylabel('Brightpixel', fontsize=14)
+        return fig
+
+    sections.section("Boxplot of Brightpixel vs. Stars Type",
+                     lambda: figure_cache.pyplot('boxplot', None, boxplot))
+
+    # ---- Violin Plot ----
+    def violin_plot():
+        fig, ax = plotting.subplots()
+        sns.violinplot(x='Stars Type', y='narrowband', data=load_signals(columns=['Stars Type', 'narrowband']), ax=ax, palette='muted')
+        ax.set_title('Violin Plot of Narrowband by Stars Type', fontsize=16)
+        ax.set_xlabel('Stars Type', fontsize=14)
+        ax.set_ylabel('Narrowband', fontsize=14)
+        return fig
+
+    sections.section("Violin Plot of Narrowband vs. Stars Type",
+                     lambda: figure_cache.pyplot('violin_plot', None, violin_plot))
+
+    # ---- Pairplot ----
+    def pairplot_section():
+        pairplot_columns = st.multiselect(
+            "Choose features for Pairplot (at least 2):",
+            ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)', 'Stars Type'],
+            default=['brightpixel', 'narrowband', 'narrowbanddrd', 'noise']
+        )
+
+        # Ensure 'Stars Type' is included for hue if it is selected
+        hue = 'Stars Type' if 'Stars Type' in pairplot_columns else None
+
+        if len(pairplot_columns) >= 2:
+            st.write(f"### Pairplot of {', '.join(pairplot_columns)}")
+            figure_cache.pyplot('pairplot', pairplot_columns,
+                                lambda: sns.pairplot(data[pairplot_columns], hue=hue, palette='husl'))
+        else:
+            st.error("Please select at least 2 features for the Pairplot.")
+
+    sections.section("Pairplot of Selected Features", pairplot_section, budget_ms=5000)
+
+    # ---- Histogram ----
+    def histogram():
+        fig, ax = plotting.subplots()
+        sns.histplot(load_signals(columns=['Signal Frequency(MHz)'])['Signal Frequency(MHz)'], bins=20, kde=True, ax=ax, color='skyblue')
+        ax.set_title('Histogram of Signal Frequency (MHz)', fontsize=16)
+        ax.set_xlabel('Signal Frequency (MHz)', fontsize=14)
+        ax.set_ylabel('Frequency', fontsize=14)
+        return fig
+
+    sections.section("Histogram of Signal Frequency (MHz)",
+                     lambda: figure_cache.pyplot('histogram', None, histogram))
+
+    # ---- Line Plot ----
+    def line_plot():
+        fig, ax = plotting.subplots()
+        sns.lineplot(x='Signal Duration(seconds)', y='Signal Frequency(MHz)', data=load_signals(columns=['Signal Duration(seconds)', 'Signal Frequency(MHz)']), ax=ax, color='orange')
+        ax.set_title('Line Plot: Signal Frequency vs. Signal Duration', fontsize=16)
+        ax.set_xlabel('Signal Duration (seconds)', fontsize=14)
+        ax.set_ylabel('Signal Frequency (MHz)', fontsize=14)
+        return fig
+
+    sections.section("Line Plot: Signal Frequency vs. Signal Duration",
+                     lambda: figure_cache.pyplot('line_plot', None, line_plot))
+
+    # ---- Heatmap ----
+    def brightness_heatmap():
+        fig, ax = plotting.subplots()
+        sns.heatmap(load_signals(columns=['brightpixel', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']).pivot_table(values='brightpixel', index='Signal Frequency(MHz)', columns='Signal Duration(seconds)'), cmap="Blues", ax=ax, linewidths=.5)
+        ax.set_title('Heatmap of Brightness Intensity by Signal Frequency and Duration', fontsize=16)
+        return fig
+
+    sections.section("Heatmap of Signal Frequency and Signal Duration (Brightness Intensity)",
+                     lambda: figure_cache.pyplot('brightness_heatmap', None, brightness_heatmap))
+
+    # ---- KDE Plot ----
+    def kde_plot():
+        fig, ax = plotting.subplots()
+        sns.kdeplot(x='narrowband', y='narrowbanddrd', data=load_signals(columns=['narrowband', 'narrowbanddrd']), ax=ax, cmap="Reds", shade=True)
+        ax.set_title('KDE Plot of Narrowband vs Narrowbanddrd', fontsize=16)
+        ax.set_xlabel('Narrowband', fontsize=14)
+        ax.set_ylabel('Narrowbanddrd', fontsize=14)
+        return fig
+
+    sections.section("KDE Plot of Narrowband vs Narrowbanddrd",
+                     lambda: figure_cache.pyplot('kde_plot', None, kde_plot), budget_ms=3000)
+
+    # ---- Swarm Plot ----
+    def swarm_plot():
+        fig, ax = plotting.subplots()
+        sns.swarmplot(x='Stars Type', y='noise', data=load_signals(columns=['Stars Type', 'noise']), ax=ax, palette='Set2')
+        ax.set_title('Swarm Plot of Noise by Stars Type', fontsize=16)
+        ax.set_xlabel('Stars Type', fontsize=14)
+        ax.set_ylabel('Noise', fontsize=14)
+        return fig
+
+    sections.section("Swarm Plot of Noise vs. Stars Type",
+                     lambda: figure_cache.pyplot('swarm_plot', None, swarm_plot), budget_ms=3000)
+
+    # ---- Strip Plot ----
+    def strip_plot():
+        fig, ax = plotting.subplots()
+        sns.stripplot(x='Stars Type', y='Signal Frequency(MHz)', data=load_signals(columns=['Stars Type', 'Signal Frequency(MHz)']), ax=ax, palette='Set1')
+        ax.set_title('Strip Plot of Signal Frequency by Stars Type', fontsize=16)
+        ax.set_xlabel('Stars Type', fontsize=14)
+        ax.set_ylabel('Signal Frequency (MHz)', fontsize=14)
+        return fig
+
+    sections.section("Strip Plot of Signal Frequency(MHz) vs. Stars Type",
+                     lambda: figure_cache.pyplot('strip_plot', None, strip_plot))
+
+    # ---- Joint Plot ----
+    def joint_plot():
+        fig = sns.jointplot(x='brightpixel', y='noise', data=load_signals(columns=['brightpixel', 'noise']), kind="hex", color="green", cmap='Greens')
+        fig.fig.suptitle('Joint Plot of Brightpixel vs Noise', fontsize=8)
+        return fig
+
+    sections.section("Joint Plot of Brightpixel vs. Noise",
+                     lambda: figure_cache.pyplot('joint_plot', None, joint_plot), budget_ms=3000)
+
+    def radar_chart():
+        # Prepare the data
+        data_radar = data[['Stars Type', 'brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']].copy()
+
+        # Group by 'Stars Type' and calculate mean values
+        data_radar = data_radar.groupby('Stars Type').mean().reset_index()
+
+        # Convert to long format for radar chart
+        data_radar_long = data_radar.melt(id_vars='Stars Type', var_name='Feature', value_name='Value')
+
+        # Create radar chart
+        fig_radar = px.line_polar(data_radar_long, r='Value', theta='Feature', color='Stars Type', line_close=True)
+        fig_radar.update_layout(title='Radar Chart of Features by Stars Type')
+        return fig_radar
+
+    sections.section("Radar Chart of Features by Stars Type",
+                     lambda: figure_cache.plotly_chart('radar', None, radar_chart))
+
+
+    def treemap():
+        fig_treemap = px.treemap(load_signals(columns=['Stars Type', 'Remarks', 'noise']), path=['Stars Type', 'Remarks'], values='noise', color='noise', color_continuous_scale='RdBu')
+        fig_treemap.update_layout(title='Treemap of Stars Type and Noise')
+        return fig_treemap
+
+    sections.section("Treemap of Stars Type and Noise",
+                     lambda: figure_cache.plotly_chart('treemap', None, treemap))
+
+
+    def bubble_chart():
+        fig_bubble = px.scatter(binning.stratified_sample(data), x='Signal Frequency(MHz)', y='Signal Duration(seconds)', size='brightpixel', color='Stars Type', hover_name='Remarks', size_max=60)
+        fig_bubble.update_layout(title='Bubble Chart of Signal Frequency vs. Signal Duration')
+        return fig_bubble
+
+    def bubble_chart_section():
+        figure_cache.plotly_chart('bubble', None, bubble_chart)
+        if binning.needs_reduction(len(data)):
+            st.caption(binning.sample_note(data))
+
+    sections.section("Bubble Chart of Signal Frequency vs. Signal Duration", bubble_chart_section)
+
+
+    def facet_grid():
+        g = sns.FacetGrid(load_signals(columns=['Stars Type', 'noise']), col="Stars Type", col_wrap=4, height=4, aspect=1.2)
+        g.map_dataframe(sns.histplot, x='noise', bins=20, kde=True)
+        g.set_titles(col_template="{col_name}")
+        g.set_axis_labels("Noise", "Frequency")
+        g.fig.suptitle('Noise Distribution by Stars Type', fontsize=16)
+        g.fig.tight_layout()
+        g.fig.subplots_adjust(top=0.9)
+        return g
+
+    sections.section("Facet Grid of Noise by Stars Type",
+                     lambda: figure_cache.pyplot('facet_grid', None, facet_grid), budget_ms=3000)
+
+
+    def hexbin():
+        data = load_signals(columns=['Signal Frequency(MHz)', 'Signal Duration(seconds)'])
+        fig, ax = plotting.subplots()
+        if binning.needs_reduction(len(data)):
+            # Count the points on a NumPy grid instead of handing every one to hexbin
+            counts, x_edges, y_edges = binning.density_grid(data, 'Signal Frequency(MHz)', 'Signal Duration(seconds)', bins=30)
+            hb = ax.pcolormesh(x_edges, y_edges, np.ma.masked_equal(counts.T, 0), cmap='Blues')
+        else:
+            hb = ax.hexbin(data['Signal Frequency(MHz)'], data['Signal Duration(seconds)'], gridsize=30, cmap='Blues')
+        cb = fig.colorbar(hb, ax=ax)
+        ax.set_xlabel('Signal Frequency (MHz)')
+        ax.set_ylabel('Signal Duration (seconds)')
+        ax.set_title('Hexbin Plot of Signal Frequency vs. Signal Duration')
+        return fig
+
+    sections.section("Hexbin Plot of Signal Frequency vs. Signal Duration",
+                     lambda: figure_cache.pyplot('hexbin', None, hexbin))
+
+
+    def stacked_area():
+        # Convert relevant columns to numeric, forcing errors to NaN
+        columns_to_convert = ['brightpixel', 'narrowband', 'narrowbanddrd', 'noise', 'Signal Frequency(MHz)', 'Signal Duration(seconds)']
+        # Only the columns the chart sums
+        data = load_signals(columns=['Stars Type'] + columns_to_convert)
+        for column in columns_to_convert:
+            data[column] = pd.to_numeric(data[column], errors='coerce')
+
+        # Aggregate data by 'Stars Type'
+        # Use sum or median as an alternative to mean
+        data_grouped = data.groupby('Stars Type').sum().reset_index()
+
+        # Convert to long format for stacked area chart
+        data_long = data_grouped.melt(id_vars='Stars Type', var_name='Feature', value_name='Value')
+
+        # Create stacked area chart
+        fig_area = px.area(data_long, x='Feature', y='Value', color='Stars Type',
+                           title='Stacked Area Chart of Features by Stars Type',
+                           labels={'Value': 'Total Value', 'Feature': 'Features'},
+                           template='plotly_dark')  # Dark theme for better visibility
+
+        # Update layout for better aesthetics
+        fig_area.update_layout(
+            xaxis_title='Features',
+            yaxis_title='Total Value',
+            legend_title='Stars Type',
+            xaxis_tickangle=-45  # Rotate x-axis labels for better readability
+        )
+        return fig_area
+
+    # Display the chart
+    sections.section("Stacked Area Chart of Features",
+                     lambda: figure_cache.plotly_chart('stacked_area', None, stacked_area))
+
+    stats = figure_cache.cache_stats()
+    st.sidebar.caption(f"🖼️ Figure cache: {stats['hits']} hits / {stats['misses']} misses, "
+                       f"{stats['figures']} figures ({stats['megabytes']:.1f} MB)")
+    sections.summary()
+
+
+if __name__ == "__main__":
+    render()
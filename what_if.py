@@ -0,0 +1,78 @@
+import time
+import weakref
+
+import numpy as np
+import pandas as pd
+
+import perf
+from scoring import FEATURE_COLUMNS
+
+# Points along each axis of the surface by default
+GRID_STEPS = 200
+
+_split_points = weakref.WeakKeyDictionary()
+
+
+def split_points(forest):
+    # {feature index: sorted distinct thresholds} of every split in a fitted
+    # forest or FlatForest, cached per model object like forest_engine does
+    points = _split_points.get(forest)
+    if points is not None:
+        return points
+    if hasattr(forest, 'estimators_'):
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        feature = np.concatenate([tree.feature for tree in trees])
+        threshold = np.concatenate([tree.threshold for tree in trees])
+        internal = feature >= 0
+    else:
+        feature, threshold, internal = forest.feature, forest.threshold, ~forest.is_leaf
+    feature, threshold = feature[internal], threshold[internal]
+    points = {int(f): np.unique(threshold[feature == f]) for f in np.unique(feature)}
+    _split_points[forest] = points
+    return points
+
+
+def _distinct(values, thresholds):
+    # Every tree sends x left when x <= threshold, after the input has been
+    # cast to float32 like sklearn does. Values with the same number of
+    # thresholds below them therefore take the same path through every tree
+    # and get the same prediction. Returns one representative value per such
+    # interval and, for each of `values`, the index of its representative.
+    x = values.astype(np.float32).astype(np.float64)
+    intervals = np.searchsorted(thresholds, x, side='left')
+    _, first, inverse = np.unique(intervals, return_index=True, return_inverse=True)
+    return values[first], inverse.ravel()
+
+
+def decision_surface(predictor, base, x_feature, y_feature, x_values, y_values):
+    # Class probabilities over the grid x_values by y_values, every other
+    # feature held at its value in `base` (a {feature: value} dict). Only
+    # one point per cell of the forest's split grid is scored, in a single
+    # batched predict_proba call, and spread back over the grid, so the
+    # result is exactly what scoring every grid point would give. Returns a
+    # dict with 'proba' shaped (len(y_values), len(x_values), n_classes),
+    # 'classes', 'scored' (rows actually scored) and 'seconds'.
+    start = time.perf_counter()
+    names = getattr(predictor, 'feature_names_in_', None)
+    columns = list(FEATURE_COLUMNS if names is None else names)
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray(y_values, dtype=np.float64)
+    points = split_points(predictor)
+    empty = np.empty(0)
+    x_distinct, x_index = _distinct(x_values, points.get(columns.index(x_feature), empty))
+    y_distinct, y_index = _distinct(y_values, points.get(columns.index(y_feature), empty))
+
+    # Rows vary x fastest, so the probabilities reshape to (y, x)
+    grid = pd.DataFrame({column: np.full(len(x_distinct) * len(y_distinct), base[column], dtype=np.float64)
+                         for column in columns})
+    grid[x_feature] = np.tile(x_distinct, len(y_distinct))
+    grid[y_feature] = np.repeat(y_distinct, len(x_distinct))
+    with perf.span('predict:what_if'):
+        proba = predictor.predict_proba(grid)
+    proba = proba.reshape(len(y_distinct), len(x_distinct), -1)[y_index][:, x_index]
+    return {
+        'proba': proba,
+        'classes': list(predictor.classes_),
+        'scored': len(grid),
+        'seconds': time.perf_counter() - start,
+    }